@@ -0,0 +1,105 @@
+"""
+Process-wide registry of the REST API clients used to communicate with the LMS, Discovery and other services.
+
+Clients built for a site's service user are kept for the lifetime of the process and replaced when the
+access token of the site changes. All clients share a single connection pool, so that connections
+(and TLS sessions) to the services are reused across requests.
+"""
+import logging
+import threading
+
+import requests
+from django.conf import settings
+from edx_rest_api_client.client import EdxRestApiClient
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry  # pylint: disable=import-error
+
+logger = logging.getLogger(__name__)
+
+
+class ApiClientRegistry(object):
+    """
+    Builds and keeps EdxRestApiClient instances and the HTTP connection pool they share.
+    """
+
+    def __init__(self):
+        self._adapter = None
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @property
+    def adapter(self):
+        """ HTTPAdapter holding the connection pools shared by all sessions. """
+        with self._lock:
+            if self._adapter is None:
+                self._adapter = HTTPAdapter(
+                    pool_connections=settings.API_CLIENT_POOL_CONNECTIONS,
+                    pool_maxsize=settings.API_CLIENT_POOL_MAXSIZE,
+                    # Only connection errors are retried, requests that reached the service are not sent again.
+                    max_retries=Retry(
+                        total=settings.API_CLIENT_MAX_RETRIES,
+                        read=False,
+                        backoff_factor=settings.API_CLIENT_RETRY_BACKOFF_FACTOR,
+                    )
+                )
+            return self._adapter
+
+    def get_session(self):
+        """ Returns a new requests.Session using the shared connection pools. """
+        session = requests.Session()
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        return session
+
+    def get_client(self, site_id, service, url, jwt=None, **kwargs):
+        """
+        Returns the client of a service for a site, building it if needed.
+
+        Arguments:
+            site_id (int): ID of the site on behalf of which the service is called, or None.
+            service (str): Name of the service, e.g. 'discovery'.
+            url (str): Root URL of the service API.
+            jwt (str): Access token of the site's service user.
+            **kwargs: Additional arguments passed to EdxRestApiClient, e.g. append_slash.
+
+        Returns:
+            EdxRestApiClient
+        """
+        key = (site_id, service, url, tuple(sorted(kwargs.items())))
+        entry = self._clients.get(key)
+        if entry and entry[0] == jwt:
+            return entry[1]
+
+        client = EdxRestApiClient(url, jwt=jwt, session=self.get_session(), **kwargs)
+        with self._lock:
+            self._clients[key] = (jwt, client)
+
+        logger.debug('Created [%s] API client for site [%s].', service, site_id)
+        return client
+
+    def clear(self):
+        """ Removes all clients and closes the shared connection pools. """
+        with self._lock:
+            self._clients.clear()
+            if self._adapter is not None:
+                self._adapter.close()
+                self._adapter = None
+
+
+registry = ApiClientRegistry()
+
+
+def get_api_client(site_id, service, url, jwt=None, **kwargs):
+    """ Returns the shared client of a service for a site. See ApiClientRegistry.get_client. """
+    return registry.get_client(site_id, service, url, jwt=jwt, **kwargs)
+
+
+def get_api_session():
+    """
+    Returns a requests.Session using the shared connection pools.
+
+    Use it to build clients that are not shared, e.g. those authenticated with the access token of a user:
+
+        EdxRestApiClient(url, oauth_access_token=user.access_token, session=get_api_session())
+    """
+    return registry.get_session()
@@ -0,0 +1,187 @@
+"""
+Shared caching of responses from the Discovery, LMS, enterprise and other upstream APIs.
+
+Values are stored under the caller's cache key, exactly as they were when each call site did its own
+``cache.get``/``cache.set``, alongside a small metadata entry that tracks when the value should be refreshed.
+This allows the helper to:
+
+* refresh a value slightly before it expires, with a probability that grows as expiry approaches, so that hot
+  keys are not refreshed by every worker at the same instant;
+* let a single worker fetch a missing or expired value while the others wait for it, or keep serving the
+  previous value;
+* keep serving the previous value for a while if the upstream service fails;
+* cache missing and empty responses for a shorter period than regular responses.
+"""
+from __future__ import unicode_literals
+
+import logging
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_INTERVAL = 0.05  # Value is in seconds.
+
+# Errors of upstream services for which an expired value is served, if there is one.
+STALE_ERRORS = (ConnectionError, SlumberBaseException, Timeout)
+
+
+def _get_meta_key(key):
+    return '{}.meta'.format(key)
+
+
+def _get_lock_key(key):
+    return '{}.lock'.format(key)
+
+
+def _is_fresh(meta):
+    """
+    Determine whether a cached value is still fresh.
+
+    Values are refreshed early with a probability that increases as they approach expiry, and values that took
+    longer to fetch are refreshed earlier (see "Optimal Probabilistic Cache Stampede Prevention", Vattani et al.).
+    """
+    beta = settings.API_CACHE_EARLY_REFRESH_BETA
+    early = meta['delta'] * beta * math.log(1.0 - random.random())
+    return time.time() - early < meta['expires']
+
+
+def _evaluate(value, meta):
+    """
+    Evaluate a value read from the cache along with its metadata.
+
+    Returns:
+        tuple: (hit, value, fresh)
+    """
+    if meta is None:
+        # Values stored without metadata were written before this helper was in use. They are treated as fresh
+        # until they expire.
+        return value is not None, value, True
+
+    if value is None and not meta.get('none'):
+        # The value was evicted before its metadata.
+        return False, None, False
+
+    return True, value, _is_fresh(meta)
+
+
+def _read(key):
+    """
+    Read a value and its metadata from the cache.
+
+    Returns:
+        tuple: (hit, value, fresh)
+    """
+    meta_key = _get_meta_key(key)
+    cached = cache.get_many([key, meta_key])
+    return _evaluate(cached.get(key), cached.get(meta_key))
+
+
+def _is_empty(value):
+    """ Determine whether a value is a missing or empty response, e.g. None or an empty list or dict. """
+    return value is None or (hasattr(value, '__len__') and len(value) == 0)
+
+
+def _write(key, value, timeout, delta):
+    if _is_empty(value):
+        timeout = min(timeout, settings.API_CACHE_NEGATIVE_TIMEOUT)
+
+    meta = {
+        'expires': time.time() + timeout,
+        'delta': delta,
+        'none': value is None,
+    }
+    hard_timeout = timeout + settings.API_CACHE_STALE_TIMEOUT
+    cache.set_many({key: value, _get_meta_key(key): meta}, hard_timeout)
+
+
+def _wait_for_value(key):
+    """ Wait for another process that holds the lock for the given key to cache its value. """
+    deadline = time.time() + settings.API_CACHE_LOCK_WAIT
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        hit, value, __ = _read(key)
+        if hit:
+            return hit, value
+    return False, None
+
+
+def get_or_fetch(key, fetch, timeout, stale_errors=STALE_ERRORS):
+    """
+    Get a value from the cache, calling ``fetch`` to retrieve and cache it if it is missing or expired.
+
+    Only one process fetches a given key at a time. Others serve the expired value while it is refreshed, or wait
+    briefly for the refreshed value if there is none. None and empty values are cached for at most
+    ``settings.API_CACHE_NEGATIVE_TIMEOUT`` seconds.
+
+    Arguments:
+        key (str): Cache key.
+        fetch (callable): Called without arguments to retrieve the value from the upstream service.
+        timeout (int): Number of seconds the value is considered fresh.
+        stale_errors (tuple): Exceptions raised by ``fetch`` for which the expired value, if any, is returned
+            instead. The exception is re-raised if there is no expired value. Defaults to network and API errors.
+
+    Returns:
+        The cached or fetched value.
+    """
+    hit, value, fresh = _read(key)
+    if hit and fresh:
+        return value
+
+    lock_key = _get_lock_key(key)
+    locked = cache.add(lock_key, True, settings.API_CACHE_LOCK_TIMEOUT)
+    if not locked:
+        if hit:
+            return value
+
+        hit, value = _wait_for_value(key)
+        if hit:
+            return value
+
+        logger.info('Timed out waiting for cache key [%s] to be populated. Fetching it instead.', key)
+
+    try:
+        start = time.time()
+        fetched = fetch()
+    except stale_errors:
+        if not hit:
+            raise
+        logger.warning('Failed to refresh cache key [%s]. Serving the expired value.', key, exc_info=True)
+        return value
+    finally:
+        # Only release the lock if it was acquired. Otherwise it belongs to the process still fetching the value.
+        if locked:
+            cache.delete(lock_key)
+
+    _write(key, fetched, timeout, time.time() - start)
+    return fetched
+
+
+def get_many_fresh(keys):
+    """
+    Get the fresh values of several keys from the cache at once.
+
+    Values which are missing from the cache, or which get_or_fetch would refresh, are left out. Callers can then
+    call get_or_fetch for the keys they still need.
+
+    Arguments:
+        keys (iterable): Cache keys.
+
+    Returns:
+        dict: Fresh values by key.
+    """
+    meta_keys = {key: _get_meta_key(key) for key in keys}
+    cached = cache.get_many(list(meta_keys.keys()) + list(meta_keys.values()))
+
+    values = {}
+    for key, meta_key in meta_keys.items():
+        hit, value, fresh = _evaluate(cached.get(key), cached.get(meta_key))
+        if hit and fresh:
+            values[key] = value
+    return values
@@ -0,0 +1,17 @@
+"""
+Middleware for the core app.
+
+Note:
+    This middleware depends on "django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware" middleware
+    So it must be added after this middleware in django settings files.
+"""
+from ecommerce.core.site_context import SiteContext
+
+
+class SiteContextMiddleware(object):
+    """
+    Middleware that sets `site_context` attribute to request object.
+    """
+
+    def process_request(self, request):
+        request.site_context = SiteContext(request.site)
@@ -19,10 +19,11 @@ from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
 from analytics import Client as SegmentClient
+from ecommerce.core.api_clients import get_api_client, get_api_session
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_classes
 
 log = logging.getLogger(__name__)
 
@@ -236,7 +237,7 @@ class SiteConfiguration(models.Model):
 
     def _all_payment_processors(self):
         """ Returns all processor classes declared in settings. """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
+        all_processors = list(get_processor_classes().values())
         return all_processors
 
     def get_payment_processors(self):
@@ -270,9 +271,7 @@ class SiteConfiguration(models.Model):
              BasePaymentProcessor
         """
         if self.client_side_payment_processor:
-            for processor in self._all_payment_processors():
-                if processor.NAME == self.client_side_payment_processor:
-                    return processor
+            return get_processor_classes().get(self.client_side_payment_processor)
 
         return None
 
@@ -382,7 +381,7 @@ class SiteConfiguration(models.Model):
 
         return access_token
 
-    @cached_property
+    @property
     def discovery_api_client(self):
         """
         Returns an API client to access the Discovery service.
@@ -391,14 +390,14 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Discovery service.
         """
 
-        return EdxRestApiClient(self.discovery_api_url, jwt=self.access_token)
+        return get_api_client(self.site_id, 'discovery', self.discovery_api_url, jwt=self.access_token)
 
-    @cached_property
+    @property
     def embargo_api_client(self):
         """ Returns the URL for the embargo API """
-        return EdxRestApiClient(self.build_lms_url('/api/embargo/v1'), jwt=self.access_token)
+        return get_api_client(self.site_id, 'embargo', self.build_lms_url('/api/embargo/v1'), jwt=self.access_token)
 
-    @cached_property
+    @property
     def enterprise_api_client(self):
         """
         Constructs a Slumber-based REST API client for the provided site.
@@ -410,13 +409,15 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Enterprise service.
 
         """
-        return EdxRestApiClient(self.enterprise_api_url, jwt=self.access_token)
+        return get_api_client(self.site_id, 'enterprise', self.enterprise_api_url, jwt=self.access_token)
 
-    @cached_property
+    @property
     def consent_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/consent/api/v1/'), jwt=self.access_token, append_slash=False)
+        return get_api_client(
+            self.site_id, 'consent', self.build_lms_url('/consent/api/v1/'), jwt=self.access_token, append_slash=False
+        )
 
-    @cached_property
+    @property
     def user_api_client(self):
         """
         Returns the API client to access the user API endpoint on LMS.
@@ -424,23 +425,30 @@ class SiteConfiguration(models.Model):
         Returns:
             EdxRestApiClient: The client to access the LMS user API service.
         """
-        return EdxRestApiClient(self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
+        return get_api_client(self.site_id, 'user', self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
 
-    @cached_property
+    @property
     def commerce_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token)
+        return get_api_client(
+            self.site_id, 'commerce', self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token
+        )
 
-    @cached_property
+    @property
     def credit_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
+        return get_api_client(self.site_id, 'credit', self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
 
-    @cached_property
+    @property
     def enrollment_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/enrollment/v1/'), jwt=self.access_token, append_slash=False)
+        return get_api_client(
+            self.site_id, 'enrollment', self.build_lms_url('/api/enrollment/v1/'), jwt=self.access_token,
+            append_slash=False
+        )
 
-    @cached_property
+    @property
     def entitlement_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/entitlements/v1/'), jwt=self.access_token)
+        return get_api_client(
+            self.site_id, 'entitlement', self.build_lms_url('/api/entitlements/v1/'), jwt=self.access_token
+        )
 
 
 class User(AbstractUser):
@@ -478,10 +486,13 @@ class User(AbstractUser):
             connection with the LMS account API endpoint.
         """
         try:
-            api = EdxRestApiClient(
-                request.site.siteconfiguration.build_lms_url('/api/user/v1'),
+            site_configuration = request.site.siteconfiguration
+            api = get_api_client(
+                request.site.id,
+                'user_accounts',
+                site_configuration.build_lms_url('/api/user/v1'),
                 append_slash=False,
-                jwt=request.site.siteconfiguration.access_token
+                jwt=site_configuration.access_token
             )
             response = api.accounts(self.username).get()
             return response
@@ -515,7 +526,8 @@ class User(AbstractUser):
         try:
             api = EdxRestApiClient(
                 get_lms_url('api/credit/v1/'),
-                oauth_access_token=self.access_token
+                oauth_access_token=self.access_token,
+                session=get_api_session()
             )
             response = api.eligibility().get(**query_strings)
         except (ConnectionError, SlumberBaseException, Timeout):  # pragma: no cover
@@ -546,7 +558,8 @@ class User(AbstractUser):
             if not verification:
                 api = EdxRestApiClient(
                     site.siteconfiguration.build_lms_url('api/user/v1/'),
-                    oauth_access_token=self.access_token
+                    oauth_access_token=self.access_token,
+                    session=get_api_session()
                 )
                 response = api.accounts(self.username).verification_status().get()
 
@@ -0,0 +1,66 @@
+"""
+Request-scoped access to the configuration of the current site.
+"""
+from django.contrib.sites.models import Site
+from django.utils.functional import cached_property
+from threadlocals.threadlocals import get_current_request
+
+
+class SiteContext(object):
+    """
+    Resolves the SiteConfiguration, partner and payment processors of a site once,
+    and keeps them for the lifetime of the object.
+
+    ``SiteContextMiddleware`` attaches an instance to each request as ``request.site_context``.
+    """
+
+    def __init__(self, site):
+        self.site = site
+
+    @cached_property
+    def siteconfiguration(self):
+        return self.site.siteconfiguration
+
+    @cached_property
+    def partner(self):
+        return self.siteconfiguration.partner
+
+    @cached_property
+    def payment_processors(self):
+        """ Payment processor classes enabled for the site. """
+        return self.siteconfiguration.get_payment_processors()
+
+    @cached_property
+    def client_side_payment_processor_class(self):
+        """ Payment processor class used for client-side payments, or None. """
+        return self.siteconfiguration.get_client_side_payment_processor_class()
+
+
+def get_site_context(site=None, site_id=None):
+    """
+    Returns the SiteContext of a site.
+
+    The context attached to the current request is returned if it belongs to the requested site,
+    so that lookups made while handling a request are shared. A new context is returned otherwise,
+    e.g. when there is no request as is the case for management commands and Celery tasks.
+
+    Arguments:
+        site (Site): Site for which to return the context. Defaults to the site of the current request.
+        site_id (int): ID of the site for which to return the context. Can be used instead of ``site``
+            to avoid loading the site of a model instance, e.g. ``basket.site_id``.
+
+    Returns:
+        SiteContext
+    """
+    if site is not None:
+        site_id = site.id
+
+    request = get_current_request()
+    site_context = getattr(request, 'site_context', None)
+    if site_context and site_id in (None, site_context.site.id):
+        return site_context
+
+    if site is None:
+        site = Site.objects.get(id=site_id) if site_id else request.site
+
+    return SiteContext(site)
@@ -0,0 +1,41 @@
+"""
+Storage of files which must not be publicly accessible.
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+
+@deconstructible
+class PrivateFileSystemStorage(FileSystemStorage):
+    """
+    File system storage in settings.PRIVATE_MEDIA_ROOT, which is not served by the web server.
+
+    Files have no public URL. Views which check the permissions of the user serve them instead.
+    """
+    # Name of the setting holding the directory files are stored in.
+    location_setting = 'PRIVATE_MEDIA_ROOT'
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super(PrivateFileSystemStorage, self)._clear_cached_properties(setting, **kwargs)
+        if setting == self.location_setting:
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, getattr(settings, self.location_setting))
+
+    def url(self, name):
+        raise NotImplementedError('Private files have no public URL.')
+
+
+@deconstructible
+class PaymentProcessorResponseArchiveStorage(PrivateFileSystemStorage):
+    """ Storage of payment processor response archives, in settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_ROOT. """
+    location_setting = 'PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_ROOT'
+
+
+private_storage = PrivateFileSystemStorage()
+payment_processor_response_archive_storage = PaymentProcessorResponseArchiveStorage()
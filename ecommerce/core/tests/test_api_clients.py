@@ -0,0 +1,60 @@
+import httpretty
+from django.test import override_settings
+from edx_rest_api_client.client import EdxRestApiClient
+
+from ecommerce.core.api_clients import ApiClientRegistry, get_api_client, get_api_session, registry
+from ecommerce.tests.testcases import TestCase
+
+API_URL = 'http://api.example.com/api/v1/'
+
+
+class ApiClientRegistryTests(TestCase):
+    def test_client_reused(self):
+        """ Verify clients are reused for the same site, service, URL and token. """
+        client = get_api_client(self.site.id, 'discovery', API_URL, jwt='abc')
+        self.assertIsInstance(client, EdxRestApiClient)
+        self.assertIs(get_api_client(self.site.id, 'discovery', API_URL, jwt='abc'), client)
+
+    def test_client_replaced(self):
+        """ Verify a new client is built when the token, URL or options differ. """
+        client = get_api_client(self.site.id, 'discovery', API_URL, jwt='abc')
+        self.assertIsNot(get_api_client(self.site.id, 'discovery', API_URL, jwt='def'), client)
+        self.assertIsNot(get_api_client(self.site.id, 'discovery', 'http://other.example.com/', jwt='def'), client)
+        self.assertIsNot(get_api_client(self.site.id, 'discovery', API_URL, jwt='def', append_slash=False), client)
+        self.assertIsNot(get_api_client(None, 'discovery', API_URL, jwt='def'), client)
+
+    def test_connection_pool_shared(self):
+        """ Verify all sessions share the same connection pools. """
+        client = get_api_client(self.site.id, 'discovery', API_URL, jwt='abc')
+        other_client = get_api_client(self.site.id, 'enrollment', API_URL, jwt='abc')
+        session = get_api_session()
+
+        adapter = registry.adapter
+        # pylint: disable=protected-access
+        for api in (client, other_client):
+            self.assertIs(api._store['session'].get_adapter(API_URL), adapter)
+        self.assertIs(session.get_adapter('https://example.com'), adapter)
+
+    @override_settings(API_CLIENT_POOL_MAXSIZE=3, API_CLIENT_MAX_RETRIES=4)
+    def test_adapter_settings(self):
+        """ Verify the pool size and retries are read from settings. """
+        adapter = ApiClientRegistry().adapter
+        self.assertEqual(adapter._pool_maxsize, 3)  # pylint: disable=protected-access
+        self.assertEqual(adapter.max_retries.total, 4)
+        self.assertFalse(adapter.max_retries.read)
+
+    def test_clear(self):
+        """ Verify clearing the registry removes clients and the shared connection pools. """
+        client = get_api_client(self.site.id, 'discovery', API_URL, jwt='abc')
+        adapter = registry.adapter
+        registry.clear()
+        self.assertIsNot(get_api_client(self.site.id, 'discovery', API_URL, jwt='abc'), client)
+        self.assertIsNot(registry.adapter, adapter)
+
+    @httpretty.activate
+    def test_site_configuration_clients(self):
+        """ Verify the service clients of a SiteConfiguration come from the registry. """
+        self.mock_access_token_response()
+        site_configuration = self.site.siteconfiguration
+        self.assertIs(site_configuration.discovery_api_client, site_configuration.discovery_api_client)
+        self.assertIs(self.site.siteconfiguration.enrollment_api_client, site_configuration.enrollment_api_client)
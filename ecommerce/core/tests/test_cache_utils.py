@@ -0,0 +1,144 @@
+import time
+
+import mock
+from django.core.cache import cache
+from django.test import override_settings
+from requests.exceptions import ConnectionError
+from slumber.exceptions import HttpServerError
+
+from ecommerce.core.cache_utils import get_many_fresh, get_or_fetch
+from ecommerce.tests.testcases import TestCase
+
+CACHE_KEY = 'test-cache-key'
+
+
+class GetOrFetchTests(TestCase):
+    def setUp(self):
+        super(GetOrFetchTests, self).setUp()
+        self.fetch = mock.Mock(return_value={'foo': 'bar'})
+
+    def expire(self):
+        """ Expire the cached value, leaving it available to serve as a stale value. """
+        meta = cache.get(CACHE_KEY + '.meta')
+        meta['expires'] = 0
+        cache.set(CACHE_KEY + '.meta', meta)
+
+    def test_cache_miss(self):
+        """ Verify the value is fetched and stored under the given key on a cache miss. """
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+        self.assertEqual(cache.get(CACHE_KEY), {'foo': 'bar'})
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_cache_hit(self):
+        """ Verify fresh values are served from the cache. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_value_without_metadata(self):
+        """ Verify values cached without metadata are served until they expire. """
+        cache.set(CACHE_KEY, 'legacy', 60)
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), 'legacy')
+        self.fetch.assert_not_called()
+
+    def test_expired_value_refreshed(self):
+        """ Verify expired values are refreshed. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        self.expire()
+        self.fetch.return_value = {'foo': 'baz'}
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'baz'})
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_stale_value_served_on_error(self):
+        """ Verify the expired value is served if the upstream service fails. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        for error in (ConnectionError, HttpServerError):
+            self.expire()
+            self.fetch.side_effect = error
+            self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+
+    def test_error_without_stale_value(self):
+        """ Verify errors are raised if there is no value to serve. """
+        self.fetch.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            get_or_fetch(CACHE_KEY, self.fetch, 60)
+
+        # The lock must be released so that the next call retries.
+        self.fetch.side_effect = None
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+
+    def test_unhandled_error_with_stale_value(self):
+        """ Verify errors not listed in stale_errors are raised even if there is a value to serve. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        self.expire()
+        self.fetch.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            get_or_fetch(CACHE_KEY, self.fetch, 60)
+
+        with self.assertRaises(ValueError):
+            get_or_fetch(CACHE_KEY, self.fetch, 60, stale_errors=(KeyError,))
+
+    def test_locked_with_stale_value(self):
+        """ Verify the expired value is served while another process refreshes it. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        self.expire()
+        cache.add(CACHE_KEY + '.lock', True)
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+        self.assertEqual(self.fetch.call_count, 1)
+
+    @override_settings(API_CACHE_LOCK_WAIT=0.1)
+    def test_locked_without_value(self):
+        """ Verify the value is fetched if another process holding the lock does not cache it in time. """
+        cache.add(CACHE_KEY + '.lock', True)
+        self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), {'foo': 'bar'})
+        self.assertEqual(self.fetch.call_count, 1)
+
+        # The lock still belongs to the other process.
+        self.assertTrue(cache.get(CACHE_KEY + '.lock'))
+
+    @override_settings(API_CACHE_NEGATIVE_TIMEOUT=5, API_CACHE_STALE_TIMEOUT=10)
+    def test_negative_caching(self):
+        """ Verify None and empty values are cached, with a shorter timeout. """
+        for value in (None, {}):
+            cache.clear()
+            self.fetch.reset_mock()
+            self.fetch.return_value = value
+            self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), value)
+            self.assertEqual(get_or_fetch(CACHE_KEY, self.fetch, 60), value)
+            self.assertEqual(self.fetch.call_count, 1)
+
+        with mock.patch('ecommerce.core.cache_utils.cache.set_many') as mock_set_many:
+            get_or_fetch('another-key', mock.Mock(return_value=[]), 60)
+            self.assertEqual(mock_set_many.call_args[0][1], 5 + 10)
+
+            # False and 0 are regular responses, e.g. the answer to a yes or no question.
+            for value in (False, 0):
+                get_or_fetch('another-key-{}'.format(value), mock.Mock(return_value=value), 60)
+                self.assertEqual(mock_set_many.call_args[0][1], 60 + 10)
+
+    def test_early_refresh(self):
+        """ Verify values that are about to expire may be refreshed early. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        meta = cache.get(CACHE_KEY + '.meta')
+        meta.update({'expires': time.time() + 5, 'delta': 1})
+        cache.set(CACHE_KEY + '.meta', meta)
+
+        with mock.patch('ecommerce.core.cache_utils.random.random', return_value=0):
+            get_or_fetch(CACHE_KEY, self.fetch, 60)
+            self.assertEqual(self.fetch.call_count, 1)
+
+        with mock.patch('ecommerce.core.cache_utils.random.random', return_value=0.9999):
+            get_or_fetch(CACHE_KEY, self.fetch, 60)
+            self.assertEqual(self.fetch.call_count, 2)
+
+    def test_get_many_fresh(self):
+        """ Verify only the fresh values are returned, leaving out missing and expired ones. """
+        get_or_fetch(CACHE_KEY, self.fetch, 60)
+        get_or_fetch('another-key', mock.Mock(return_value='another'), 60)
+        self.assertEqual(
+            get_many_fresh([CACHE_KEY, 'another-key', 'missing-key']),
+            {CACHE_KEY: {'foo': 'bar'}, 'another-key': 'another'}
+        )
+
+        self.expire()
+        self.assertEqual(get_many_fresh([CACHE_KEY, 'another-key']), {'another-key': 'another'})
@@ -0,0 +1,55 @@
+import mock
+from django.test import RequestFactory
+from threadlocals.threadlocals import set_thread_variable
+
+from ecommerce.core.middleware import SiteContextMiddleware
+from ecommerce.core.site_context import SiteContext, get_site_context
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+
+class SiteContextTests(TestCase):
+    def test_lookups_memoized(self):
+        """ Verify the site configuration and payment processors are only resolved once. """
+        site_context = SiteContext(self.site)
+        self.assertEqual(site_context.siteconfiguration, self.site.siteconfiguration)
+        self.assertEqual(site_context.partner, self.partner)
+
+        with mock.patch.object(self.site.siteconfiguration, 'get_payment_processors', return_value=[]) as mock_get:
+            site_context.payment_processors  # pylint: disable=pointless-statement
+            site_context.payment_processors  # pylint: disable=pointless-statement
+            self.assertEqual(mock_get.call_count, 1)
+
+    def test_middleware(self):
+        """ Verify the middleware attaches a SiteContext for the site of the request. """
+        request = RequestFactory().get('/')
+        request.site = self.site
+        SiteContextMiddleware().process_request(request)
+        self.assertIsInstance(request.site_context, SiteContext)
+        self.assertEqual(request.site_context.site, self.site)
+
+    def test_get_site_context_from_request(self):
+        """ Verify the context attached to the current request is reused for its site. """
+        site_context = SiteContext(self.site)
+        self.request.site_context = site_context
+
+        self.assertIs(get_site_context(), site_context)
+        self.assertIs(get_site_context(self.site), site_context)
+        self.assertIs(get_site_context(site_id=self.site.id), site_context)
+
+    def test_get_site_context_for_other_site(self):
+        """ Verify a new context is returned for sites other than that of the current request. """
+        self.request.site_context = SiteContext(self.site)
+        other_site = SiteConfigurationFactory(partner__short_code='other').site
+
+        self.assertEqual(get_site_context(other_site).site, other_site)
+        self.assertEqual(get_site_context(site_id=other_site.id).partner.short_code, 'other')
+
+    def test_get_site_context_without_middleware(self):
+        """ Verify a context is built for the site of the request if the middleware did not attach one. """
+        self.assertEqual(get_site_context().site, self.site)
+
+    def test_get_site_context_without_request(self):
+        """ Verify a context can be built for a given site if there is no request. """
+        set_thread_variable('request', None)
+        self.assertEqual(get_site_context(site_id=self.site.id).site, self.site)
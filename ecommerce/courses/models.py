@@ -17,6 +17,7 @@ from ecommerce.core.constants import (
     SEAT_PRODUCT_CLASS_NAME
 )
 from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 from ecommerce.extensions.catalogue.utils import generate_sku
 
 logger = logging.getLogger(__name__)
@@ -110,7 +111,9 @@ class Course(models.Model):
     @property
     def seat_products(self):
         """ Returns a queryset of course seat Products related to this course. """
-        return self.parent_seat_product.children.all().prefetch_related('stockrecords')
+        return self.parent_seat_product.children.all().prefetch_related(
+            'stockrecords', get_attribute_values_prefetch()
+        )
 
     @property
     def enrollment_code_product(self):
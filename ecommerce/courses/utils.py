@@ -1,10 +1,11 @@
 import hashlib
 
 from django.conf import settings
-from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
 
+from ecommerce.core.cache_utils import get_or_fetch
+from ecommerce.core.site_context import get_site_context
 from ecommerce.core.utils import traverse_pagination
 
 
@@ -30,18 +31,18 @@ def get_course_info_from_catalog(site, product):
     else:
         key = CourseKey.from_string(product.attr.course_key)
 
-    api = site.siteconfiguration.discovery_api_client
-    partner_short_code = site.siteconfiguration.partner.short_code
+    site_context = get_site_context(site)
+    api = site_context.siteconfiguration.discovery_api_client
+    partner_short_code = site_context.partner.short_code
     cache_key = 'courses_api_detail_{}{}'.format(key, partner_short_code)
     cache_key = hashlib.md5(cache_key).hexdigest()
-    course = cache.get(cache_key)
-    if not course:  # pragma: no cover
+
+    def fetch():
         if product.is_course_entitlement_product:
-            course = api.courses(key).get()
-        else:
-            course = api.course_runs(key).get(partner=partner_short_code)
-        cache.set(cache_key, course, settings.COURSES_API_CACHE_TIMEOUT)
-    return course
+            return api.courses(key).get()
+        return api.course_runs(key).get(partner=partner_short_code)
+
+    return get_or_fetch(cache_key, fetch, settings.COURSES_API_CACHE_TIMEOUT)
 
 
 def get_course_catalogs(site, resource_id=None):
@@ -66,21 +67,17 @@ def get_course_catalogs(site, resource_id=None):
 
     cache_key = '{}.{}'.format(base_cache_key, resource_id) if resource_id else base_cache_key
     cache_key = hashlib.md5(cache_key).hexdigest()
-    cached = cache.get(cache_key)
-    if cached:
-        return cached
 
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, resource)
-    response = endpoint(resource_id).get()
+    def fetch():
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, resource)
+        response = endpoint(resource_id).get()
 
-    if resource_id:
-        results = response
-    else:
-        results = traverse_pagination(response, endpoint)
+        if resource_id:
+            return response
+        return traverse_pagination(response, endpoint)
 
-    cache.set(cache_key, results, settings.COURSES_API_CACHE_TIMEOUT)
-    return results
+    return get_or_fetch(cache_key, fetch, settings.COURSES_API_CACHE_TIMEOUT)
 
 
 def get_certificate_type_display_value(certificate_type):
@@ -13,6 +13,7 @@ from requests import Timeout
 from slumber.exceptions import SlumberBaseException
 from waffle import switch_is_active
 
+from ecommerce.core.api_clients import get_api_session
 from ecommerce.core.constants import ENROLLMENT_CODE_SWITCH
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.core.views import StaffOnlyMixin
@@ -54,7 +55,8 @@ class CourseAppView(StaffOnlyMixin, TemplateView):
             try:
                 credit_api = EdxRestApiClient(
                     get_lms_url('/api/credit/v1/'),
-                    oauth_access_token=self.request.user.access_token
+                    oauth_access_token=self.request.user.access_token,
+                    session=get_api_session()
                 )
                 credit_providers = credit_api.providers.get()
                 credit_providers.sort(key=lambda provider: provider['display_name'])
@@ -13,6 +13,7 @@ from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.api_clients import get_api_session
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
@@ -190,5 +191,6 @@ class Checkout(TemplateView):
 
         return EdxRestApiClient(
             get_lms_url('api/credit/v1/'),
-            oauth_access_token=self.request.user.access_token
+            oauth_access_token=self.request.user.access_token,
+            session=get_api_session()
         )
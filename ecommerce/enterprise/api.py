@@ -9,6 +9,7 @@ from django.core.cache import cache
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.cache_utils import get_or_fetch
 from ecommerce.core.utils import get_cache_key
 
 logger = logging.getLogger(__name__)
@@ -153,15 +154,13 @@ def fetch_enterprise_learner_data(site, user):
         username=user.username
     )
 
-    response = cache.get(cache_key)
-    if not response:
+    def fetch():
         api = site.siteconfiguration.enterprise_api_client
         endpoint = getattr(api, api_resource_name)
         querystring = {'username': user.username}
-        response = endpoint().get(**querystring)
-        cache.set(cache_key, response, settings.ENTERPRISE_API_CACHE_TIMEOUT)
+        return endpoint().get(**querystring)
 
-    return response
+    return get_or_fetch(cache_key, fetch, settings.ENTERPRISE_API_CACHE_TIMEOUT)
 
 
 def catalog_contains_course_runs(site, course_run_ids, enterprise_customer_uuid, enterprise_customer_catalog_uuid=None):
@@ -184,22 +183,23 @@ def catalog_contains_course_runs(site, course_run_ids, enterprise_customer_uuid,
         query_params=urlencode(query_params, True)
     )
 
-    contains_content = cache.get(cache_key)
-    if contains_content is None:
+    def fetch():
         api = site.siteconfiguration.enterprise_api_client
         endpoint = getattr(api, api_resource_name)(api_resource_id)
-        try:
-            contains_content = endpoint.contains_content_items.get(**query_params)['contains_content_items']
-            cache.set(cache_key, contains_content, settings.ENTERPRISE_API_CACHE_TIMEOUT)
-        except (ConnectionError, KeyError, SlumberHttpBaseException, Timeout):
-            logger.exception(
-                'Failed to check if course_runs [%s] exist in '
-                'EnterpriseCustomerCatalog [%s]'
-                'for EnterpriseCustomer [%s].',
-                course_run_ids,
-                enterprise_customer_catalog_uuid,
-                enterprise_customer_uuid,
-            )
-            contains_content = False
+        return endpoint.contains_content_items.get(**query_params)['contains_content_items']
+
+    errors = (ConnectionError, KeyError, SlumberHttpBaseException, Timeout)
+    try:
+        contains_content = get_or_fetch(cache_key, fetch, settings.ENTERPRISE_API_CACHE_TIMEOUT, stale_errors=errors)
+    except errors:
+        logger.exception(
+            'Failed to check if course_runs [%s] exist in '
+            'EnterpriseCustomerCatalog [%s]'
+            'for EnterpriseCustomer [%s].',
+            course_run_ids,
+            enterprise_customer_catalog_uuid,
+            enterprise_customer_uuid,
+        )
+        contains_content = False
 
     return contains_content
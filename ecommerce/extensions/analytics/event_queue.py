@@ -0,0 +1,96 @@
+"""
+In-process queue of analytics work, such as building and sending Segment events.
+
+Work is queued by the request threads and run in batches by a background thread, so that analytics do not add
+to the latency of the requests emitting them. The queue is bounded: work queued while it is full is dropped and
+counted, rather than blocking requests or growing memory without limit.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from six.moves import queue
+
+logger = logging.getLogger(__name__)
+
+
+class EventQueue(object):
+    """ Bounded queue of analytics work processed by a background thread. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self.dropped = 0
+        self.failed = 0
+        self.processed = 0
+
+    @property
+    def depth(self):
+        """ Number of queued items that have not been processed yet. """
+        return self._queue.qsize() if self._queue else 0
+
+    def _start(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                if self._queue is None:
+                    self._queue = queue.Queue(settings.ANALYTICS_EVENT_QUEUE_MAXSIZE)
+                self._worker = threading.Thread(target=self._run, name='analytics-event-queue')
+                self._worker.daemon = True
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < settings.ANALYTICS_EVENT_QUEUE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            close_old_connections()
+            for func, args, kwargs in batch:
+                self._process(func, args, kwargs)
+                self._queue.task_done()
+            close_old_connections()
+
+    def _process(self, func, args, kwargs):
+        try:
+            func(*args, **kwargs)
+            self.processed += 1
+        except Exception:  # pylint: disable=broad-except
+            self.failed += 1
+            logger.exception('Failed to process analytics event [%s].', func.__name__)
+
+    def _put(self, func, args, kwargs):
+        self._start()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.warning(
+                'Analytics event queue is full. Dropped [%s], [%d] events dropped so far.', func.__name__, self.dropped
+            )
+
+    def put(self, func, *args, **kwargs):
+        """
+        Queue a call to func, made once the current transaction, if any, is committed.
+
+        The call is made immediately, in the current thread, if ``settings.ANALYTICS_EVENT_QUEUE_ASYNC`` is False.
+        """
+        if not settings.ANALYTICS_EVENT_QUEUE_ASYNC:
+            self._process(func, args, kwargs)
+            return
+
+        # Objects created by the current request are not visible to the background thread until they are committed.
+        transaction.on_commit(lambda: self._put(func, args, kwargs))
+
+    def join(self):
+        """ Block until all queued items have been processed. """
+        if self._queue is not None:
+            self._queue.join()
+
+
+event_queue = EventQueue()
@@ -1,13 +1,20 @@
 """
 Middleware for analytics app to parse GA cookie.
 """
+from django.conf import settings
+from django.core.cache import cache
 
+from ecommerce.core.utils import get_cache_key
 from ecommerce.extensions.analytics.utils import get_google_analytics_client_id
 
 
 class TrackingMiddleware(object):
     """
     Middleware that parse `_ga` cookie and save/update in user tracking context.
+
+    The client ID is always updated on the user of the request, but it is saved at most once every
+    ``settings.GA_CLIENT_ID_UPDATE_INTERVAL`` seconds per user, so that users switching between browsers do not
+    cause a write on every request. A change skipped this way is saved by the next request after the interval.
     """
 
     def process_request(self, request):
@@ -20,4 +27,13 @@ class TrackingMiddleware(object):
             if ga_client_id and ga_client_id != old_client_id:
                 tracking_context['ga_client_id'] = ga_client_id
                 user.tracking_context = tracking_context
-                user.save()
+                if self._should_save(user):
+                    user.save(update_fields=['tracking_context'])
+
+    def _should_save(self, user):
+        interval = settings.GA_CLIENT_ID_UPDATE_INTERVAL
+        if not interval:
+            return True
+
+        cache_key = get_cache_key(resource='ga_client_id_update', user_id=user.id)
+        return cache.add(cache_key, True, interval)
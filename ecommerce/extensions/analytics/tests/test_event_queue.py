@@ -0,0 +1,75 @@
+import threading
+
+import mock
+from django.test import override_settings
+
+from ecommerce.extensions.analytics.event_queue import EventQueue
+from ecommerce.tests.testcases import TestCase
+
+# pylint: disable=protected-access
+
+
+@override_settings(
+    ANALYTICS_EVENT_QUEUE_ASYNC=True, ANALYTICS_EVENT_QUEUE_MAXSIZE=2, ANALYTICS_EVENT_QUEUE_BATCH_SIZE=10
+)
+class EventQueueTests(TestCase):
+    def setUp(self):
+        super(EventQueueTests, self).setUp()
+        self.event_queue = EventQueue()
+        self.processed = []
+
+    def record(self, value):
+        self.processed.append(value)
+
+    def test_put_sync(self):
+        """ Verify work is done immediately, in the current thread, if the queue is not asynchronous. """
+        with override_settings(ANALYTICS_EVENT_QUEUE_ASYNC=False):
+            self.event_queue.put(self.record, 'event')
+
+        self.assertEqual(self.processed, ['event'])
+        self.assertEqual(self.event_queue.processed, 1)
+        self.assertEqual(self.event_queue.depth, 0)
+
+    def test_put_after_commit(self):
+        """ Verify work is queued once the current transaction is committed. """
+        with mock.patch('django.db.transaction.on_commit') as mock_on_commit:
+            self.event_queue.put(self.record, 'event')
+
+        self.assertEqual(self.processed, [])
+        mock_on_commit.call_args[0][0]()
+        self.event_queue.join()
+        self.assertEqual(self.processed, ['event'])
+
+    def test_batch(self):
+        """ Verify queued work is processed by the background thread, and failures do not stop it. """
+        self.event_queue._put(self.record, ('first',), {})
+        self.event_queue._put(mock.Mock(side_effect=ValueError, __name__='fail'), (), {})
+        self.event_queue.join()
+        self.event_queue._put(self.record, ('second',), {})
+        self.event_queue.join()
+
+        self.assertEqual(self.processed, ['first', 'second'])
+        self.assertEqual(self.event_queue.processed, 2)
+        self.assertEqual(self.event_queue.failed, 1)
+        self.assertEqual(self.event_queue.depth, 0)
+
+    def test_full(self):
+        """ Verify work queued while the queue is full is dropped and counted. """
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        self.event_queue._put(block, (), {})
+        started.wait()
+        for value in range(3):
+            self.event_queue._put(self.record, (value,), {})
+
+        self.assertEqual(self.event_queue.depth, 2)
+        self.assertEqual(self.event_queue.dropped, 1)
+
+        release.set()
+        self.event_queue.join()
+        self.assertEqual(self.processed, [0, 1])
@@ -1,8 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
 from django.test.client import RequestFactory
 
 from ecommerce.extensions.analytics import middleware
 from ecommerce.tests.testcases import TestCase
 
+User = get_user_model()
+
 
 class TrackingMiddlewareTests(TestCase):
     """ Test for TrackingMiddleware. """
@@ -12,11 +17,14 @@ class TrackingMiddlewareTests(TestCase):
         self.request_factory = RequestFactory()
         self.user = self.create_user()
 
-    def _assert_ga_client_id(self, ga_client_id):
+    def _process_request(self, ga_client_id):
         self.request_factory.cookies['_ga'] = 'GA1.2.{}'.format(ga_client_id)
         request = self.request_factory.get('/')
         request.user = self.user
         self.middleware.process_request(request)
+
+    def _assert_ga_client_id(self, ga_client_id):
+        self._process_request(ga_client_id)
         expected_client_id = self.user.tracking_context.get('ga_client_id')
         self.assertEqual(ga_client_id, expected_client_id)
 
@@ -28,3 +36,29 @@ class TrackingMiddlewareTests(TestCase):
         updated_client_id = 'updated-client-id'
         self.assertNotEqual(updated_client_id, self.user.tracking_context.get('ga_client_id'))
         self._assert_ga_client_id(updated_client_id)
+
+    def _assert_saved_client_id(self, ga_client_id):
+        self.assertEqual(User.objects.get(id=self.user.id).tracking_context.get('ga_client_id'), ga_client_id)
+
+    def test_process_request_rate_limited(self):
+        """ Verify changes to the GA client ID are saved at most once per interval, and only if needed. """
+        self._process_request('first-client-id')
+        self._assert_saved_client_id('first-client-id')
+
+        with self.assertNumQueries(0):
+            self._process_request('second-client-id')
+            self._process_request('second-client-id')
+        self.assertEqual(self.user.tracking_context['ga_client_id'], 'second-client-id')
+        self._assert_saved_client_id('first-client-id')
+
+        # Once the interval has elapsed, the latest client ID is saved.
+        cache.clear()
+        self._process_request('third-client-id')
+        self._assert_saved_client_id('third-client-id')
+
+    @override_settings(GA_CLIENT_ID_UPDATE_INTERVAL=0)
+    def test_process_request_without_interval(self):
+        """ Verify every change to the GA client ID is saved if there is no interval. """
+        for ga_client_id in ('first-client-id', 'second-client-id'):
+            self._process_request(ga_client_id)
+            self._assert_saved_client_id(ga_client_id)
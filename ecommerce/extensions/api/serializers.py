@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 import logging
+from collections import OrderedDict
 from decimal import Decimal
 
 import waffle
@@ -26,6 +27,7 @@ Benefit = get_model('offer', 'Benefit')
 BillingAddress = get_model('order', 'BillingAddress')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
+CouponJob = get_model('voucher', 'CouponJob')
 Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 Partner = get_model('partner', 'Partner')
@@ -539,7 +541,8 @@ class CouponListSerializer(serializers.ModelSerializer):
         return Invoice.objects.get(order__lines__product=obj).business_client.name
 
     def get_code(self, obj):
-        if is_custom_code(obj):
+        # The vouchers of coupons created asynchronously do not exist until their CouponJob has run.
+        if retrieve_voucher(obj) and is_custom_code(obj):
             return retrieve_voucher(obj).code
 
     class Meta(object):
@@ -547,6 +550,25 @@ class CouponListSerializer(serializers.ModelSerializer):
         fields = ('category', 'client', 'code', 'id', 'title', 'date_created')
 
 
+class CouponJobSerializer(serializers.ModelSerializer):
+    """ Serializer for CouponJob objects. """
+    progress = serializers.SerializerMethodField()
+    report = serializers.SerializerMethodField()
+
+    def get_progress(self, obj):
+        return obj.get_progress()
+
+    def get_report(self, obj):
+        """ Returns the URL of the staff-only view serving the report, which is kept in private storage. """
+        if not obj.report:
+            return None
+        return reverse('api:v2:coupons:coupon_job_report', args=[obj.id], request=self.context.get('request'))
+
+    class Meta(object):
+        model = CouponJob
+        fields = ('id', 'job_type', 'status', 'progress', 'coupon', 'report', 'error', 'created', 'modified')
+
+
 class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
     """ Serializer for Coupons. """
     benefit_type = serializers.SerializerMethodField()
@@ -573,6 +595,27 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
     start_date = serializers.SerializerMethodField()
     voucher_type = serializers.SerializerMethodField()
 
+    # Fields which can be serialized before the vouchers of a coupon created by a CouponJob exist.
+    PENDING_COUPON_FIELDS = (
+        'category', 'client', 'id', 'last_edited', 'note', 'payment_information', 'price', 'title'
+    )
+
+    def to_representation(self, instance):
+        if retrieve_voucher(instance):
+            return super(CouponSerializer, self).to_representation(instance)
+
+        # The vouchers of coupons created asynchronously do not exist until their CouponJob has run. The fields
+        # describing the vouchers are empty until then, and the latest job of the coupon is included instead.
+        representation = OrderedDict((field_name, None) for field_name in self.Meta.fields)
+        for field_name in self.PENDING_COUPON_FIELDS:
+            field = self.fields[field_name]
+            attribute = field.get_attribute(instance)
+            representation[field_name] = None if attribute is None else field.to_representation(attribute)
+
+        job = instance.coupon_jobs.order_by('-id').first()
+        representation['job'] = CouponJobSerializer(job, context=self.context).data if job else None
+        return representation
+
     def get_benefit_type(self, obj):
         return retrieve_benefit(obj).type or getattr(retrieve_benefit(obj).proxy(), 'benefit_class_type', None)
 
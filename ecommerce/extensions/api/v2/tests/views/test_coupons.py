@@ -3,14 +3,18 @@ from __future__ import unicode_literals
 
 import datetime
 import json
+import shutil
+import tempfile
 from decimal import Decimal
 from uuid import uuid4
 
 import ddt
 import httpretty
+import mock
 import pytz
+from django.core.files.base import ContentFile
 from django.core.urlresolvers import reverse
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from django.utils.timezone import now
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
 from oscar.core.loading import get_class, get_model
@@ -22,7 +26,8 @@ from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api.v2.views.coupons import CouponViewSet
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
-from ecommerce.extensions.voucher.models import CouponVouchers
+from ecommerce.extensions.voucher.models import CouponJob, CouponVouchers
+from ecommerce.extensions.voucher.tasks import process_coupon_job
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.constants import BENEFIT_MAP
 from ecommerce.programs.custom import class_path
@@ -1129,6 +1134,113 @@ class CouponViewSetFunctionalTest(CouponMixin, DiscoveryTestMixin, DiscoveryMock
         details = self._create_and_get_coupon_details()
         self.assertEqual(details['benefit_type'], benefit_type)
 
+    def test_create_async(self):
+        """ Verify the vouchers of a coupon created asynchronously are created by a CouponJob. """
+        self.data['title'] = 'Async čoupon'
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda func: func()):
+            response = self.client.post(COUPONS_LINK + '?async=1', json.dumps(self.data), 'application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        coupon = Product.objects.get(title=self.data['title'])
+        job = CouponJob.objects.get(coupon=coupon)
+        response_data = json.loads(response.content)
+        self.assertEqual(response_data['coupon_id'], coupon.id)
+        self.assertEqual(response_data['job']['id'], job.id)
+        self.assertEqual(job.job_type, CouponJob.CREATE)
+        self.assertEqual(job.status, CouponJob.COMPLETE)
+        self.assertEqual(coupon.attr.coupon_vouchers.vouchers.count(), self.data['quantity'])
+
+    def test_update_async(self):
+        """ Verify the vouchers of a coupon updated asynchronously are updated by a CouponJob. """
+        path = reverse('api:v2:coupons-detail', kwargs={'pk': self.coupon.id})
+        data = {'id': self.coupon.id, 'name': 'New voucher name', 'benefit_value': 50}
+        with mock.patch('ecommerce.extensions.api.v2.views.coupons.process_coupon_job.delay') as mock_delay:
+            response = self.client.put(path + '?async=1', json.dumps(data), 'application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = CouponJob.objects.get(coupon=self.coupon)
+        self.assertEqual(json.loads(response.content)['job']['status'], CouponJob.PENDING)
+        self.assertEqual(job.job_type, CouponJob.UPDATE)
+        # The job is only run once the transaction of the request is committed.
+        self.assertFalse(mock_delay.called)
+
+        vouchers = self.coupon.attr.coupon_vouchers.vouchers.all()
+        self.assertNotEqual(vouchers.first().name, 'New voucher name')
+
+        process_coupon_job(job.id)
+        for voucher in vouchers:
+            self.assertEqual(voucher.name, 'New voucher name')
+            self.assertEqual(voucher.offers.first().benefit.value, Decimal(50.0))
+
+    def test_report(self):
+        """ Verify a CouponJob is created to generate the report of a coupon. """
+        path = reverse('api:v2:coupons-report', kwargs={'pk': self.coupon.id})
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda func: func()):
+            with mock.patch('ecommerce.extensions.api.v2.views.coupons.process_coupon_job.delay') as mock_delay:
+                response = self.client.post(path)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = CouponJob.objects.get(id=json.loads(response.content)['id'])
+        self.assertEqual(job.job_type, CouponJob.REPORT)
+        self.assertEqual(job.coupon, self.coupon)
+        self.assertEqual(job.user, self.user)
+        mock_delay.assert_called_once_with(job.id)
+
+    def test_coupon_job(self):
+        """ Verify the status of coupon jobs of the site can be retrieved. """
+        job = CouponJob.objects.create(job_type=CouponJob.REPORT, coupon=self.coupon, site=self.site)
+        response_data = self.get_response_json('GET', reverse('api:v2:coupons:coupon_jobs', args=[job.id]))
+        self.assertEqual(response_data['id'], job.id)
+        self.assertEqual(response_data['status'], CouponJob.PENDING)
+        self.assertEqual(response_data['progress'], 0)
+        self.assertIsNone(response_data['report'])
+
+        other_job = CouponJob.objects.create(
+            job_type=CouponJob.REPORT, coupon=self.coupon, site=SiteConfigurationFactory().site
+        )
+        response = self.client.get(reverse('api:v2:coupons:coupon_jobs', args=[other_job.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pending_coupon_details(self):
+        """ Verify the details of a coupon whose vouchers are not created yet include its pending job. """
+        self.data['title'] = 'Pending čoupon'
+        with mock.patch('ecommerce.extensions.api.v2.views.coupons.process_coupon_job.delay'):
+            response = self.client.post(COUPONS_LINK + '?async=1', json.dumps(self.data), 'application/json')
+
+        coupon = Product.objects.get(title=self.data['title'])
+        response_data = self.get_response_json('GET', reverse('api:v2:coupons-detail', args=[coupon.id]))
+        self.assertEqual(response_data['id'], coupon.id)
+        self.assertEqual(response_data['title'], self.data['title'])
+        self.assertEqual(response_data['client'], self.data['client'])
+        self.assertIsNone(response_data['code'])
+        self.assertIsNone(response_data['voucher_type'])
+        self.assertEqual(response_data['job']['id'], json.loads(response.content)['job']['id'])
+        self.assertEqual(response_data['job']['status'], CouponJob.PENDING)
+
+    def test_coupon_job_report(self):
+        """ Verify the report of a coupon job is only served to staff users, from private storage. """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        job = CouponJob.objects.create(job_type=CouponJob.REPORT, coupon=self.coupon, site=self.site)
+        path = reverse('api:v2:coupons:coupon_job_report', args=[job.id])
+
+        with override_settings(PRIVATE_MEDIA_ROOT=media_root):
+            self.assertEqual(self.client.get(path).status_code, status.HTTP_404_NOT_FOUND)
+
+            job.report.save('report.csv', ContentFile('Code\nABC\n'))
+            self.assertTrue(job.report.path.startswith(media_root))
+            response_data = self.get_response_json('GET', reverse('api:v2:coupons:coupon_jobs', args=[job.id]))
+            self.assertTrue(response_data['report'].endswith(path))
+
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(b''.join(response.streaming_content), b'Code\nABC\n')
+
+            self.client.logout()
+            user = self.create_user()
+            self.client.login(username=user.username, password=self.password)
+            self.assertEqual(self.client.get(path).status_code, status.HTTP_403_FORBIDDEN)
+
 
 class CouponCategoriesListViewTests(TestCase):
     """ Tests for the coupon category list view. """
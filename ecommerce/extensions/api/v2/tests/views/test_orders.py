@@ -1,19 +1,23 @@
 import json
+import uuid
 
 import ddt
 import httpretty
 import mock
 from django.contrib.auth.models import Permission
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from oscar.core.loading import get_model
 
+from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.api.tests.test_authentication import AccessTokenMixin
 from ecommerce.extensions.api.v2.tests.views import OrderDetailViewTestMixin
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.test.factories import create_order
+from ecommerce.extensions.test.factories import create_basket, create_order, prepare_voucher
 from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.mixins import ThrottlingMixin
 from ecommerce.tests.testcases import TestCase
@@ -83,6 +87,31 @@ class OrderListViewTests(AccessTokenMixin, ThrottlingMixin, TestCase):
         self.assertEqual(content['results'][0]['number'], unicode(order_2.number))
         self.assertEqual(content['results'][1]['number'], unicode(order.number))
 
+    def create_seat_order(self):
+        """ Create an order for a course seat, placed with a voucher. """
+        seat = CourseFactory().create_or_update_seat('verified', True, 50, self.partner)
+        basket = create_basket(owner=self.user, site=self.site, empty=True)
+        basket.add_product(seat)
+        voucher, __ = prepare_voucher(code=uuid.uuid4().hex[:8])
+        basket.vouchers.add(voucher)
+        return create_order(basket=basket, user=self.user)
+
+    def test_query_count(self):
+        """ The number of queries made by the view should not depend on the number of orders listed. """
+        self.create_seat_order()
+        with CaptureQueriesContext(connection) as single_order_queries:
+            response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(json.loads(response.content)['count'], 1)
+
+        for __ in range(4):
+            self.create_seat_order()
+        with CaptureQueriesContext(connection) as multiple_order_queries:
+            response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        content = json.loads(response.content)
+        self.assertEqual(content['count'], 5)
+        self.assertEqual(len(content['results'][0]['vouchers']), 1)
+        self.assertEqual(len(multiple_order_queries), len(single_order_queries))
+
     def test_with_other_users_orders(self):
         """ The view should only return orders for the authenticated users. """
         other_user = self.create_user()
@@ -3,13 +3,14 @@ import json
 import ddt
 import httpretty
 import mock
-from django.core.urlresolvers import reverse
+from django.core.urlresolvers import resolve, reverse
 from oscar.core.loading import get_model
 from rest_framework import status
 
 from ecommerce.extensions.api.serializers import RefundSerializer
 from ecommerce.extensions.api.tests.test_authentication import AccessTokenMixin
 from ecommerce.extensions.api.v2.tests.views import JSON_CONTENT_TYPE
+from ecommerce.extensions.refund.api import create_refunds_for_course
 from ecommerce.extensions.refund.status import REFUND
 from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
@@ -229,6 +230,87 @@ class RefundCreateViewTests(RefundTestMixin, AccessTokenMixin, JwtMixin, TestCas
         self.assertEqual(Refund.objects.count(), 0)
 
 
+@ddt.ddt
+class BulkRefundCreateViewTests(RefundTestMixin, TestCase):
+    path = reverse('api:v2:refunds:bulk_create')
+
+    def setUp(self):
+        super(BulkRefundCreateViewTests, self).setUp()
+        self.course_id = 'edX/DemoX/Demo_Course'
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+
+    def post(self, data):
+        return self.client.post(self.path, json.dumps(data), JSON_CONTENT_TYPE)
+
+    def test_staff_only(self):
+        """ The view should only be accessible to staff users. """
+        user = self.create_user(is_staff=False)
+        self.client.login(username=user.username, password=self.password)
+        response = self.post({'course_id': self.course_id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_missing_course_id(self):
+        """ If course_id is missing from the POST body, return HTTP 400. """
+        response = self.post({})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), {'detail': 'No course_id specified.'})
+
+    def test_invalid_usernames(self):
+        """ If usernames is not a list, return HTTP 400. """
+        response = self.post({'course_id': self.course_id, 'usernames': 'learner'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_valid_orders(self):
+        """ The view should create a refund for each order of the course, and queue their approval if requested. """
+        orders = [self.create_order(user=self.create_user()) for __ in range(2)]
+
+        with mock.patch('ecommerce.extensions.api.v2.views.refunds.create_refunds_for_course',
+                        wraps=create_refunds_for_course) as mock_create:
+            response = self.post({'course_id': self.course_id, 'approve': True})
+            mock_create.assert_called_once_with(self.course_id, usernames=None, approve=True)
+
+        refunds = list(Refund.objects.order_by('id'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), [refund.id for refund in refunds])
+        for refund, order in zip(refunds, orders):
+            self.assert_refund_matches_order(refund, order)
+
+        # A second call should result in no additional refunds being created
+        response = self.post({'course_id': self.course_id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [])
+
+    @ddt.data(('false', False), ('0', False), (False, False), ('true', True), ('1', True), (True, True))
+    @ddt.unpack
+    def test_approve(self, value, approve):
+        """ The approve flag should be parsed as a boolean, including from strings. """
+        with mock.patch('ecommerce.extensions.api.v2.views.refunds.create_refunds_for_course',
+                        return_value=[]) as mock_create:
+            response = self.post({'course_id': self.course_id, 'approve': value})
+            mock_create.assert_called_once_with(self.course_id, usernames=None, approve=approve)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_approve(self):
+        """ If approve is not a boolean, return HTTP 400. """
+        response = self.post({'course_id': self.course_id, 'approve': 'maybe'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(json.loads(response.content), {'detail': 'approve must be a boolean.'})
+
+    def test_non_atomic(self):
+        """ The view should not run in the request's transaction, so that each batch of refunds is committed. """
+        self.assertIn('default', resolve(self.path).func._non_atomic_requests)  # pylint: disable=protected-access
+
+    def test_usernames(self):
+        """ Only the orders of the given users should be refunded. """
+        order = self.create_order(user=self.create_user())
+        self.create_order(user=self.create_user())
+
+        response = self.post({'course_id': self.course_id, 'usernames': [order.user.username]})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), [Refund.objects.get(order=order).id])
+
+
 @ddt.ddt
 class RefundProcessViewTests(ThrottlingMixin, TestCase):
     def setUp(self):
@@ -7,7 +7,9 @@ import httpretty
 import mock
 import pytz
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.http import Http404
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
@@ -156,6 +158,17 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
         self.assertEqual(len(offers), 1)
 
+    @httpretty.activate
+    def test_get_offers_query_count(self):
+        """ Verify the number of queries made to list offers does not depend on the number of course runs. """
+        self.mock_access_token_response()
+        __, request, voucher = self.prepare_get_offers_response(quantity=100)
+
+        with CaptureQueriesContext(connection) as queries:
+            offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 100)
+        self.assertLessEqual(len(queries), 15)
+
     @httpretty.activate
     def test_omitting_already_bought_credit_seat(self):
         """ Verify a seat that the user bought is omitted from offer page results. """
@@ -44,12 +44,15 @@ PAYMENT_URLS = [
 
 REFUND_URLS = [
     url(r'^$', refund_views.RefundCreateView.as_view(), name='create'),
+    url(r'^bulk/$', refund_views.BulkRefundCreateView.as_view(), name='bulk_create'),
     url(r'^(?P<pk>[\d]+)/process/$', refund_views.RefundProcessView.as_view(), name='process'),
 ]
 
 COUPON_URLS = [
     url(r'^coupon_reports/(?P<coupon_id>[\d]+)/$', CouponReportCSVView.as_view(), name='coupon_reports'),
     url(r'^categories/$', coupon_views.CouponCategoriesListView.as_view(), name='coupons_categories'),
+    url(r'^jobs/(?P<pk>[\d]+)/$', coupon_views.CouponJobRetrieveView.as_view(), name='coupon_jobs'),
+    url(r'^jobs/(?P<pk>[\d]+)/report/$', coupon_views.CouponJobReportView.as_view(), name='coupon_job_report'),
 ]
 
 CHECKOUT_URLS = [
@@ -1,14 +1,16 @@
 from __future__ import unicode_literals
 
 import logging
+import os
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, transaction
-from django.http import Http404
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from oscar.core.loading import get_model
 from rest_framework import filters, generics, serializers, status, viewsets
+from rest_framework.decorators import detail_route
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
@@ -18,20 +20,25 @@ from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.api.filters import ProductFilter
-from ecommerce.extensions.api.serializers import CategorySerializer, CouponListSerializer, CouponSerializer
+from ecommerce.extensions.api.serializers import (
+    CategorySerializer,
+    CouponJobSerializer,
+    CouponListSerializer,
+    CouponSerializer
+)
 from ecommerce.extensions.basket.utils import prepare_basket
 from ecommerce.extensions.catalogue.utils import create_coupon_product, get_or_create_catalog
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.processors.invoice import InvoicePayment
-from ecommerce.extensions.voucher.models import CouponVouchers
-from ecommerce.extensions.voucher.utils import update_voucher_offer
+from ecommerce.extensions.voucher.models import CouponJob, CouponVouchers
+from ecommerce.extensions.voucher.tasks import process_coupon_job
+from ecommerce.extensions.voucher.utils import update_coupon_offer, update_coupon_vouchers
 from ecommerce.invoice.models import Invoice
 
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
-Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
@@ -67,6 +74,9 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         This information is then used to create a coupon product, add to a
         basket and create an order from it.
 
+        If the async query parameter is set, the vouchers are created by a CouponJob after the request
+        is processed, so that the duration of the request does not depend on the number of vouchers.
+
         Arguments:
             request (HttpRequest): With parameters title, client,
             stock_record_ids, start_date, end_date, code, benefit_type, benefit_value,
@@ -75,6 +85,8 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         Returns:
             200 if the order was created successfully; the basket ID is included in the response
                 body along with the order ID and payment information.
+            202 if the order was created and the vouchers will be created by a CouponJob; the job
+                is included in the response body, in addition to the data above.
             400 if a custom code is received that already exists,
                 if a course mode is selected that is not supported.
             401 if an unauthenticated request is denied permission to access the endpoint.
@@ -90,6 +102,7 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                     # FIXME This should ALWAYS return 400.
                     return Response(error.message, status=error.code or 400)
 
+                run_async = self.should_run_async()
                 try:
                     coupon_product = create_coupon_product(
                         benefit_type=cleaned_voucher_data['benefit_type'],
@@ -112,7 +125,8 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                         title=cleaned_voucher_data['title'],
                         voucher_type=cleaned_voucher_data['voucher_type'],
                         program_uuid=cleaned_voucher_data['program_uuid'],
-                        site=self.request.site
+                        site=self.request.site,
+                        defer_vouchers=run_async
                     )
                 except (KeyError, IntegrityError) as error:
                     logger.exception('Coupon creation failed!')
@@ -127,10 +141,67 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                     basket, coupon_id=coupon_product.id, client=client, invoice_data=invoice_data
                 )
 
+                if run_async:
+                    job = self.create_job(
+                        CouponJob.CREATE, coupon_product, data=self.get_voucher_job_data(cleaned_voucher_data)
+                    )
+                    response_data['job'] = CouponJobSerializer(job, context=self.get_serializer_context()).data
+                    return Response(response_data, status=status.HTTP_202_ACCEPTED)
+
                 return Response(response_data, status=status.HTTP_200_OK)
         except ValidationError as e:
             raise serializers.ValidationError(e.message)
 
+    def should_run_async(self):
+        """ Returns True if the vouchers of the coupon should be created or updated by a CouponJob. """
+        return self.request.GET.get('async', '').lower() in ('1', 'true')
+
+    def create_job(self, job_type, coupon, data=None):
+        """
+        Creates a CouponJob and runs it once the transaction of the request is committed.
+
+        Arguments:
+            job_type (str): Type of the job, e.g. CouponJob.CREATE.
+            coupon (Product): Coupon product the job is run for.
+            data (dict): Arguments of the job.
+
+        Returns:
+            CouponJob
+        """
+        job = CouponJob.objects.create(
+            job_type=job_type,
+            coupon=coupon,
+            site=self.request.site,
+            user=self.request.user,
+            data=data or {}
+        )
+        transaction.on_commit(lambda: process_coupon_job.delay(job.id))
+        logger.info('Created [%s] job [%d] for coupon [%d].', job_type, job.id, coupon.id)
+        return job
+
+    @classmethod
+    def get_voucher_job_data(cls, cleaned_voucher_data):
+        """ Returns the arguments of a CouponJob creating the vouchers described by the cleaned request data. """
+        catalog = cleaned_voucher_data['coupon_catalog']
+        return {
+            'benefit_type': cleaned_voucher_data['benefit_type'],
+            'benefit_value': cleaned_voucher_data['benefit_value'],
+            'catalog': catalog.id if catalog else None,
+            'catalog_query': cleaned_voucher_data['catalog_query'],
+            'code': cleaned_voucher_data['code'],
+            'course_catalog': cleaned_voucher_data['course_catalog'],
+            'course_seat_types': cleaned_voucher_data['course_seat_types'],
+            'email_domains': cleaned_voucher_data['email_domains'],
+            'end_datetime': cleaned_voucher_data['end_datetime'],
+            'enterprise_customer': cleaned_voucher_data['enterprise_customer'],
+            'max_uses': cleaned_voucher_data['max_uses'],
+            'name': cleaned_voucher_data['title'],
+            'quantity': cleaned_voucher_data['quantity'],
+            'start_datetime': cleaned_voucher_data['start_datetime'],
+            'voucher_type': cleaned_voucher_data['voucher_type'],
+            'program_uuid': cleaned_voucher_data['program_uuid'],
+        }
+
     @classmethod
     def clean_voucher_request_data(cls, request):
         """
@@ -330,25 +401,36 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         voucher_range.save()
 
     def update(self, request, *args, **kwargs):
-        """Update coupon depending on request data sent."""
+        """
+        Update coupon depending on request data sent.
+
+        If the async query parameter is set, the vouchers and their offers are updated by a CouponJob
+        after the request is processed, and the job is included in the response body.
+        """
         try:
             super(CouponViewSet, self).update(request, *args, **kwargs)
 
             coupon = self.get_object()
             vouchers = coupon.attr.coupon_vouchers.vouchers
             baskets = Basket.objects.filter(lines__product_id=coupon.id, status=Basket.SUBMITTED)
-            data = self.create_update_data_dict(data=request.data, fields=CouponVouchers.UPDATEABLE_VOUCHER_FIELDS)
-
-            if data:
-                vouchers.all().update(**data)
+            voucher_data = self.create_update_data_dict(
+                data=request.data, fields=CouponVouchers.UPDATEABLE_VOUCHER_FIELDS
+            )
+            offer_data = self.clean_offer_data(request.data, vouchers, coupon.id)
 
             self.update_range_data(request, vouchers)
 
-            program_uuid = request.data.get('program_uuid')
-            benefit_value = request.data.get('benefit_value')
-            if benefit_value or program_uuid:
-                self.update_coupon_offer(benefit_value=benefit_value, vouchers=vouchers,
-                                         coupon=coupon, program_uuid=program_uuid)
+            job_data = {
+                'voucher_data': voucher_data,
+                'benefit_value': request.data.get('benefit_value'),
+                'program_uuid': request.data.get('program_uuid'),
+                'offer_data': offer_data,
+            }
+            job = None
+            if self.should_run_async():
+                job = self.create_job(CouponJob.UPDATE, coupon, data=job_data)
+            else:
+                update_coupon_vouchers(coupon, **job_data)
 
             category_data = request.data.get('category')
             if category_data:
@@ -368,9 +450,12 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                 coupon.attr.note = note
                 coupon.save()
 
-            self.update_offer_data(request.data, vouchers, coupon.id)
             self.update_invoice_data(coupon, request.data)
 
+            if job:
+                serialized_job = CouponJobSerializer(job, context=self.get_serializer_context()).data
+                return Response({'job': serialized_job}, status=status.HTTP_202_ACCEPTED)
+
             serializer = self.get_serializer(coupon)
             return Response(serializer.data)
         except ValidationError as error:
@@ -416,30 +501,7 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             benefit_value (Decimal): Benefit value associated with a new offer
             program_uuid (str): Program UUID
         """
-        voucher_offers = vouchers.first().offers
-        voucher_offer = voucher_offers.first()
-
-        if program_uuid:
-            Condition.objects.filter(
-                program_uuid=voucher_offer.condition.program_uuid
-            ).update(program_uuid=program_uuid)
-
-        # The program uuid (if program coupon) is required for the benefit and condition update logic
-        program_uuid = program_uuid or voucher_offer.condition.program_uuid
-
-        new_offer = update_voucher_offer(
-            offer=voucher_offer,
-            benefit_value=benefit_value or voucher_offer.benefit.value,
-            benefit_type=voucher_offer.benefit.type or getattr(
-                voucher_offer.benefit.proxy(), 'benefit_class_type', None
-            ),
-            coupon=coupon,
-            max_uses=voucher_offer.max_global_applications,
-            program_uuid=program_uuid
-        )
-        for voucher in vouchers.all():
-            voucher.offers.clear()
-            voucher.offers.add(new_offer)
+        update_coupon_offer(coupon, vouchers, benefit_value=benefit_value, program_uuid=program_uuid)
 
     def update_coupon_client(self, baskets, client_username):
         """
@@ -465,7 +527,15 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         if invoice_data:
             Invoice.objects.filter(order__lines__product=coupon).update(**invoice_data)
 
-    def update_offer_data(self, data, vouchers, coupon_id):
+    def clean_offer_data(self, data, vouchers, coupon_id):
+        """
+        Returns the validated values of the offer fields to update, or raises a ValidationError.
+
+        Arguments:
+            data (QueryDict): Request data
+            vouchers (ManyRelatedManager): Vouchers associated with the coupon to be updated
+            coupon_id (int): ID of the coupon to be updated
+        """
         offer_data = self.create_update_data_dict(data=data, fields=ConditionalOffer.UPDATABLE_OFFER_FIELDS)
 
         if offer_data:
@@ -484,7 +554,15 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
                         raise ValueError
                 except ValueError:
                     raise ValidationError('max_global_applications field must be a positive number.')
-            ConditionalOffer.objects.filter(vouchers__in=vouchers.all()).update(**offer_data)
+        return offer_data
+
+    @detail_route(methods=['post'])
+    def report(self, request, pk=None):  # pylint: disable=unused-argument
+        """ Creates a CouponJob generating the report of the coupon, which is attached to the job once complete. """
+        coupon = self.get_object()
+        job = self.create_job(CouponJob.REPORT, coupon)
+        serialized_job = CouponJobSerializer(job, context=self.get_serializer_context()).data
+        return Response(serialized_job, status=status.HTTP_202_ACCEPTED)
 
     def destroy(self, request, pk):  # pylint: disable=unused-argument
         try:
@@ -500,6 +578,32 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         coupon.delete()
 
 
+class CouponJobRetrieveView(generics.RetrieveAPIView):
+    """ Coupon job resource, polled by clients to follow the progress of the job. """
+    permission_classes = (IsAuthenticated, IsAdminUser)
+    serializer_class = CouponJobSerializer
+
+    def get_queryset(self):
+        return CouponJob.objects.filter(site=self.request.site)
+
+
+class CouponJobReportView(generics.RetrieveAPIView):
+    """ Serves the report of a coupon job, which is kept in private storage as it lists every voucher code. """
+    permission_classes = (IsAuthenticated, IsAdminUser)
+
+    def get_queryset(self):
+        return CouponJob.objects.filter(site=self.request.site, job_type=CouponJob.REPORT)
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        if not job.report:
+            raise Http404
+
+        response = FileResponse(job.report.storage.open(job.report.name, 'rb'), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename={}'.format(os.path.basename(job.report.name))
+        return response
+
+
 class CouponCategoriesListView(generics.ListAPIView):
     serializer_class = CategorySerializer
 
@@ -1,6 +1,7 @@
 """HTTP endpoints for interacting with orders."""
 import logging
 
+from django.db.models import Prefetch
 from oscar.core.loading import get_class, get_model
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import detail_route
@@ -15,13 +16,33 @@ from ecommerce.extensions.api.throttles import ServiceUserThrottle
 
 logger = logging.getLogger(__name__)
 
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 
 
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
-    queryset = Order.objects.all()
+    # Everything read by OrderSerializer is loaded with a fixed number of queries, regardless of the number of
+    # orders, lines and vouchers serialized.
+    lines_prefetch = Prefetch(
+        'lines',
+        queryset=Line.objects.select_related('product__product_class', 'product__parent__product_class').all()
+    )
+    product_attribute_value_prefetch = Prefetch(
+        'lines__product__attribute_values',
+        queryset=ProductAttributeValue.objects.select_related('attribute').all()
+    )
+    queryset = Order.objects.select_related('basket', 'billing_address', 'user').prefetch_related(
+        lines_prefetch,
+        product_attribute_value_prefetch,
+        'lines__product__stockrecords',
+        'basket__vouchers__applications',
+        'basket__vouchers__offers__benefit',
+        'discounts',
+        'sources__source_type',
+    )
     serializer_class = serializers.OrderSerializer
     throttle_classes = (ServiceUserThrottle,)
     filter_backends = (filters.DjangoFilterBackend,)
@@ -1,8 +1,11 @@
 """HTTP endpoints for interacting with refunds."""
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from oscar.core.loading import get_model
 from rest_framework import generics, status
-from rest_framework.exceptions import ParseError
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.fields import BooleanField
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
@@ -11,6 +14,7 @@ from ecommerce.extensions.api.exceptions import BadRequestException
 from ecommerce.extensions.api.permissions import CanActForUser
 from ecommerce.extensions.refund.api import (
     create_refunds,
+    create_refunds_for_course,
     create_refunds_for_entitlement,
     find_orders_associated_with_course
 )
@@ -106,6 +110,63 @@ class RefundCreateView(generics.CreateAPIView):
         return Response([], status=status.HTTP_200_OK)
 
 
+class BulkRefundCreateView(generics.CreateAPIView):
+    """Creates refunds for all learners of a course.
+
+    Given a course ID, this view creates a refund for each complete order with lines associated with the course,
+    which have not been refunded, e.g. when the course is cancelled. The refunds can optionally be approved, and
+    their credit issued, in the background.
+
+    Only staff users are permitted to use this view.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+
+    def get_serializer(self):
+        pass
+
+    # Disable atomicity for the view. Refunds are created in a transaction per batch of orders, which would otherwise
+    # become savepoints of the request's transaction, keeping every order locked and delaying the approval of the
+    # refunds until the whole course has been processed.
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(BulkRefundCreateView, self).dispatch(request, *args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        """
+        Creates refunds, if eligible orders exist.
+
+        Arguments:
+            course_id (string): The course for which to refund all learners
+            usernames (list): Optional, the only learners to refund
+            approve (bool): Optional, whether to approve the refunds in the background
+
+        Returns:
+            refunds (list): List of refunds created
+        """
+        course_id = request.data.get('course_id')
+        usernames = request.data.get('usernames')
+
+        if not course_id:
+            raise BadRequestException('No course_id specified.')
+
+        try:
+            approve = BooleanField().to_internal_value(request.data.get('approve', False))
+        except ValidationError:
+            raise BadRequestException('approve must be a boolean.')
+
+        if usernames is not None and not isinstance(usernames, list):
+            raise BadRequestException('usernames must be a list.')
+
+        try:
+            refunds = create_refunds_for_course(course_id, usernames=usernames, approve=approve)
+        except ValueError as exc:
+            raise BadRequestException(str(exc))
+
+        refund_ids = [refund.id for refund in refunds]
+        http_status = status.HTTP_201_CREATED if refunds else status.HTTP_200_OK
+        return Response(refund_ids, status=http_status)
+
+
 class RefundProcessView(generics.UpdateAPIView):
     """Process--approve or deny--refunds.
 
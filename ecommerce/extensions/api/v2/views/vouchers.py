@@ -4,6 +4,7 @@ from urlparse import urlparse
 
 import django_filters
 from dateutil import parser
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey
@@ -21,9 +22,11 @@ from ecommerce.courses.utils import get_course_info_from_catalog
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 
 logger = logging.getLogger(__name__)
-Order = get_model('order', 'Order')
+CatalogCourseRunIndex = get_model('offer', 'CatalogCourseRunIndex')
+Line = get_model('order', 'Line')
 Product = get_model('catalogue', 'Product')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
@@ -104,7 +107,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            Lists of products and stock records retrieved from results.
         """
         all_course_ids = []
         nonexpired_course_ids = []
@@ -120,8 +123,11 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                 course_id__in=nonexpired_course_ids if seat_type == 'professional' else all_course_ids,
                 attributes__name='certificate_type',
                 attribute_values__value_text=seat_type
+            ).select_related('parent__product_class').prefetch_related(
+                'stockrecords', get_attribute_values_prefetch()
             ))
-        stock_records = StockRecord.objects.filter(product__in=products)
+        # The stock records are prefetched for the strategy, which selects them from product.stockrecords.
+        stock_records = [stock_record for product in products for stock_record in product.stockrecords.all()]
         return products, stock_records
 
     def get_offers_from_query(self, request, voucher, catalog_query):
@@ -142,15 +148,48 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         multiple_credit_providers = False
         credit_provider_price = None
 
+        limit = request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE)
+        offset = request.GET.get('offset')
+        # The local index only holds course run keys, so the course runs are read from the Discovery Service,
+        # unless the index shows that the query matches none of them.
+        index = CatalogCourseRunIndex.get_index(request.site.siteconfiguration.partner, catalog_query=catalog_query)
+        if index and not index.course_run_ids:
+            return offers, None
+
         response = get_catalog_course_runs(
             site=request.site,
             query=catalog_query,
-            limit=request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE),
-            offset=request.GET.get('offset'),
+            limit=limit,
+            offset=offset,
         )
         next_page = response['next']
         products, stock_records = self.retrieve_course_objects(response['results'], course_seat_types)
         contains_verified_course = (course_seat_types == 'verified')
+
+        # Load everything needed to build the offers upfront, so that the number of queries
+        # does not depend on the number of products returned by the catalog query.
+        course_catalog_data = {}
+        for result in response['results']:
+            course_catalog_data.setdefault(result['key'], result)
+        stock_records_by_product = {}
+        for stock_record in stock_records:
+            stock_records_by_product.setdefault(stock_record.product_id, stock_record)
+        courses = Course.objects.in_bulk(set(product.course_id for product in products))
+
+        if course_seat_types == 'credit':
+            purchased_product_ids = set(
+                Line.objects.filter(order__user=request.user, product__in=products).values_list(
+                    'product_id', flat=True
+                )
+            )
+            credit_seat_counts = dict(
+                Product.objects.filter(
+                    parent_id__in=set(product.parent_id for product in products if product.parent_id),
+                    attributes__name='credit_provider'
+                ).order_by().values_list('parent_id').annotate(count=Count('id'))
+            )
+            credit_eligibility = {}
+
         for product in products:
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
@@ -159,43 +198,33 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                 continue
 
             course_id = product.course_id
-            course_catalog_data = next(
-                (result for result in response['results'] if result['key'] == course_id),
-                None
-            )
+            stock_record = stock_records_by_product.get(product.id)
             if course_seat_types == 'credit':
                 # Omit credit seats for which the user is not eligible or which the user already bought.
-                if request.user.is_eligible_for_credit(product.course_id):
-                    if Order.objects.filter(user=request.user, lines__product=product).exists():
-                        continue
-                else:
+                if course_id not in credit_eligibility:
+                    credit_eligibility[course_id] = request.user.is_eligible_for_credit(course_id)
+                if not credit_eligibility[course_id] or product.id in purchased_product_ids:
                     continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
 
-                if credit_seats.count() > 1:
+                if credit_seat_counts.get(product.parent_id, 0) > 1:
                     multiple_credit_providers = True
                     credit_provider_price = None
                 else:
                     multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price_excl_tax
+                    credit_provider_price = stock_record.price_excl_tax if stock_record else None
 
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
+            if not stock_record:
                 logger.error('Stock Record for product %s not found.', product.id)
 
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
+            course = courses.get(course_id)
+            if not course:  # pragma: no cover
                 logger.error('Course %s not found.', course_id)
 
-            if course_catalog_data and course and stock_record:
+            if course_id in course_catalog_data and course and stock_record:
                 offers.append(self.get_course_offer_data(
                     benefit=benefit,
                     course=course,
-                    course_info=course_catalog_data,
+                    course_info=course_catalog_data[course_id],
                     credit_provider_price=credit_provider_price,
                     multiple_credit_providers=multiple_credit_providers,
                     is_verified=contains_verified_course,
@@ -7,13 +7,58 @@ from __future__ import unicode_literals
 
 import time
 
-from django.core.management import BaseCommand
-from django.db import transaction
+from django.core.management import BaseCommand, CommandError
+from django.db import models, transaction
 from oscar.core.loading import get_model
 
 Basket = get_model('basket', 'Basket')
 
 
+def purge(model, ids, lookup='pk'):
+    """
+    Deletes the rows of model matching the given IDs, and the rows depending on them, without loading any of them.
+
+    Dependent rows are deleted, or have their foreign key set to NULL, according to the on_delete of the foreign
+    key, before the rows they depend on. Unlike QuerySet.delete(), no signals are sent.
+
+    Arguments:
+        model (Model): Model of the rows to delete.
+        ids (list): IDs of the rows to delete, or of the rows they depend on.
+        lookup (str): Lookup from model to the IDs.
+
+    Returns:
+        int: Number of rows deleted, including dependent rows.
+    """
+    # pylint: disable=protected-access
+    queryset = model._base_manager.filter(**{lookup + '__in': ids})
+    deleted = 0
+
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        deleted += purge(through, ids, '{}__{}'.format(field.m2m_field_name(), lookup))
+
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            continue
+
+        related_lookup = '{}__{}'.format(relation.field.name, lookup)
+        on_delete = relation.on_delete
+        if on_delete == models.CASCADE:
+            deleted += purge(relation.related_model, ids, related_lookup)
+        elif on_delete == models.SET_NULL:
+            relation.related_model._base_manager.filter(**{related_lookup + '__in': ids}).update(
+                **{relation.field.name: None}
+            )
+        elif on_delete != models.DO_NOTHING:
+            raise CommandError(
+                'Cannot purge [{model}], referenced by [{related_model}] with on_delete={on_delete}.'.format(
+                    model=model.__name__, related_model=relation.related_model.__name__, on_delete=on_delete.__name__
+                )
+            )
+
+    return deleted + queryset._raw_delete(queryset.db)
+
+
 class Command(BaseCommand):
     help = 'Delete baskets for which orders have been placed.'
 
@@ -24,7 +69,20 @@ class Command(BaseCommand):
                             dest='batch_size',
                             default=1000,
                             type=int,
-                            help='Size of each batch of baskets to be deleted.')
+                            help='Initial size of each batch of baskets to be deleted.')
+        parser.add_argument('--max-batch-size',
+                            action='store',
+                            dest='max_batch_size',
+                            default=10000,
+                            type=int,
+                            help='Maximum size of each batch of baskets to be deleted.')
+        # Batches taking longer than this are halved, and batches taking less than half of it are doubled.
+        parser.add_argument('--batch-seconds',
+                            action='store',
+                            dest='batch_seconds',
+                            default=1.0,
+                            type=float,
+                            help='Target duration, in seconds, of each batch deletion.')
         # Sleeping between each batch deletion gives MySQL time to process other connections.
         parser.add_argument('-s', '--sleep-seconds',
                             action='store',
@@ -32,6 +90,14 @@ class Command(BaseCommand):
                             default=3,
                             type=int,
                             help='Seconds to sleep between each batch deletion.')
+        # Deleted baskets are never selected again, so the command can be restarted from the beginning at
+        # any time. Starting from the last ID it reported only saves scanning the baskets it has kept.
+        parser.add_argument('--start-id',
+                            action='store',
+                            dest='start_id',
+                            default=0,
+                            type=int,
+                            help='Only delete baskets with an ID greater than this one.')
         parser.add_argument('--commit',
                             action='store_true',
                             dest='commit',
@@ -41,26 +107,13 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         # Only select those baskets linked to an order, and those not linked to an invoice.
         # TODO: Simplify this query when the foreign key to Basket is removed from Invoice.
-        queryset = Basket.objects.filter(order__isnull=False, invoice__isnull=True)
+        queryset = Basket.objects.filter(order__isnull=False, invoice__isnull=True, id__gt=options['start_id'])
         count = queryset.count()
 
         if options['commit']:
             if count:
                 self.stderr.write('Deleting [{}] baskets.'.format(count))
-
-                batch_size = options['batch_size']
-                sleep_seconds = options['sleep_seconds']
-
-                max_id = queryset.order_by('-id')[0].id
-                for start in range(0, max_id, batch_size):
-                    end = min(start + batch_size, max_id)
-                    self.stderr.write('Deleting baskets [{start}] through [{end}].'.format(start=start, end=end))
-                    with transaction.atomic():
-                        queryset.filter(pk__gte=start, pk__lte=end).delete()
-
-                    self.stderr.write('Complete. Sleeping.'.format(start=start, end=end))
-                    time.sleep(sleep_seconds)
-
+                self.delete_baskets(queryset, options)
                 self.stderr.write('All baskets deleted.')
             else:
                 self.stderr.write('No baskets to delete.')
@@ -68,3 +121,47 @@ class Command(BaseCommand):
             msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
                   'would have deleted [{}] baskets.'.format(count)
             self.stderr.write(msg)
+
+    def delete_baskets(self, queryset, options):
+        batch_size = options['batch_size']
+        batch_seconds = options['batch_seconds']
+        last_id = 0
+        total_baskets = total_rows = 0
+        total_seconds = 0.0
+
+        while True:
+            ids = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+
+            start = time.time()
+            with transaction.atomic():
+                rows = purge(Basket, ids)
+            elapsed = time.time() - start
+
+            last_id = ids[-1]
+            total_baskets += len(ids)
+            total_rows += rows
+            total_seconds += elapsed
+            self.stderr.write(
+                'Deleted [{baskets}] baskets through [{last_id}], and [{rows}] rows in total, in [{elapsed:.2f}] '
+                'seconds ([{rate:.0f}] rows per second).'.format(
+                    baskets=len(ids), last_id=last_id, rows=rows, elapsed=elapsed, rate=rows / max(elapsed, 0.001)
+                )
+            )
+
+            if len(ids) < batch_size:
+                break
+
+            if elapsed > batch_seconds:
+                batch_size = max(batch_size // 2, 1)
+            elif elapsed < batch_seconds / 2:
+                batch_size = min(batch_size * 2, options['max_batch_size'])
+
+            time.sleep(options['sleep_seconds'])
+
+        self.stderr.write(
+            'Deleted [{baskets}] baskets, and [{rows}] rows in total, at [{rate:.0f}] rows per second.'.format(
+                baskets=total_baskets, rows=total_rows, rate=total_rows / max(total_seconds, 0.001)
+            )
+        )
@@ -4,6 +4,7 @@ from oscar.apps.basket.abstract_models import AbstractBasket
 from oscar.core.loading import get_class
 
 from ecommerce.extensions.analytics.utils import track_segment_event, translate_basket_line_for_segment
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 Selector = get_class('partner.strategy', 'Selector')
@@ -47,6 +48,14 @@ class Basket(AbstractBasket):
 
         return basket
 
+    def all_lines(self):
+        """ Return a cached set of basket lines, with the attribute values of their products. """
+        if self.id is not None and self._lines is None:
+            self._lines = super(Basket, self).all_lines().prefetch_related(  # pylint: disable=bad-super-call
+                get_attribute_values_prefetch('product__')
+            )
+        return super(Basket, self).all_lines()  # pylint: disable=bad-super-call
+
     def flush(self):
         """Remove all products in basket and fire Segment 'Product Removed' Analytic event for each"""
         for line in self.all_lines():
@@ -12,6 +12,8 @@ from ecommerce.invoice.models import Invoice
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
+Line = get_model('basket', 'Line')
+Order = get_model('order', 'Order')
 
 
 class DeleteOrderedBasketsCommandTests(TestCase):
@@ -66,6 +68,29 @@ class DeleteOrderedBasketsCommandTests(TestCase):
         self.assertTrue(actual.startswith('Deleting [{}] baskets.'.format(len(self.orders))))
         self.assertTrue(actual.endswith('All baskets deleted.'))
 
+    def test_with_commit_in_batches(self):
+        """ Verify the command deletes baskets in batches, along with their lines, and keeps their orders. """
+        basket_ids = [order.basket.id for order in self.orders]
+        self.assertTrue(Line.objects.filter(basket_id__in=basket_ids).exists())
+
+        out = StringIO()
+        call_command(self.command, commit=True, batch_size=1, sleep_seconds=0, stderr=out)
+
+        self.assertFalse(Basket.objects.filter(id__in=basket_ids).exists())
+        self.assertFalse(Line.objects.filter(basket_id__in=basket_ids).exists())
+        self.assertEqual(Order.objects.filter(basket__isnull=True).count(), len(self.orders))
+        self.assertEqual(list(Basket.objects.all()), self.unordered_baskets + self.invoiced_baskets)
+        self.assertIn('Deleted [1] baskets through [{}]'.format(basket_ids[0]), out.getvalue())
+        self.assertIn('Deleted [{}] baskets, and'.format(len(self.orders)), out.getvalue())
+
+    def test_with_start_id(self):
+        """ Verify the command only deletes baskets with an ID greater than the start ID. """
+        first_basket = self.orders[0].basket
+        call_command(self.command, commit=True, start_id=first_basket.id, sleep_seconds=0, stderr=StringIO())
+
+        self.assertTrue(Basket.objects.filter(id=first_basket.id).exists())
+        self.assertFalse(Basket.objects.filter(id=self.orders[1].basket.id).exists())
+
     def test_commit_without_baskets(self):
         """ Verify the command does nothing if there are no baskets to delete. """
         # Delete all baskets
@@ -11,8 +11,10 @@ from django.conf import settings
 from django.contrib.messages import get_messages
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.http import HttpResponseRedirect
-from django.test import override_settings
+from django.test import modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
 from factory.fuzzy import FuzzyText
 from oscar.apps.basket.forms import BasketVoucherForm
 from oscar.core.loading import get_class, get_model
@@ -39,7 +41,7 @@ from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
 from ecommerce.extensions.payment.tests.processors import DummyProcessor
-from ecommerce.extensions.test.factories import create_order, prepare_voucher
+from ecommerce.extensions.test.factories import ProgramOfferFactory, create_order, prepare_voucher
 from ecommerce.tests.factories import ProductFactory, SiteFactory, StockRecordFactory
 from ecommerce.tests.mixins import ApiMockMixin, LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
@@ -695,6 +697,34 @@ class BasketSummaryViewTests(EnterpriseServiceMockMixin, DiscoveryTestMixin, Dis
         with self.assertRaises(SiteConfigurationError):
             self.client.get(self.get_full_url(self.path))
 
+    @mock.patch('ecommerce.programs.conditions.get_program', mock.Mock(return_value=None))
+    def test_site_context_queries(self):
+        """ Verify the site context attached to the request reduces the queries needed to render the summary. """
+        ProgramOfferFactory(site=self.site)
+        seat = self.create_seat(self.course)
+        self.create_basket_and_add_product(seat)
+        self.mock_access_token_response()
+        self.mock_course_run_detail_endpoint(
+            self.course, discovery_api_url=self.site_configuration.discovery_api_url
+        )
+
+        # Populate the caches used to render the page.
+        self.client.get(self.path)
+
+        with CaptureQueriesContext(connection) as queries_with_context:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        with modify_settings(MIDDLEWARE_CLASSES={'remove': 'ecommerce.core.middleware.SiteContextMiddleware'}):
+            # The middleware of the test client is loaded on its first request.
+            client = self.client_class(SERVER_NAME=self.site.domain)
+            client.login(username=self.user.username, password=self.password)
+            with CaptureQueriesContext(connection) as queries_without_context:
+                response = client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertLess(len(queries_with_context), len(queries_without_context))
+
     def test_login_required_basket_summary(self):
         """ The view should redirect to the login page if the user is not logged in. """
         self.client.logout()
@@ -19,6 +19,7 @@ from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.exceptions import SiteConfigurationError
+from ecommerce.core.site_context import get_site_context
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog
 from ecommerce.enterprise.entitlements import get_enterprise_code_redemption_redirect
@@ -269,7 +270,7 @@ class BasketSummaryView(BasketView):
                 }
 
             # TODO: handle these links for multi-line baskets.
-            if self.request.site.siteconfiguration.enable_enrollment_codes:
+            if get_site_context().siteconfiguration.enable_enrollment_codes:
                 # Get variables for the switch link that toggles from enrollment codes and seat.
                 switch_link_text, partner_sku = get_basket_switch_data(line.product)
 
@@ -307,8 +308,9 @@ class BasketSummaryView(BasketView):
             A dictionary containing information about the payment processor(s) with which the
             basket view context needs to be updated with.
         """
-        site_configuration = self.request.site.siteconfiguration
-        payment_processor_class = site_configuration.get_client_side_payment_processor_class()
+        site_context = get_site_context()
+        site_configuration = site_context.siteconfiguration
+        payment_processor_class = site_context.client_side_payment_processor_class
 
         if payment_processor_class:
             payment_processor = payment_processor_class(self.request.site)
@@ -361,7 +363,8 @@ class BasketSummaryView(BasketView):
         context = super(BasketSummaryView, self).get_context_data(**kwargs)
         formset = context.get('formset', [])
         lines = context.get('line_list', [])
-        site_configuration = self.request.site.siteconfiguration
+        site_context = get_site_context()
+        site_configuration = site_context.siteconfiguration
 
         failed_enterprise_consent_code = self.request.GET.get(CONSENT_FAILED_PARAM)
         if failed_enterprise_consent_code:
@@ -385,7 +388,7 @@ class BasketSummaryView(BasketView):
             'sdn_check': site_configuration.enable_sdn_check
         })
 
-        payment_processors = site_configuration.get_payment_processors()
+        payment_processors = site_context.payment_processors
         if site_configuration.client_side_payment_processor \
                 and waffle.flag_is_active(self.request, CLIENT_SIDE_CHECKOUT_FLAG_NAME):
             payment_processors_data = self._get_payment_processors_data(payment_processors)
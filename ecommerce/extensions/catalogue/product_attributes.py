@@ -0,0 +1,56 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from oscar.apps.catalogue.product_attributes import ProductAttributesContainer as BaseProductAttributesContainer
+from oscar.core.loading import get_model
+
+
+class ProductAttributesContainer(BaseProductAttributesContainer):
+    """
+    Attribute container that uses the attribute values prefetched with the product, if any.
+
+    Oscar's container always queries the attribute values of its product when one of them is first read. Products
+    loaded in bulk should instead use prefetch_product_attributes, or the Prefetch returned by
+    get_attribute_values_prefetch, so that the attributes of all of them are read with a single query.
+    """
+
+    def initiate_attributes(self):
+        values = self.get_values()
+        if 'attribute_values' not in getattr(self.product, '_prefetched_objects_cache', {}):
+            values = values.select_related('attribute')
+
+        for value in values:
+            setattr(self, value.attribute.code, value.value)
+        self.initialised = True
+
+
+def get_attribute_values_prefetch(prefix=''):
+    """
+    Returns a Prefetch loading the attribute values, and their attributes, of products.
+
+    Arguments:
+        prefix (str): Lookup of the products from the prefetched model, followed by a double underscore.
+            For example, 'product__' for basket or order lines.
+
+    Returns:
+        Prefetch
+    """
+    ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+    return Prefetch(
+        prefix + 'attribute_values',
+        queryset=ProductAttributeValue.objects.select_related('attribute').all()
+    )
+
+
+def prefetch_product_attributes(products):
+    """
+    Loads the attribute values of products with a single query, so that reading ``product.attr`` does not
+    query the database for each product.
+
+    Arguments:
+        products (iterable): Products, None values are ignored.
+
+    Returns:
+        list: The products.
+    """
+    products = [product for product in products if product is not None]
+    prefetch_related_objects(products, get_attribute_values_prefetch())
+    return products
@@ -0,0 +1,47 @@
+from oscar.core.loading import get_model
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.product_attributes import prefetch_product_attributes
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Product = get_model('catalogue', 'Product')
+
+
+class ProductAttributesTests(DiscoveryTestMixin, TestCase):
+    def setUp(self):
+        super(ProductAttributesTests, self).setUp()
+        self.seats = []
+        for __ in range(3):
+            course = CourseFactory()
+            self.seats.append(course.create_or_update_seat('verified', True, 50, self.partner))
+            self.seats.append(course.create_or_update_seat('credit', True, 100, self.partner, credit_provider='MIT'))
+
+    def test_prefetch_product_attributes(self):
+        """ Verify the attributes of all products are loaded with a single query. """
+        products = list(Product.objects.filter(id__in=[seat.id for seat in self.seats]).order_by('id'))
+
+        with self.assertNumQueries(1):
+            prefetch_product_attributes(products + [None])
+
+        course_ids = {seat.id: seat.course_id for seat in self.seats}
+        with self.assertNumQueries(0):
+            for product in products:
+                credit_provider = 'MIT' if product.attr.certificate_type == 'credit' else None
+                self.assertEqual(product.attr.course_key, course_ids[product.id])
+                self.assertTrue(product.attr.id_verification_required)
+                self.assertEqual(getattr(product.attr, 'credit_provider', None), credit_provider)
+                self.assertEqual(len(list(product.attr)), 4 if credit_provider else 3)
+
+    def test_attributes_without_prefetch(self):
+        """ Verify attributes of products loaded individually are still read from the database. """
+        product = Product.objects.get(id=self.seats[0].id)
+        with self.assertNumQueries(1):
+            self.assertEqual(product.attr.certificate_type, 'verified')
+
+    def test_seat_products(self):
+        """ Verify the attributes of the seats of a course are loaded with the seats. """
+        course = self.seats[0].course
+        with self.assertNumQueries(4):
+            seats = list(course.seat_products)
+            self.assertEqual(set(seat.attr.certificate_type for seat in seats), {'verified', 'credit'})
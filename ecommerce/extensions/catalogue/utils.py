@@ -40,7 +40,8 @@ def create_coupon_product(
         voucher_type,
         course_catalog,
         program_uuid,
-        site
+        site,
+        defer_vouchers=False
 ):
     """
     Creates a coupon product and a stock record for it.
@@ -67,6 +68,8 @@ def create_coupon_product(
         voucher_type (str): Voucher type
         program_uuid (str): Program UUID for the Coupon
         site (site): Site for which the Coupon is created.
+        defer_vouchers (bool): Do not create the vouchers of the coupon. They are created
+            later with create_coupon_vouchers, e.g. by a CouponJob. Defaults to False.
 
     Returns:
         A coupon Product object.
@@ -82,15 +85,14 @@ def create_coupon_product(
 
     # Vouchers are created during order and not fulfillment like usual
     # because we want vouchers to be part of the line in the order.
-
-    try:
-        vouchers = create_vouchers(
+    if not defer_vouchers:
+        create_coupon_vouchers(
+            coupon_product,
             benefit_type=benefit_type,
             benefit_value=benefit_value,
             catalog=catalog,
             catalog_query=catalog_query,
-            code=code or None,
-            coupon=coupon_product,
+            code=code,
             course_catalog=course_catalog,
             course_seat_types=course_seat_types,
             email_domains=email_domains,
@@ -98,18 +100,14 @@ def create_coupon_product(
             enterprise_customer=enterprise_customer,
             max_uses=max_uses,
             name=title,
-            quantity=int(quantity),
+            quantity=quantity,
             start_datetime=start_datetime,
             voucher_type=voucher_type,
             program_uuid=program_uuid,
             site=site
         )
-    except IntegrityError:
-        logger.exception('Failed to create vouchers for [%s] coupon.', coupon_product.title)
-        raise
 
     coupon_vouchers, __ = CouponVouchers.objects.get_or_create(coupon=coupon_product)
-    coupon_vouchers.vouchers.add(*vouchers)
     coupon_product.attr.coupon_vouchers = coupon_vouchers
     coupon_product.attr.note = note
     coupon_product.save()
@@ -128,6 +126,34 @@ def create_coupon_product(
     return coupon_product
 
 
+def create_coupon_vouchers(coupon_product, code=None, quantity=1, **kwargs):
+    """
+    Creates the vouchers of a coupon product.
+
+    Arguments:
+        coupon_product (Product): Coupon product for which the vouchers are created.
+        code (str): Voucher code.
+        quantity (int): Number of vouchers to be created and associated with the coupon.
+        **kwargs: Other arguments of create_vouchers, e.g. benefit_type and voucher_type.
+
+    Returns:
+        List[Voucher]
+
+    Raises:
+        IntegrityError: An error occurred when create_vouchers method returns
+                        an IntegrityError exception
+    """
+    try:
+        vouchers = create_vouchers(coupon=coupon_product, code=code or None, quantity=int(quantity), **kwargs)
+    except IntegrityError:
+        logger.exception('Failed to create vouchers for [%s] coupon.', coupon_product.title)
+        raise
+
+    coupon_vouchers, __ = CouponVouchers.objects.get_or_create(coupon=coupon_product)
+    coupon_vouchers.vouchers.add(*vouchers)
+    return vouchers
+
+
 def generate_sku(product, partner):
     """
     Generates a SKU for the given partner and and product combination.
@@ -6,7 +6,9 @@ from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.url_utils import get_lms_dashboard_url
 from ecommerce.courses.utils import mode_for_product
+from ecommerce.extensions.analytics.event_queue import event_queue
 from ecommerce.extensions.analytics.utils import silence_exceptions, track_segment_event
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 from ecommerce.extensions.checkout.utils import get_credit_provider_details, get_receipt_page_url
 from ecommerce.notifications.notifications import send_notification
 from ecommerce.programs.utils import get_program
@@ -21,23 +23,19 @@ post_checkout = get_class('checkout.signals', 'post_checkout')
 ORDER_LINE_COUNT = 1
 
 
-@receiver(post_checkout, dispatch_uid='tracking.post_checkout_callback')
-@silence_exceptions('Failed to emit tracking event upon order completion.')
-def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unused-argument
-    """Emit a tracking event when an order is placed."""
-    if order.total_excl_tax <= 0:
-        return
-
-    for line in order.lines.all():
+def _track_completed_order(order):
+    """ Build the properties of the completed order event, and send it. """
+    lines = list(
+        order.lines.select_related(
+            'product__course', 'product__product_class', 'product__parent__product_class'
+        ).prefetch_related(get_attribute_values_prefetch('product__'))
+    )
+    for line in lines:
         if line.product.is_coupon_product or line.product.is_enrollment_code_product:
             return
 
     voucher = order.basket_discounts.filter(voucher_id__isnull=False).first()
     coupon = voucher.voucher_code if voucher else None
-    try:
-        bundle_id = BasketAttribute.objects.get(basket=order.basket, attribute_type__name=BUNDLE).value_text
-    except BasketAttribute.DoesNotExist:
-        bundle_id = None
 
     properties = {
         'orderId': order.number,
@@ -57,21 +55,21 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
                 'price': str(line.line_price_excl_tax),
                 'quantity': line.quantity,
                 'category': line.product.get_product_class().name,
-            } for line in order.lines.all()
+            } for line in lines
         ],
     }
 
     try:
-        bundle_id = BasketAttribute.objects.get(basket=order.basket, attribute_type__name=BUNDLE).value_text
-        program = get_program(bundle_id, order.basket.site.siteconfiguration)
-        if len(order.lines.all()) < len(program.get('courses')):
+        bundle_id = BasketAttribute.objects.get(basket_id=order.basket_id, attribute_type__name=BUNDLE).value_text
+        program = get_program(bundle_id, order.site.siteconfiguration)
+        if len(lines) < len(program.get('courses')):
             variant = 'partial'
         else:
             variant = 'full'
         bundle_product = {
             'id': bundle_id,
             'price': '0',
-            'quantity': str(len(order.lines.all())),
+            'quantity': str(len(lines)),
             'category': 'bundle',
             'variant': variant,
             'name': program.get('title')
@@ -83,6 +81,21 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
     track_segment_event(order.site, order.user, 'Order Completed', properties)
 
 
+@receiver(post_checkout, dispatch_uid='tracking.post_checkout_callback')
+@silence_exceptions('Failed to emit tracking event upon order completion.')
+def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Emit a tracking event when an order is placed.
+
+    The event is built and sent by the analytics event queue, after the order is committed, so that neither
+    the queries needed to build it nor the call to Segment delay the response to the user.
+    """
+    if order.total_excl_tax <= 0:
+        return
+
+    event_queue.put(_track_completed_order, order)
+
+
 @receiver(post_checkout, dispatch_uid='send_completed_order_email')
 @silence_exceptions("Failed to send order completion email.")
 def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable=unused-argument
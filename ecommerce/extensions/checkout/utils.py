@@ -9,6 +9,8 @@ from edx_rest_api_client.client import EdxRestApiClient
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.api_clients import get_api_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +27,8 @@ def get_credit_provider_details(access_token, credit_provider_id, site_configura
     try:
         return EdxRestApiClient(
             site_configuration.build_lms_url('api/credit/v1/'),
-            oauth_access_token=access_token
+            oauth_access_token=access_token,
+            session=get_api_session()
         ).providers(credit_provider_id).get()
     except (ConnectionError, SlumberHttpBaseException, Timeout):
         logger.exception('Failed to retrieve credit provider details for provider [%s].', credit_provider_id)
@@ -14,6 +14,7 @@ from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.url_utils import get_lms_courseware_url, get_lms_dashboard_url, get_lms_program_dashboard_url
 from ecommerce.enterprise.utils import has_enterprise_offer
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
@@ -230,7 +231,8 @@ class ReceiptResponseView(ThankYouView):
 
         # NOTE: Only display verification and credit completion details to the user who actually placed the order.
         if request.user == order.user:
-            for line in order.lines.all():
+            for line in order.lines.select_related('product').prefetch_related(
+                    get_attribute_values_prefetch('product__')):
                 product = line.product
 
                 if not verified_course_id and getattr(product.attr, 'id_verification_required', False):
@@ -11,6 +11,7 @@ from importlib import import_module
 from django.conf import settings
 from django.utils.timezone import now
 
+from ecommerce.extensions.catalogue.product_attributes import get_attribute_values_prefetch
 from ecommerce.extensions.fulfillment import exceptions
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -43,7 +44,7 @@ def fulfill_order(order, lines):
         raise exceptions.IncorrectOrderStatusError(error_msg)
 
     # Construct a dict of lines by their product type.
-    line_items = list(lines.all())
+    line_items = list(lines.select_related('product').prefetch_related(get_attribute_values_prefetch('product__')))
 
     try:
         # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
@@ -7,11 +7,15 @@ import abc
 import datetime
 import json
 import logging
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
 
 import requests
+import six
 from django.conf import settings
 from django.core.urlresolvers import reverse
-from edx_rest_api_client.client import EdxRestApiClient
+from django.db import transaction
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, Timeout  # pylint: disable=ungrouped-imports
 from rest_framework import status
@@ -20,7 +24,8 @@ from ecommerce.core.constants import (
     DONATIONS_FROM_CHECKOUT_TESTS_PRODUCT_TYPE_NAME,
     ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 )
-from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
+from ecommerce.core.site_context import get_site_context
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.enterprise.utils import get_or_create_enterprise_customer_user
@@ -164,8 +169,8 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     Allows the enrollment of a student via purchase of a 'seat'.
     """
 
-    def _post_to_enrollment_api(self, data, user):
-        enrollment_api_url = get_lms_enrollment_api_url()
+    def _post_to_enrollment_api(self, data, user, enrollment_api_url=None):
+        enrollment_api_url = enrollment_api_url or get_lms_enrollment_api_url()
         timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
         headers = {
             'Content-Type': 'application/json',
@@ -182,6 +187,61 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
 
         return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
 
+    def _post_enrollments(self, enrollments_data, user):
+        """ Post the data of each enrollment to the Enrollment API.
+
+        The requests are sent concurrently by up to ENROLLMENT_FULFILLMENT_MAX_WORKERS threads. The threads only
+        send the requests, the responses are handled by the caller. Once a request raises an error other than a
+        network error or a time out, the requests which have not been sent yet are skipped.
+
+        Arguments:
+            enrollments_data (list of dict): The POST data of each enrollment.
+            user (User): The user being enrolled.
+
+        Returns:
+            list of tuples: (response, exc_info) for each enrollment, in the same order as the data. Both are
+                None for skipped enrollments.
+        """
+        # The URL depends on the current request, which is not available to other threads.
+        enrollment_api_url = get_lms_enrollment_api_url()
+        failed = threading.Event()
+
+        def post(data):
+            if failed.is_set():
+                return None, None
+
+            try:
+                return self._post_to_enrollment_api(data, user, enrollment_api_url=enrollment_api_url), None
+            except Exception as exc:  # pylint: disable=broad-except
+                if not isinstance(exc, (ConnectionError, Timeout)):
+                    failed.set()
+                # Keep the traceback of the worker thread, so that the caller can re-raise the error with it.
+                return None, sys.exc_info()
+
+        max_workers = min(settings.ENROLLMENT_FULFILLMENT_MAX_WORKERS, len(enrollments_data))
+        if max_workers <= 1:
+            return [post(data) for data in enrollments_data]
+
+        pool = ThreadPool(max_workers)
+        try:
+            return pool.map(post, enrollments_data, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _set_line_request_error_status(self, line, order, exc):
+        """ Set the status of a line whose enrollment request failed to reach the Enrollment API. """
+        if isinstance(exc, ConnectionError):
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+        else:
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+
     def _add_enterprise_data_to_enrollment_api_post(self, data, order):
         """ Augment enrollment api POST data with enterprise specific data.
 
@@ -263,6 +323,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
 
             return order, lines
 
+        enrollments = []
         for line in lines:
             try:
                 mode = mode_for_product(line.product)
@@ -302,46 +363,50 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
                 )
             try:
                 self._add_enterprise_data_to_enrollment_api_post(data, order)
+            except (ConnectionError, Timeout) as exc:
+                self._set_line_request_error_status(line, order, exc)
+                continue
 
-                # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
-                # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
-                response = self._post_to_enrollment_api(data, user=order.user)
-
-                if response.status_code == status.HTTP_200_OK:
-                    line.set_status(LINE.COMPLETE)
-
-                    audit_log(
-                        'line_fulfilled',
-                        order_line_id=line.id,
-                        order_number=order.number,
-                        product_class=line.product.get_product_class().name,
-                        course_id=course_key,
-                        mode=mode,
-                        user_id=order.user.id,
-                        credit_provider=provider,
-                    )
-                else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:  # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
-                    logger.error(
-                        "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
-                        line.id, order.number, response.status_code, reason
-                    )
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
-            except ConnectionError:
-                logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            enrollments.append((line, data, course_key, mode, provider))
+
+        # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
+        # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
+        results = self._post_enrollments([enrollment[1] for enrollment in enrollments], order.user)
+
+        for (line, data, course_key, mode, provider), (response, exc_info) in zip(enrollments, results):
+            if exc_info is not None:
+                exc = exc_info[1]
+                if not isinstance(exc, (ConnectionError, Timeout)):
+                    six.reraise(*exc_info)
+                self._set_line_request_error_status(line, order, exc)
+            elif response is None:
+                # The request was skipped after another one failed. That error is raised when its line is reached.
+                continue
+            elif response.status_code == status.HTTP_200_OK:
+                line.set_status(LINE.COMPLETE)
+
+                audit_log(
+                    'line_fulfilled',
+                    order_line_id=line.id,
+                    order_number=order.number,
+                    product_class=line.product.get_product_class().name,
+                    course_id=course_key,
+                    mode=mode,
+                    user_id=order.user.id,
+                    credit_provider=provider,
                 )
-                line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
-            except Timeout:
+            else:
+                try:
+                    data = response.json()
+                    reason = data.get('message')
+                except Exception:  # pylint: disable=broad-except
+                    reason = '(No detail provided.)'
+
                 logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+                    "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
+                    line.id, order.number, response.status_code, reason
                 )
-                line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+                line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
 
@@ -503,23 +568,23 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
             if created:
                 _range.add_product(seat)
 
-            vouchers = create_vouchers(
-                name='Enrollment code voucher [{}]'.format(line.product.title),
-                benefit_type=Benefit.PERCENTAGE,
-                benefit_value=100,
-                catalog=None,
-                coupon=seat,
-                end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
-                enterprise_customer=None,
-                quantity=line.quantity,
-                start_datetime=datetime.datetime.now(),
-                voucher_type=Voucher.SINGLE_USE,
-                _range=_range
-            )
+            with transaction.atomic():
+                vouchers = create_vouchers(
+                    name='Enrollment code voucher [{}]'.format(line.product.title),
+                    benefit_type=Benefit.PERCENTAGE,
+                    benefit_value=100,
+                    catalog=None,
+                    coupon=seat,
+                    end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
+                    enterprise_customer=None,
+                    quantity=line.quantity,
+                    start_datetime=datetime.datetime.now(),
+                    voucher_type=Voucher.SINGLE_USE,
+                    _range=_range
+                )
 
-            line_vouchers = OrderLineVouchers.objects.create(line=line)
-            for voucher in vouchers:
-                line_vouchers.vouchers.add(voucher)
+                line_vouchers = OrderLineVouchers.objects.create(line=line)
+                line_vouchers.vouchers.add(*vouchers)
 
             line.set_status(LINE.COMPLETE)
 
@@ -543,26 +608,28 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         # Note (multi-courses): Change from a course_name to a list of course names.
         product = order.lines.first().product
         course = Course.objects.get(id=product.attr.course_key)
+        site_context = get_site_context(site_id=order.site_id)
+        site_configuration = site_context.siteconfiguration
         receipt_page_url = get_receipt_page_url(
             order_number=order.number,
-            site_configuration=order.site.siteconfiguration
+            site_configuration=site_configuration
         )
         send_notification(
             order.user,
             'ORDER_WITH_CSV',
             context={
-                'contact_url': order.site.siteconfiguration.build_lms_url('/contact'),
+                'contact_url': site_configuration.build_lms_url('/contact'),
                 'course_name': course.name,
-                'download_csv_link': order.site.siteconfiguration.build_ecommerce_url(
+                'download_csv_link': site_configuration.build_ecommerce_url(
                     reverse('coupons:enrollment_code_csv', args=[order.number])
                 ),
                 'enrollment_code_title': product.title,
-                'lms_url': order.site.siteconfiguration.build_lms_url(),
+                'lms_url': site_configuration.build_lms_url(),
                 'order_number': order.number,
-                'partner_name': order.site.siteconfiguration.partner.name,
+                'partner_name': site_context.partner.name,
                 'receipt_page_url': receipt_page_url,
             },
-            site=order.site
+            site=site_context.site
         )
 
 
@@ -599,6 +666,7 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             The original set of lines, with new statuses set based on the success or failure of fulfillment.
         """
         logger.info('Attempting to fulfill "Course Entitlement" product types for order [%s]', order.number)
+        site_configuration = get_site_context(site_id=order.site_id).siteconfiguration
 
         for line in lines:
             try:
@@ -619,10 +687,7 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             try:
                 entitlement_option = Option.objects.get(code='course_entitlement')
 
-                entitlement_api_client = EdxRestApiClient(
-                    get_lms_entitlement_api_url(),
-                    jwt=order.site.siteconfiguration.access_token
-                )
+                entitlement_api_client = site_configuration.entitlement_api_client
 
                 # POST to the Entitlement API.
                 response = entitlement_api_client.entitlements.post(data)
@@ -660,10 +725,8 @@ class CourseEntitlementFulfillmentModule(BaseFulfillmentModule):
             entitlement_option = Option.objects.get(code='course_entitlement')
             course_entitlement_uuid = line.attributes.get(option=entitlement_option).value
 
-            entitlement_api_client = EdxRestApiClient(
-                get_lms_entitlement_api_url(),
-                jwt=line.order.site.siteconfiguration.access_token
-            )
+            site_configuration = get_site_context(site_id=line.order.site_id).siteconfiguration
+            entitlement_api_client = site_configuration.entitlement_api_client
 
             # DELETE to the Entitlement API.
             entitlement_api_client.entitlements(course_entitlement_uuid).delete()
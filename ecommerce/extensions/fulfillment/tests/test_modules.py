@@ -1,7 +1,10 @@
 """Tests of the Fulfillment API's fulfillment modules."""
 import datetime
 import json
+import sys
+import traceback
 import uuid
+from multiprocessing.pool import ThreadPool
 
 import ddt
 import httpretty
@@ -442,6 +445,105 @@ class EnrollmentFulfillmentModuleTests(ProgramTestMixin, DiscoveryTestMixin, Ful
         # No exceptions should be raised and the order should be fulfilled
         self.assertEqual(lines[0].status, 'Complete')
 
+    def create_order_with_seats(self, count):
+        """ Create an order containing a seat in each of the given number of courses. """
+        basket = BasketFactory(owner=self.user, site=self.site)
+        for i in range(count):
+            course = CourseFactory(id='edX/DemoX/Course_{}'.format(i), site=self.site)
+            basket.add_product(course.create_or_update_seat(self.certificate_type, False, 100, self.partner), 1)
+        return create_order(number=3, basket=basket, user=self.user)
+
+    @httpretty.activate
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=3)
+    def test_enrollment_module_fulfill_concurrently(self):
+        """ Verify the lines of an order are fulfilled concurrently and audited in order. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type=JSON)
+        order = self.create_order_with_seats(5)
+        lines = list(order.lines.order_by('id'))
+
+        with mock.patch('ecommerce.extensions.fulfillment.modules.ThreadPool', wraps=ThreadPool) as mock_pool:
+            with LogCapture(LOGGER_NAME) as l:
+                EnrollmentFulfillmentModule().fulfill_product(order, lines)
+
+        mock_pool.assert_called_once_with(3)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 5)
+        requested_course_ids = [
+            json.loads(request.body)['course_details']['course_id'] for request in httpretty.httpretty.latest_requests
+        ]
+        self.assertEqual(sorted(requested_course_ids), sorted(line.product.attr.course_key for line in lines))
+        self.assertEqual([line.status for line in order.lines.order_by('id')], [LINE.COMPLETE] * 5)
+        self.assertEqual(
+            [record.getMessage().split(', ')[0] for record in l.records if 'line_fulfilled' in record.getMessage()],
+            ['line_fulfilled: course_id="{}"'.format(line.product.attr.course_key) for line in lines]
+        )
+
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=3)
+    def test_enrollment_module_fulfill_concurrently_with_errors(self):
+        """ Verify each line gets the status matching the outcome of its own enrollment request. """
+        order = self.create_order_with_seats(4)
+        lines = list(order.lines.order_by('id'))
+        outcomes = {
+            lines[0].product.attr.course_key: mock.Mock(status_code=200),
+            lines[1].product.attr.course_key: ConnectionError(),
+            lines[2].product.attr.course_key: Timeout(),
+            lines[3].product.attr.course_key: mock.Mock(status_code=500, json=mock.Mock(return_value={})),
+        }
+
+        def post(data, user, enrollment_api_url=None):  # pylint: disable=unused-argument
+            outcome = outcomes[data['course_details']['course_id']]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with mock.patch.object(EnrollmentFulfillmentModule, '_post_to_enrollment_api', side_effect=post):
+            EnrollmentFulfillmentModule().fulfill_product(order, lines)
+
+        self.assertEqual(
+            [line.status for line in order.lines.order_by('id')],
+            [
+                LINE.COMPLETE,
+                LINE.FULFILLMENT_NETWORK_ERROR,
+                LINE.FULFILLMENT_TIMEOUT_ERROR,
+                LINE.FULFILLMENT_SERVER_ERROR,
+            ]
+        )
+
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=3)
+    def test_enrollment_module_fulfill_concurrently_unexpected_error(self):
+        """ Verify unexpected errors are re-raised with the traceback of the thread which sent the request. """
+        order = self.create_order_with_seats(3)
+        lines = list(order.lines.order_by('id'))
+        failing_course_id = lines[1].product.attr.course_key
+
+        def post_enrollment(data, user, enrollment_api_url=None):  # pylint: disable=unused-argument
+            if data['course_details']['course_id'] == failing_course_id:
+                raise ValueError
+            return mock.Mock(status_code=200)
+
+        with mock.patch.object(EnrollmentFulfillmentModule, '_post_to_enrollment_api', side_effect=post_enrollment):
+            try:
+                EnrollmentFulfillmentModule().fulfill_product(order, lines)
+                self.fail('ValueError not raised.')
+            except ValueError:
+                frames = traceback.extract_tb(sys.exc_info()[2])
+
+        self.assertEqual(frames[-1][2], 'post_enrollment')
+
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=1)
+    def test_enrollment_module_fulfill_stops_after_unexpected_error(self):
+        """ Verify no further enrollment requests are sent after an unexpected error. """
+        order = self.create_order_with_seats(3)
+        lines = list(order.lines.order_by('id'))
+
+        with mock.patch.object(
+            EnrollmentFulfillmentModule, '_post_to_enrollment_api',
+            side_effect=[mock.Mock(status_code=200), ValueError, mock.Mock(status_code=200)]
+        ) as mock_post:
+            with self.assertRaises(ValueError):
+                EnrollmentFulfillmentModule().fulfill_product(order, lines)
+
+        self.assertEqual(mock_post.call_count, 2)
+
 
 class CouponFulfillmentModuleTest(CouponMixin, FulfillmentTestMixin, TestCase):
     """ Test coupon fulfillment. """
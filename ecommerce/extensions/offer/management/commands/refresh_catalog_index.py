@@ -0,0 +1,30 @@
+""" Refreshes the local index of the course runs in the catalog queries and course catalogs of Ranges. """
+
+from __future__ import unicode_literals
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.offer.utils import refresh_catalog_index
+
+
+class Command(BaseCommand):
+    help = 'Refresh the local index of the course runs in the catalog queries and course catalogs of ranges.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--site-id',
+                            action='store',
+                            dest='site_id',
+                            type=int,
+                            help='ID of the Site to refresh the index for. Defaults to all sites.')
+
+    def handle(self, *args, **options):
+        sites = Site.objects.filter(siteconfiguration__isnull=False)
+        if options['site_id']:
+            sites = sites.filter(id=options['site_id'])
+            if not sites.exists():
+                raise CommandError('A valid Site ID must be specified!')
+
+        for site in sites:
+            count = refresh_catalog_index(site)
+            self.stderr.write('Refreshed [{}] catalog indexes for site [{}].'.format(count, site))
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import jsonfield.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partner', '0012_auto_20180119_0903'),
+        ('offer', '0015_auto_20170926_1357'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogCourseRunIndex',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('catalog_query', models.TextField()),
+                ('query_hash', models.CharField(db_index=True, max_length=32)),
+                ('course_run_keys', jsonfield.fields.JSONField(default=[])),
+                ('modified', models.DateTimeField(auto_now=True)),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='partner.Partner')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='catalogcourserunindex',
+            unique_together=set([('partner', 'query_hash')]),
+        ),
+    ]
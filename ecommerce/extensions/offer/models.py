@@ -1,11 +1,17 @@
 from __future__ import unicode_literals
 
+import datetime
+import hashlib
 import re
+import time
 
 from django.conf import settings
 from django.core.cache import cache
 from django.db import models
+from django.utils.functional import cached_property
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
+from jsonfield import JSONField
 from oscar.apps.offer.abstract_models import (
     AbstractBenefit,
     AbstractCondition,
@@ -16,11 +22,15 @@ from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.site_context import get_site_context
 from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
 
 OFFER_PRIORITY_ENTERPRISE = 10
 OFFER_PRIORITY_VOUCHER = 20
 
+# In-process cache of CatalogCourseRunIndex lookups: key -> (expiration timestamp, index or None)
+_catalog_index_cache = {}
+
 
 class Benefit(AbstractBenefit):
     def save(self, *args, **kwargs):
@@ -230,7 +240,8 @@ class Range(AbstractRange):
         Retrieve the results from running the query contained in catalog_query field.
         """
         request = get_current_request()
-        partner_code = request.site.siteconfiguration.partner.short_code
+        site_context = get_site_context()
+        partner_code = site_context.partner.short_code
         cache_key = get_cache_key(
             site_domain=request.site.domain,
             partner_code=partner_code,
@@ -241,7 +252,7 @@ class Range(AbstractRange):
         response = cache.get(cache_key)
         if not response:  # pragma: no cover
             try:
-                response = request.site.siteconfiguration.discovery_api_client.course_runs.contains.get(
+                response = site_context.siteconfiguration.discovery_api_client.course_runs.contains.get(
                     query=self.catalog_query,
                     course_run_ids=product.course_id,
                     partner=partner_code
@@ -258,7 +269,8 @@ class Range(AbstractRange):
         catalog service for the catalog id contained in field "course_catalog".
         """
         request = get_current_request()
-        partner_code = request.site.siteconfiguration.partner.short_code
+        site_context = get_site_context()
+        partner_code = site_context.partner.short_code
         cache_key = get_cache_key(
             site_domain=request.site.domain,
             partner_code=partner_code,
@@ -268,7 +280,7 @@ class Range(AbstractRange):
         )
         response = cache.get(cache_key)
         if not response:
-            discovery_api_client = request.site.siteconfiguration.discovery_api_client
+            discovery_api_client = site_context.siteconfiguration.discovery_api_client
             try:
                 # GET: /api/v1/catalogs/{catalog_id}/contains?course_run_id={course_run_ids}
                 response = discovery_api_client.catalogs(self.course_catalog).contains.get(
@@ -280,6 +292,115 @@ class Range(AbstractRange):
 
         return response
 
+    def get_catalog_index(self, partner):
+        """
+        Return the local CatalogCourseRunIndex of the catalog query of the range.
+
+        Course catalog ranges are not indexed. The Discovery Service evaluates the query of a catalog against courses
+        when checking whether the catalog contains a course run, which the course runs search of the index cannot
+        reproduce, so their membership is always checked with the catalogs contains endpoint.
+
+        Returns:
+            CatalogCourseRunIndex or None if the range has not been indexed for the partner.
+        """
+        if self.course_catalog:
+            return None
+        return CatalogCourseRunIndex.get_index(partner, self.catalog_query)
+
+    def catalog_index_contains_product(self, product):
+        """
+        Assert if the local catalog index contains the course run of the product.
+
+        Returns:
+            bool or None if the range has not been indexed.
+        """
+        index = self.get_catalog_index(get_site_context().partner)
+        if index is None:
+            return None
+        return product.course_id in index.course_run_ids
+
+    def _get_catalog_contains_cache_key(self, site, partner_code, course_id):
+        """
+        Return the cache key under which the Discovery Service contains response for the course run is stored.
+        """
+        if self.course_catalog:
+            return get_cache_key(
+                site_domain=site.domain,
+                partner_code=partner_code,
+                resource='catalogs.contains',
+                course_id=course_id,
+                catalog_id=self.course_catalog
+            )
+        return get_cache_key(
+            site_domain=site.domain,
+            partner_code=partner_code,
+            resource='course_runs.contains',
+            course_id=course_id,
+            query=self.catalog_query
+        )
+
+    def prefetch_catalog_contains_products(self, products):
+        """
+        Retrieve and cache, per product, whether the catalog query or course catalog of
+        the range contains the products.
+
+        All course run IDs that are not cached yet are sent to the Discovery Service in a
+        single request. The response is split into the same per product cache entries that
+        run_catalog_query and catalog_contains_product read. Ranges without a catalog query
+        or course catalog are left untouched.
+
+        Raises:
+            ConnectionError, SlumberBaseException, Timeout: If the Discovery Service cannot be reached.
+        """
+        if not ((self.catalog_query or self.course_catalog) and self.course_seat_types):
+            return
+
+        request = get_current_request()
+        site_context = get_site_context()
+        if self.get_catalog_index(site_context.partner):
+            # Membership is answered by the local index, no need to contact the Discovery Service.
+            return
+
+        partner_code = site_context.partner.short_code
+        cache_keys = {}
+        for product in products:
+            certificate_type = getattr(product.attr, 'certificate_type', None)
+            # pylint: disable=unsupported-membership-test
+            if product.course_id and certificate_type and certificate_type.lower() in self.course_seat_types:
+                cache_keys[product.course_id] = self._get_catalog_contains_cache_key(
+                    request.site, partner_code, product.course_id
+                )
+
+        cached_responses = cache.get_many(cache_keys.values())
+        course_run_ids = sorted(
+            course_id for course_id, cache_key in cache_keys.items() if cache_key not in cached_responses
+        )
+        if not course_run_ids:
+            return
+
+        discovery_api_client = site_context.siteconfiguration.discovery_api_client
+        if self.course_catalog:
+            resource = 'courses'
+            # GET: /api/v1/catalogs/{catalog_id}/contains?course_run_id={course_run_ids}
+            response = discovery_api_client.catalogs(self.course_catalog).contains.get(
+                course_run_id=','.join(course_run_ids)
+            )
+        else:
+            resource = 'course_runs'
+            response = discovery_api_client.course_runs.contains.get(
+                query=self.catalog_query,
+                course_run_ids=','.join(course_run_ids),
+                partner=partner_code
+            )
+
+        cache.set_many(
+            {
+                cache_keys[course_id]: {resource: {course_id: response[resource].get(course_id, False)}}
+                for course_id in course_run_ids
+            },
+            settings.COURSES_API_CACHE_TIMEOUT
+        )
+
     def contains_product(self, product):
         """
         Assert if the range contains the product.
@@ -288,18 +409,22 @@ class Range(AbstractRange):
         if self.course_catalog and self.course_seat_types:
             # Product certificate type should belongs to range seat types.
             if product.attr.certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
-                response = self.catalog_contains_product(product)
+                is_contained = self.catalog_index_contains_product(product)
+                if is_contained is None:
+                    response = self.catalog_contains_product(product)
+                    is_contained = response['courses'][product.course_id]
                 # Range can have a catalog query and 'regular' products in it,
                 # therefor an OR is used to check for both possibilities.
-                return ((response['courses'][product.course_id]) or
-                        super(Range, self).contains_product(product))  # pylint: disable=bad-super-call
+                return is_contained or super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
         elif self.catalog_query and self.course_seat_types:
             if product.attr.certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
-                response = self.run_catalog_query(product)
+                is_contained = self.catalog_index_contains_product(product)
+                if is_contained is None:
+                    response = self.run_catalog_query(product)
+                    is_contained = response['course_runs'][product.course_id]
                 # Range can have a catalog query and 'regular' products in it,
                 # therefor an OR is used to check for both possibilities.
-                return ((response['course_runs'][product.course_id]) or
-                        super(Range, self).contains_product(product))  # pylint: disable=bad-super-call
+                return is_contained or super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
         elif self.catalog:
             return (
                 product.id in self.catalog.stock_records.values_list('product', flat=True) or
@@ -309,6 +434,22 @@ class Range(AbstractRange):
 
     contains = contains_product
 
+    def contains_products(self, products):
+        """
+        Assert, for each of the given products, if the range contains it.
+
+        For catalog query and course catalog ranges the Discovery Service is called once
+        for all products instead of once per product.
+
+        Arguments:
+            products (list): Products to look up.
+
+        Returns:
+            dict: Product ID to boolean mapping.
+        """
+        self.prefetch_catalog_contains_products(products)
+        return {product.id: self.contains_product(product) for product in products}
+
     def num_products(self):
         return len(self.all_products())
 
@@ -343,4 +484,60 @@ class Condition(AbstractCondition):
     program_uuid = models.UUIDField(null=True, blank=True, verbose_name=_('Program UUID'))
 
 
+class CatalogCourseRunIndex(models.Model):
+    """
+    Course runs matching a Discovery Service catalog query, materialized locally so that the
+    membership of catalog query Ranges can be checked without contacting the Discovery Service.
+
+    The index is refreshed by the refresh_catalog_index management command and periodic task.
+    """
+    partner = models.ForeignKey('partner.Partner', related_name='+', on_delete=models.CASCADE)
+    catalog_query = models.TextField()
+    query_hash = models.CharField(max_length=32, db_index=True)
+    # Sorted keys of the course runs in the catalog.
+    course_run_keys = JSONField(default=[])
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta(object):
+        unique_together = ('partner', 'query_hash')
+
+    @staticmethod
+    def hash_query(catalog_query):
+        return hashlib.md5(catalog_query.encode('utf-8')).hexdigest()
+
+    @cached_property
+    def course_run_ids(self):
+        return frozenset(self.course_run_keys)
+
+    @classmethod
+    def get_index(cls, partner, catalog_query):
+        """
+        Return the index of the catalog query.
+
+        Lookups, including misses, are cached in-process for CATALOG_INDEX_CACHE_TIMEOUT seconds.
+        Indexes which have not been refreshed in CATALOG_INDEX_MAX_AGE seconds are ignored.
+
+        Returns:
+            CatalogCourseRunIndex or None
+        """
+        if not catalog_query:
+            return None
+
+        query_hash = cls.hash_query(catalog_query)
+        cache_key = (partner.id, query_hash)
+
+        cached = _catalog_index_cache.get(cache_key)
+        if cached and cached[0] > time.time():
+            return cached[1]
+
+        min_modified = now() - datetime.timedelta(seconds=settings.CATALOG_INDEX_MAX_AGE)
+        index = cls.objects.filter(partner=partner, query_hash=query_hash, modified__gte=min_modified).first()
+        _catalog_index_cache[cache_key] = (time.time() + settings.CATALOG_INDEX_CACHE_TIMEOUT, index)
+        return index
+
+    @classmethod
+    def clear_cache(cls):
+        _catalog_index_cache.clear()
+
+
 from oscar.apps.offer.models import *  # noqa isort:skip pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position,wrong-import-order,ungrouped-imports
@@ -0,0 +1,11 @@
+from celery import shared_task
+from django.contrib.sites.models import Site
+
+from ecommerce.extensions.offer.utils import refresh_catalog_index
+
+
+@shared_task
+def refresh_catalog_indexes():
+    """ Refresh the local catalog index of every site. """
+    for site in Site.objects.filter(siteconfiguration__isnull=False):
+        refresh_catalog_index(site)
@@ -0,0 +1,51 @@
+from __future__ import unicode_literals
+
+from StringIO import StringIO
+
+import httpretty
+from django.core.management import CommandError, call_command
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.coupons.tests.mixins import DiscoveryMockMixin
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.tests.testcases import TestCase
+
+CatalogCourseRunIndex = get_model('offer', 'CatalogCourseRunIndex')
+
+
+@httpretty.activate
+class RefreshCatalogIndexCommandTests(DiscoveryMockMixin, TestCase):
+    command = 'refresh_catalog_index'
+
+    def setUp(self):
+        super(RefreshCatalogIndexCommandTests, self).setUp()
+        self.course = CourseFactory()
+        factories.RangeFactory(catalog_query='key:*', course_seat_types='verified')
+        # Course catalog ranges are checked with the catalogs contains endpoint instead.
+        factories.RangeFactory(course_catalog=1, course_seat_types='verified')
+        self.mock_access_token_response()
+        self.mock_course_runs_endpoint(
+            self.site_configuration.discovery_api_url, query='key:*', course_run=self.course
+        )
+
+    def test_refresh_catalog_index(self):
+        """ Verify the command indexes the course runs of the catalog queries of ranges. """
+        out = StringIO()
+        call_command(self.command, site_id=self.site.id, stderr=out)
+
+        index = CatalogCourseRunIndex.objects.get(partner=self.partner)
+        self.assertEqual(index.catalog_query, 'key:*')
+        self.assertEqual(index.course_run_ids, frozenset([self.course.id]))
+        self.assertEqual(
+            out.getvalue().strip(), 'Refreshed [1] catalog indexes for site [{}].'.format(self.site)
+        )
+
+        # Refreshing again updates the existing index.
+        call_command(self.command, site_id=self.site.id, stderr=out)
+        self.assertEqual(CatalogCourseRunIndex.objects.count(), 1)
+
+    def test_invalid_site(self):
+        """ Verify the command raises an error for an unknown site. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, site_id=self.site.id + 1)
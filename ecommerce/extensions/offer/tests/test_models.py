@@ -18,8 +18,10 @@ from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.tests.testcases import TestCase
 
 Catalog = get_model('catalogue', 'Catalog')
+CatalogCourseRunIndex = get_model('offer', 'CatalogCourseRunIndex')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Range = get_model('offer', 'Range')
+SiteConfiguration = get_model('core', 'SiteConfiguration')
 
 
 @ddt.ddt
@@ -264,6 +266,119 @@ class RangeTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         # doesn't have the provide course seat types.
         self._assert_num_requests(0)
 
+    def test_query_range_contains_products(self):
+        """
+        Verify that the method "contains_products" makes a single Discovery Service
+        request for all products of a catalog query Range and caches the result per product.
+        """
+        course, seat = self.create_course_and_seat()
+        other_course, other_seat = self.create_course_and_seat()
+        self.mock_access_token_response()
+        self.mock_course_runs_contains_endpoint(
+            query='key:*', course_run_ids=[course.id, other_course.id],
+            discovery_api_url=self.site_configuration.discovery_api_url
+        )
+        self.range.catalog_query = 'key:*'
+        self.range.course_seat_types = 'verified'
+        self.range.save()
+
+        response = self.range.contains_products([seat, other_seat])
+        self.assertEqual(response, {seat.id: True, other_seat.id: True})
+        self._assert_num_requests(2)
+
+        # The per product lookups are served from the cache.
+        self.assertTrue(self.range.contains_product(seat))
+        self.assertTrue(self.range.contains_product(other_seat))
+        self._assert_num_requests(2)
+
+    @ddt.data(ConnectionError, SlumberBaseException, Timeout)
+    def test_prefetch_failure(self, error):
+        """
+        Verify that the method "prefetch_catalog_contains_products" lets Discovery Service
+        errors through, so that callers can log their cause.
+        """
+        __, seat = self.create_course_and_seat()
+        self.range.catalog_query = 'key:*'
+        self.range.course_seat_types = 'verified'
+        self.range.save()
+
+        discovery_api_client = mock.Mock()
+        discovery_api_client.course_runs.contains.get.side_effect = error
+        with mock.patch.object(SiteConfiguration, 'discovery_api_client', new_callable=mock.PropertyMock,
+                               return_value=discovery_api_client):
+            with self.assertRaises(error):
+                self.range.prefetch_catalog_contains_products([seat])
+
+    def test_course_catalog_range_contains_products(self):
+        """
+        Verify that the method "contains_products" makes a single Discovery Service
+        request for all products of a course catalog Range and caches the result per product.
+        """
+        course, seat = self.create_course_and_seat()
+        __, other_seat = self.create_course_and_seat()
+        course_catalog = 1
+        self.range.catalog_query = None
+        self.range.course_seat_types = 'verified'
+        self.range.course_catalog = course_catalog
+        self.range.save()
+
+        self.mock_access_token_response()
+        self.mock_catalog_contains_endpoint(
+            discovery_api_url=self.site_configuration.discovery_api_url, catalog_id=course_catalog,
+            course_run_ids=[course.id]
+        )
+        response = self.range.contains_products([seat, other_seat])
+        self.assertEqual(response, {seat.id: True, other_seat.id: False})
+        self._assert_num_requests(2)
+
+        self.assertTrue(self.range.contains_product(seat))
+        self.assertFalse(self.range.contains_product(other_seat))
+        self._assert_num_requests(2)
+
+    def test_catalog_index_range_contains_product(self):
+        """
+        Verify that the method "contains_product" answers from the local catalog
+        index, without contacting the Discovery Service, when the range is indexed.
+        """
+        CatalogCourseRunIndex.clear_cache()
+        self.addCleanup(CatalogCourseRunIndex.clear_cache)
+        course, seat = self.create_course_and_seat()
+        __, other_seat = self.create_course_and_seat()
+        CatalogCourseRunIndex.objects.create(
+            partner=self.partner,
+            catalog_query='key:*',
+            query_hash=CatalogCourseRunIndex.hash_query('key:*'),
+            course_run_keys=[course.id]
+        )
+        self.range.catalog_query = 'key:*'
+        self.range.course_seat_types = 'verified'
+        self.range.save()
+
+        self.assertTrue(self.range.contains_product(seat))
+        self.assertFalse(self.range.contains_product(other_seat))
+        self.assertEqual(self.range.contains_products([seat, other_seat]), {seat.id: True, other_seat.id: False})
+        self._assert_num_requests(0)
+
+    def test_course_catalog_range_not_indexed(self):
+        """
+        Verify course catalog ranges do not use the local catalog index, as the Discovery Service
+        evaluates the query of a catalog differently from the course runs search of the index.
+        """
+        CatalogCourseRunIndex.clear_cache()
+        self.addCleanup(CatalogCourseRunIndex.clear_cache)
+        CatalogCourseRunIndex.objects.create(
+            partner=self.partner,
+            catalog_query='key:*',
+            query_hash=CatalogCourseRunIndex.hash_query('key:*'),
+            course_run_keys=[]
+        )
+        self.range.catalog_query = 'key:*'
+        self.range.course_catalog = 1
+        self.assertIsNone(self.range.get_catalog_index(self.partner))
+
+        self.range.course_catalog = None
+        self.assertIsNotNone(self.range.get_catalog_index(self.partner))
+
     def test_query_range_all_products(self):
         """
         all_products() should return seats from the query.
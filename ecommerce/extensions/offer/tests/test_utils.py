@@ -1,16 +1,22 @@
 from decimal import Decimal
 
 import ddt
+import mock
 from oscar.core.loading import get_model
 
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.checkout.utils import add_currency
-from ecommerce.extensions.offer.utils import _remove_exponent_and_trailing_zeros, format_benefit_value
+from ecommerce.extensions.offer.utils import (
+    Applicator,
+    _remove_exponent_and_trailing_zeros,
+    format_benefit_value
+)
 from ecommerce.extensions.test.factories import *  # pylint:disable=wildcard-import,unused-wildcard-import
 from ecommerce.tests.testcases import TestCase
 
 Benefit = get_model('offer', 'Benefit')
+Range = get_model('offer', 'Range')
 
 
 @ddt.ddt
@@ -61,3 +67,19 @@ class UtilTests(DiscoveryTestMixin, TestCase):
         """
         decimal = _remove_exponent_and_trailing_zeros(Decimal(value))
         self.assertEqual(decimal, Decimal(expected))
+
+    def test_applicator_prefetches_range_membership(self):
+        """ Verify the Applicator looks up all basket products of a catalog query range at once. """
+        other_seat = CourseFactory().create_or_update_seat('verified', False, 100, self.partner)
+        basket = create_basket(site=self.site, empty=True)
+        basket.add_product(self.verified_seat)
+        basket.add_product(other_seat)
+
+        query_range = RangeFactory(catalog_query='key:*', course_seat_types='verified')
+        offer = ConditionalOfferFactory(condition__range=query_range, benefit__range=query_range)
+
+        with mock.patch.object(Range, 'prefetch_catalog_contains_products') as mock_prefetch:
+            with mock.patch.object(Range, 'contains_product', return_value=False):
+                Applicator().apply_offers(basket, [offer])
+
+        mock_prefetch.assert_called_once_with([self.verified_seat, other_seat])
@@ -1,13 +1,22 @@
 """Offer Utility Methods. """
+import logging
 from decimal import Decimal
 
 from django.shortcuts import render
 from django.utils.translation import ugettext_lazy as _
+from oscar.apps.offer.utils import Applicator as OscarApplicator
 from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core.utils import traverse_pagination
 from ecommerce.extensions.checkout.utils import add_currency
 
+logger = logging.getLogger(__name__)
+
 Benefit = get_model('offer', 'Benefit')
+CatalogCourseRunIndex = get_model('offer', 'CatalogCourseRunIndex')
+Range = get_model('offer', 'Range')
 
 
 def _remove_exponent_and_trailing_zeros(decimal):
@@ -99,3 +108,85 @@ def render_email_confirmation_if_required(request, offer, product):
                 'user_email': request.user and request.user.email,
             }
         )
+
+
+class Applicator(OscarApplicator):
+    def apply_offers(self, basket, offers):
+        self.prefetch_range_membership(basket, offers)
+        super(Applicator, self).apply_offers(basket, offers)
+
+    def prefetch_range_membership(self, basket, offers):
+        """
+        Look up, with one Discovery Service request per range, whether the catalog query and
+        course catalog ranges of the offers contain the products in the basket.
+
+        The conditions check the basket lines one at a time, so without this every such offer
+        would contact the Discovery Service once per line. The responses are cached per product,
+        which is where Range.contains_product reads them from.
+        """
+        products = [line.product for line in basket.all_lines() if line.stockrecord_id]
+        if not products:
+            return
+
+        ranges = {}
+        for offer in offers:
+            offer_range = offer.condition.range
+            if offer_range and (offer_range.catalog_query or offer_range.course_catalog):
+                ranges[offer_range.id] = offer_range
+
+        for offer_range in ranges.values():
+            try:
+                offer_range.prefetch_catalog_contains_products(products)
+            except Exception:  # pylint: disable=broad-except
+                # The conditions fall back to looking up the products one at a time.
+                logger.exception('Failed to prefetch the products of range [%d] from the Discovery Service.',
+                                 offer_range.id)
+
+
+def _fetch_catalog_course_run_keys(discovery_api_client, partner_code, catalog_query):
+    """
+    Retrieve the sorted keys of every course run matching the catalog query from the Discovery Service.
+    """
+    endpoint = discovery_api_client.course_runs
+    response = endpoint.get(partner=partner_code, q=catalog_query)
+    return sorted(set(course_run['key'] for course_run in traverse_pagination(response, endpoint)))
+
+
+def refresh_catalog_index(site):
+    """
+    Refresh the local course run index of every catalog query used by a Range.
+
+    Course catalog ranges are not indexed, see Range.get_catalog_index.
+
+    Arguments:
+        site (Site): Site whose partner and Discovery Service the index is built for.
+
+    Returns:
+        int: Number of refreshed indexes.
+    """
+    site_configuration = site.siteconfiguration
+    partner = site_configuration.partner
+    discovery_api_client = site_configuration.discovery_api_client
+    catalog_queries = Range.objects.filter(
+        course_seat_types__isnull=False, course_catalog__isnull=True
+    ).exclude(catalog_query__isnull=True).exclude(catalog_query='').values_list('catalog_query', flat=True).distinct()
+
+    refreshed = 0
+    for catalog_query in catalog_queries:
+        try:
+            course_run_keys = _fetch_catalog_course_run_keys(discovery_api_client, partner.short_code, catalog_query)
+        except (ConnectionError, SlumberBaseException, Timeout):
+            logger.exception(
+                'Failed to refresh the catalog index of query [%s] for partner [%s].', catalog_query, partner.short_code
+            )
+            continue
+
+        CatalogCourseRunIndex.objects.update_or_create(
+            partner=partner,
+            query_hash=CatalogCourseRunIndex.hash_query(catalog_query),
+            defaults={'catalog_query': catalog_query, 'course_run_keys': course_run_keys}
+        )
+        refreshed += 1
+
+    logger.info('Refreshed [%d] catalog indexes for partner [%s].', refreshed, partner.short_code)
+    return refreshed
@@ -5,12 +5,14 @@ import logging
 import ddt
 import httpretty
 import mock
+from django.core.cache import cache
 from django.test.client import RequestFactory
 from oscar.core.loading import get_class, get_model
 from oscar.test.newfactories import BasketFactory
 from requests import Timeout
 from testfixtures import LogCapture
 
+from ecommerce.core.cache_utils import get_or_fetch
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
@@ -275,6 +277,54 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
                                                                           product=self.course_entitlement,
                                                                           site=self.site))
 
+    def test_cached_entitlement(self):
+        """
+        Test the Entitlement API is not called for entitlements that are cached.
+        """
+        cache.set(
+            UserAlreadyPlacedOrder.get_entitlement_cache_key(self.course_entitlement_uuid, self.site),
+            {'uuid': self.course_entitlement_uuid, 'expired_at': None}
+        )
+        with mock.patch.object(UserAlreadyPlacedOrder, 'is_entitlement_expired') as mock_is_entitlement_expired:
+            self.assertTrue(UserAlreadyPlacedOrder.user_already_placed_order(user=self.user,
+                                                                             product=self.course_entitlement,
+                                                                             site=self.site))
+            mock_is_entitlement_expired.assert_not_called()
+
+    @httpretty.activate
+    def test_expired_cached_entitlement(self):
+        """
+        Test the Entitlement API is called for entitlements whose cached details are due for a refresh.
+        """
+        key = UserAlreadyPlacedOrder.get_entitlement_cache_key(self.course_entitlement_uuid, self.site)
+        get_or_fetch(key, lambda: {'uuid': self.course_entitlement_uuid, 'expired_at': None}, 60)
+        meta = cache.get(key + '.meta')
+        meta['expires'] = 0
+        cache.set(key + '.meta', meta)
+
+        self.mock_access_token_response()
+        body = {'uuid': self.course_entitlement_uuid, 'expired_at': '2017-12-17T21:35:59.402622Z'}
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() +
+                               'entitlements/' + self.course_entitlement_uuid + '/',
+                               status=200, body=json.dumps(body), content_type='application/json')
+        self.assertFalse(UserAlreadyPlacedOrder.user_already_placed_order(user=self.user,
+                                                                          product=self.course_entitlement,
+                                                                          site=self.site))
+
+    def test_refunded_entitlement_order(self):
+        """
+        Test the Entitlement API is not called for entitlements whose order line has been refunded.
+        """
+        line = self.entitlement_order.lines.first()
+        refund = RefundFactory(order=self.entitlement_order, user=self.user)
+        RefundLine.objects.filter(refund=refund, order_line=line).update(status='Complete')
+
+        with mock.patch.object(UserAlreadyPlacedOrder, 'is_entitlement_expired') as mock_is_entitlement_expired:
+            self.assertFalse(UserAlreadyPlacedOrder.user_already_placed_order(user=self.user,
+                                                                              product=self.course_entitlement,
+                                                                              site=self.site))
+            mock_is_entitlement_expired.assert_not_called()
+
     def test_no_previous_order(self):
         """
         Test the case that user do not have any previous order for the product.
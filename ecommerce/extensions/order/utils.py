@@ -5,22 +5,19 @@ import logging
 
 import waffle
 from django.conf import settings
-from django.core.cache import cache
-from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import HttpNotFoundError
 from oscar.apps.order.utils import OrderCreator as OscarOrderCreator
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError, ConnectTimeout  # pylint: disable=ungrouped-imports
 from threadlocals.threadlocals import get_current_request
 
-from ecommerce.core.url_utils import get_lms_entitlement_api_url
+from ecommerce.core.cache_utils import get_many_fresh, get_or_fetch
 from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.refund.status import REFUND_LINE
 from ecommerce.referrals.models import Referral
 
 logger = logging.getLogger(__name__)
 
-Option = get_model('catalogue', 'Option')
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
 RefundLine = get_model('refund', 'RefundLine')
@@ -132,6 +129,12 @@ class UserAlreadyPlacedOrder(object):
     Provides utils methods to check if user has already placed an order
     """
 
+    @staticmethod
+    def get_entitlement_cache_key(entitlement_uuid, site):
+        """ Returns the key under which the details of an entitlement are cached. """
+        partner_short_code = site.siteconfiguration.partner.short_code
+        return 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
+
     @staticmethod
     def is_entitlement_expired(entitlement_uuid, site):
         """
@@ -145,16 +148,13 @@ class UserAlreadyPlacedOrder(object):
             bool: True if the entitlement is expired
 
         """
-        entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
-                                                  jwt=site.siteconfiguration.access_token)
-        partner_short_code = site.siteconfiguration.partner.short_code
-        key = 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
-        entitlement = cache.get(key)
+        key = UserAlreadyPlacedOrder.get_entitlement_cache_key(entitlement_uuid, site)
 
-        if not entitlement:
+        def fetch():
             logger.debug('Trying to get entitlement {%s}', entitlement_uuid)
-            entitlement = entitlement_api_client.entitlements(entitlement_uuid).get()
-            cache.set(key, entitlement, settings.COURSES_API_CACHE_TIMEOUT)
+            return site.siteconfiguration.entitlement_api_client.entitlements(entitlement_uuid).get()
+
+        entitlement = get_or_fetch(key, fetch, settings.COURSES_API_CACHE_TIMEOUT)
 
         expired = entitlement.get('expired_at')
 
@@ -162,6 +162,40 @@ class UserAlreadyPlacedOrder(object):
 
         return expired
 
+    @staticmethod
+    def has_unexpired_entitlement(entitlement_uuids, site):
+        """
+        Checks to see if any of the given entitlements is not expired.
+
+        The fresh details of all the entitlements are read from the cache at once. The others, missing from the
+        cache or due for a refresh, are only retrieved if none of the fresh ones is unexpired.
+
+        Args:
+            entitlement_uuids: (list of UUID)
+            site: (Site)
+
+        Returns:
+            bool: True if at least one of the entitlements is not expired
+        """
+        keys = {
+            UserAlreadyPlacedOrder.get_entitlement_cache_key(entitlement_uuid, site): entitlement_uuid
+            for entitlement_uuid in entitlement_uuids
+        }
+        cached_entitlements = get_many_fresh(keys.keys())
+        if any(entitlement and not entitlement.get('expired_at') for entitlement in cached_entitlements.values()):
+            return True
+
+        for key, entitlement_uuid in keys.items():
+            if key in cached_entitlements:
+                continue
+            try:
+                if not UserAlreadyPlacedOrder.is_entitlement_expired(entitlement_uuid, site):
+                    return True
+            except (ConnectTimeout, ConnectionError, HttpNotFoundError):
+                logger.exception('Unable to get entitlement info [%s] due to a network problem', entitlement_uuid)
+
+        return False
+
     @staticmethod
     def user_already_placed_order(user, product, site):
         """
@@ -184,24 +218,21 @@ class UserAlreadyPlacedOrder(object):
         if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
             return False
 
-        entitlement_option = Option.objects.get(code='course_entitlement')
-
-        orders_lines = OrderLine.objects.filter(product=product, order__user=user)
-        if orders_lines:
-            for order_line in orders_lines:
-                if not UserAlreadyPlacedOrder.is_order_line_refunded(order_line):
-                    if not order_line.product.is_course_entitlement_product:
-                        return True
-                    else:
-                        entitlement_uuid = order_line.attributes.get(option=entitlement_option).value
-                        try:
-                            if not UserAlreadyPlacedOrder.is_entitlement_expired(entitlement_uuid, site):
-                                return True
-                        except (ConnectTimeout, ConnectionError, HttpNotFoundError):
-                            logger.exception('Unable to get entitlement info [%s] due to a network problem',
-                                             entitlement_uuid)
+        order_lines = OrderLine.objects.filter(product=product, order__user=user).exclude(
+            refund_lines__status=REFUND_LINE.COMPLETE
+        )
+        if not product.is_course_entitlement_product:
+            return order_lines.exists()
+
+        entitlement_uuids = set(
+            order_lines.filter(attributes__option__code='course_entitlement').values_list(
+                'attributes__value', flat=True
+            )
+        )
+        if not entitlement_uuids:
+            return False
 
-        return False
+        return UserAlreadyPlacedOrder.has_unexpired_entitlement(entitlement_uuids, site)
 
     @staticmethod
     def is_order_line_refunded(order_line):
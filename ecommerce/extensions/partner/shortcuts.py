@@ -1,6 +1,9 @@
+from ecommerce.core.site_context import get_site_context
+
+
 def get_partner_for_site(request):
     """ Returns the Partner associated with the request. """
     if not request:
         return None
 
-    return request.site.siteconfiguration.partner
+    return get_site_context(request.site).partner
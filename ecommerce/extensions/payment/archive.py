@@ -0,0 +1,141 @@
+"""
+Archival of old PaymentProcessorResponses.
+
+Responses older than the retention age are moved, in chunks ordered by ID, from the database to gzipped JSON lines
+files kept in ``settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_ROOT``, which is not publicly accessible. Each file is
+recorded as a PaymentProcessorResponseArchive, so that get_processor_responses can still find the archived responses
+for audits.
+"""
+from __future__ import unicode_literals
+
+import gzip
+import json
+import logging
+import tempfile
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from oscar.core.loading import get_model
+
+logger = logging.getLogger(__name__)
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+PaymentProcessorResponseArchive = get_model('payment', 'PaymentProcessorResponseArchive')
+
+ARCHIVED_FIELDS = ('id', 'processor_name', 'transaction_id', 'basket_id', 'response', 'created')
+LOOKUP_FIELDS = ('id', 'processor_name', 'transaction_id', 'basket_id')
+
+
+def _archive_chunk(responses):
+    first_id = responses[0].id
+    last_id = responses[-1].id
+
+    with tempfile.TemporaryFile() as archive_file:
+        with gzip.GzipFile(fileobj=archive_file, mode='wb') as gzip_file:
+            for response in responses:
+                data = {field: getattr(response, field) for field in ARCHIVED_FIELDS}
+                gzip_file.write(json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8') + b'\n')
+
+        archive_file.seek(0)
+        archive = PaymentProcessorResponseArchive(
+            first_response_id=first_id, last_response_id=last_id, response_count=len(responses)
+        )
+        try:
+            with transaction.atomic():
+                PaymentProcessorResponse.objects.filter(id__in=[response.id for response in responses]).delete()
+                # The file is written last, and removed if the transaction fails, so that no file outlives its archive.
+                archive.archive.save('{}-{}.jsonl.gz'.format(first_id, last_id), File(archive_file))
+        except Exception:
+            if archive.archive:
+                archive.archive.storage.delete(archive.archive.name)
+            raise
+
+    logger.info('Archived [%d] payment processor responses, [%d] through [%d].', len(responses), first_id, last_id)
+
+
+def archive_processor_responses(before, chunk_size=None):
+    """
+    Move the responses created before the given date to archive files, and delete them from the database.
+
+    Arguments:
+        before (datetime): Responses created before this date are archived.
+        chunk_size (int): Number of responses per archive file.
+            Defaults to ``settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_CHUNK_SIZE``.
+
+    Returns:
+        int: Number of archived responses.
+    """
+    chunk_size = chunk_size or settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_CHUNK_SIZE
+    queryset = PaymentProcessorResponse.objects.filter(created__lt=before).order_by('id')
+    archived = 0
+    last_id = 0
+
+    while True:
+        responses = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not responses:
+            break
+
+        _archive_chunk(responses)
+        archived += len(responses)
+        last_id = responses[-1].id
+
+    return archived
+
+
+def iter_archived_responses(archive):
+    """
+    Iterate over the responses stored in an archive.
+
+    Arguments:
+        archive (PaymentProcessorResponseArchive)
+
+    Yields:
+        PaymentProcessorResponse: Unsaved responses, as they were when archived.
+    """
+    archive.archive.open('rb')
+    try:
+        with gzip.GzipFile(fileobj=archive.archive, mode='rb') as gzip_file:
+            for line in gzip_file:
+                data = json.loads(line.decode('utf-8'))
+                data['created'] = parse_datetime(data['created'])
+                yield PaymentProcessorResponse(**data)
+    finally:
+        archive.archive.close()
+
+
+def get_processor_responses(**filters):
+    """
+    Return the responses matching the given filters, whether they are in the database or archived.
+
+    Archives are read in full, unless an ID is given, so this is meant for audits rather than for requests.
+
+    Arguments:
+        **filters: Values of the fields in LOOKUP_FIELDS the responses must have.
+
+    Returns:
+        list[PaymentProcessorResponse]: Responses ordered by ID. Archived responses are not saved.
+
+    Raises:
+        ValueError: If filtering on another field.
+    """
+    invalid_fields = set(filters) - set(LOOKUP_FIELDS)
+    if invalid_fields:
+        raise ValueError('Cannot look up archived responses by [{}].'.format(', '.join(sorted(invalid_fields))))
+
+    responses = list(PaymentProcessorResponse.objects.filter(**filters))
+
+    archives = PaymentProcessorResponseArchive.objects.all()
+    if 'id' in filters:
+        archives = archives.filter(first_response_id__lte=filters['id'], last_response_id__gte=filters['id'])
+
+    for archive in archives:
+        responses.extend(
+            response for response in iter_archived_responses(archive)
+            if all(getattr(response, field) == value for field, value in filters.items())
+        )
+
+    return sorted(responses, key=attrgetter('id'))
@@ -2,12 +2,16 @@
 import base64
 import hashlib
 import hmac
+from collections import OrderedDict
 from importlib import import_module
 
 from django.conf import settings
 
 from ecommerce.extensions.payment import exceptions
 
+# Processor classes by name, for each value of the PAYMENT_PROCESSORS setting seen by this process
+_processor_registries = {}
+
 
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
@@ -44,6 +48,30 @@ def get_default_processor_class():
     return processor_class
 
 
+def get_processor_classes():
+    """Return the payment processor classes specified in the PAYMENT_PROCESSORS setting.
+
+    The classes are only imported the first time the function is called, for a given value of the setting.
+
+    Returns:
+        OrderedDict: The payment processor classes, keyed by name, in the order of the setting.
+
+    Raises:
+        ImportError, AttributeError: If one of the paths is not the path of a class.
+    """
+    paths = tuple(settings.PAYMENT_PROCESSORS)
+    registry = _processor_registries.get(paths)
+
+    if registry is None:
+        registry = OrderedDict()
+        for path in paths:
+            processor_class = get_processor_class(path)
+            registry.setdefault(processor_class.NAME, processor_class)
+        _processor_registries[paths] = registry
+
+    return registry
+
+
 def get_processor_class_by_name(name):
     """Return the payment processor class corresponding to the specified name.
 
@@ -56,15 +84,12 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
-    for path in settings.PAYMENT_PROCESSORS:
-        processor_class = get_processor_class(path)
-
-        if name == processor_class.NAME:
-            return processor_class
-
-    raise exceptions.ProcessorNotFoundError(
-        exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
-    )
+    try:
+        return get_processor_classes()[name]
+    except KeyError:
+        raise exceptions.ProcessorNotFoundError(
+            exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
+        )
 
 
 def sign(message, secret):
@@ -0,0 +1,52 @@
+""" Moves old payment processor responses from the database to archive files. """
+
+from __future__ import unicode_literals
+
+import datetime
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.payment.archive import archive_processor_responses
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+
+class Command(BaseCommand):
+    help = 'Archive, and delete from the database, payment processor responses older than a given age.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE,
+                            type=int,
+                            help='Age, in days, of the oldest responses to keep in the database.')
+        parser.add_argument('-c', '--chunk-size',
+                            action='store',
+                            dest='chunk_size',
+                            default=settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_CHUNK_SIZE,
+                            type=int,
+                            help='Number of responses per archive file.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually archive the responses.')
+
+    def handle(self, *args, **options):
+        if options['days'] is None:
+            raise CommandError('An age must be specified, as PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE is not set!')
+
+        before = now() - datetime.timedelta(days=options['days'])
+
+        if options['commit']:
+            count = archive_processor_responses(before, options['chunk_size'])
+            self.stderr.write('Archived [{}] payment processor responses created before [{}].'.format(count, before))
+        else:
+            count = PaymentProcessorResponse.objects.filter(created__lt=before).count()
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have archived [{}] payment processor responses.'.format(count)
+            self.stderr.write(msg)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django_extensions.db.fields
+from django.db import migrations, models
+
+import ecommerce.core.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0018_create_stripe_switch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentProcessorResponseArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('archive', models.FileField(storage=ecommerce.core.storage.PaymentProcessorResponseArchiveStorage(), upload_to='payment_processor_responses')),
+                ('first_response_id', models.PositiveIntegerField(db_index=True)),
+                ('last_response_id', models.PositiveIntegerField(db_index=True)),
+                ('response_count', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ('first_response_id',),
+                'verbose_name': 'Payment Processor Response Archive',
+                'verbose_name_plural': 'Payment Processor Response Archives',
+            },
+        ),
+    ]
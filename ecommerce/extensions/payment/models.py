@@ -7,6 +7,7 @@ from jsonfield import JSONField
 from oscar.apps.payment.abstract_models import AbstractSource
 from solo.models import SingletonModel
 
+from ecommerce.core.storage import payment_processor_response_archive_storage
 from ecommerce.extensions.payment.constants import CARD_TYPE_CHOICES
 
 
@@ -27,6 +28,30 @@ class PaymentProcessorResponse(models.Model):
         verbose_name_plural = _('Payment Processor Responses')
 
 
+class PaymentProcessorResponseArchive(TimeStampedModel):
+    """
+    File of PaymentProcessorResponses moved out of the database, as gzipped JSON lines.
+
+    See ecommerce.extensions.payment.archive.
+    """
+    archive = models.FileField(
+        upload_to='payment_processor_responses', storage=payment_processor_response_archive_storage
+    )
+    first_response_id = models.PositiveIntegerField(db_index=True)
+    last_response_id = models.PositiveIntegerField(db_index=True)
+    response_count = models.PositiveIntegerField()
+
+    class Meta(object):
+        ordering = ('first_response_id',)
+        verbose_name = _('Payment Processor Response Archive')
+        verbose_name_plural = _('Payment Processor Response Archives')
+
+    def __unicode__(self):
+        return 'Payment processor responses [{first}] through [{last}]'.format(
+            first=self.first_response_id, last=self.last_response_id
+        )
+
+
 class Source(AbstractSource):
     card_type = models.CharField(max_length=255, choices=CARD_TYPE_CHOICES, null=True, blank=True)
 
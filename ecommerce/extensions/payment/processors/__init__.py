@@ -8,6 +8,8 @@ from django.conf import settings
 from django.utils.functional import cached_property
 from oscar.core.loading import get_model
 
+from ecommerce.core.site_context import get_site_context
+
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
 HandledProcessorResponse = namedtuple('HandledProcessorResponse',
@@ -78,7 +80,7 @@ class BasePaymentProcessor(object):  # pragma: no cover
         Raises:
             KeyError: If no settings found for this payment processor
         """
-        partner_short_code = self.site.siteconfiguration.partner.short_code
+        partner_short_code = get_site_context(self.site).partner.short_code
         return settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][self.NAME.lower()]
 
     @property
@@ -0,0 +1,17 @@
+import datetime
+
+from celery import shared_task
+from django.conf import settings
+from django.utils.timezone import now
+
+from ecommerce.extensions.payment.archive import archive_processor_responses
+
+
+@shared_task
+def archive_old_processor_responses():
+    """ Archive the payment processor responses older than PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE days, if set. """
+    if settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE is None:
+        return 0
+
+    before = now() - datetime.timedelta(days=settings.PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE)
+    return archive_processor_responses(before)
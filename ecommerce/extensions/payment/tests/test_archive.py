@@ -0,0 +1,139 @@
+from __future__ import unicode_literals
+
+import datetime
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+
+import mock
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.payment.archive import archive_processor_responses, get_processor_responses
+from ecommerce.extensions.payment.tasks import archive_old_processor_responses
+from ecommerce.tests.testcases import TestCase
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+PaymentProcessorResponseArchive = get_model('payment', 'PaymentProcessorResponseArchive')
+
+
+class ArchiveTestMixin(object):
+    def setUp(self):
+        super(ArchiveTestMixin, self).setUp()
+        self.media_root = media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_root_override = override_settings(PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+
+        self.basket = factories.BasketFactory()
+        self.old_responses = [self.create_response('txn-{}'.format(index), days=100) for index in range(3)]
+        self.recent_response = self.create_response('txn-recent', days=1)
+
+    def create_response(self, transaction_id, days):
+        response = PaymentProcessorResponse.objects.create(
+            processor_name='cybersource',
+            transaction_id=transaction_id,
+            basket=self.basket,
+            response={'transaction_id': transaction_id, 'amount': '100.00'},
+        )
+        created = now() - datetime.timedelta(days=days)
+        PaymentProcessorResponse.objects.filter(id=response.id).update(created=created)
+        response.created = created
+        return response
+
+
+class ArchiveTests(ArchiveTestMixin, TestCase):
+    def test_archive_processor_responses(self):
+        """ Verify old responses are moved to archives of the given size, and can still be looked up. """
+        count = archive_processor_responses(now() - datetime.timedelta(days=30), chunk_size=2)
+
+        self.assertEqual(count, len(self.old_responses))
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.recent_response])
+        self.assertEqual(
+            list(PaymentProcessorResponseArchive.objects.values_list('response_count', flat=True)), [2, 1]
+        )
+
+        responses = get_processor_responses(basket_id=self.basket.id)
+        self.assertEqual([response.id for response in responses],
+                         [response.id for response in self.old_responses + [self.recent_response]])
+        archived = responses[0]
+        expected = self.old_responses[0]
+        self.assertEqual(archived.transaction_id, expected.transaction_id)
+        self.assertEqual(archived.response, expected.response)
+        self.assertEqual(archived.processor_name, expected.processor_name)
+        self.assertLess(abs(archived.created - expected.created), datetime.timedelta(seconds=1))
+
+    def test_private_storage(self):
+        """ Verify archives are stored in the configured directory, and have no public URL. """
+        archive_processor_responses(now() - datetime.timedelta(days=30))
+        archive = PaymentProcessorResponseArchive.objects.get()
+
+        self.assertTrue(os.path.isfile(os.path.join(self.media_root, archive.archive.name)))
+        with self.assertRaises(NotImplementedError):
+            archive.archive.url  # pylint: disable=pointless-statement
+
+    def test_failed_delete(self):
+        """ Verify no archive file is left behind if the responses cannot be deleted. """
+        with mock.patch.object(QuerySet, 'delete', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                archive_processor_responses(now() - datetime.timedelta(days=30))
+
+        self.assertEqual(PaymentProcessorResponse.objects.count(), len(self.old_responses) + 1)
+        self.assertFalse(PaymentProcessorResponseArchive.objects.exists())
+        self.assertEqual([files for __, __, files in os.walk(self.media_root) if files], [])
+
+    def test_get_processor_responses(self):
+        """ Verify archived responses can be looked up by ID and transaction ID. """
+        archive_processor_responses(now() - datetime.timedelta(days=30), chunk_size=2)
+        response = self.old_responses[2]
+
+        self.assertEqual([r.id for r in get_processor_responses(id=response.id)], [response.id])
+        responses = get_processor_responses(transaction_id=response.transaction_id)
+        self.assertEqual([r.id for r in responses], [response.id])
+        self.assertEqual(get_processor_responses(transaction_id='unknown'), [])
+
+        with self.assertRaises(ValueError):
+            get_processor_responses(response__transaction_id=response.transaction_id)
+
+    def test_task(self):
+        """ Verify the task only archives responses if an age is configured. """
+        self.assertEqual(archive_old_processor_responses(), 0)
+
+        with override_settings(PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE=30):
+            self.assertEqual(archive_old_processor_responses(), len(self.old_responses))
+
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.recent_response])
+
+
+class ArchiveProcessorResponsesCommandTests(ArchiveTestMixin, TestCase):
+    command = 'archive_processor_responses'
+
+    def test_without_commit(self):
+        """ Verify the command does not archive responses if the commit flag is not set. """
+        out = StringIO()
+        call_command(self.command, days=30, stderr=out)
+
+        self.assertEqual(PaymentProcessorResponse.objects.count(), len(self.old_responses) + 1)
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have archived [{}] payment processor responses.'.format(len(self.old_responses))
+        self.assertEqual(out.getvalue().strip(), expected)
+
+    def test_with_commit(self):
+        """ Verify the command archives the responses older than the given age. """
+        out = StringIO()
+        call_command(self.command, days=30, commit=True, stderr=out)
+
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.recent_response])
+        self.assertTrue(out.getvalue().startswith('Archived [{}]'.format(len(self.old_responses))))
+
+    def test_without_age(self):
+        """ Verify an error is raised if no age is given or configured. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, commit=True)
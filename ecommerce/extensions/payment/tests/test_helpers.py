@@ -1,4 +1,5 @@
 import ddt
+import mock
 from django.test import override_settings
 
 from ecommerce.extensions.payment import helpers
@@ -27,6 +28,19 @@ class HelperTests(TestCase):
         """ Verify the function returns the appropriate processor class or raises an exception, if not found. """
         self.assertIs(helpers.get_processor_class_by_name(processor.NAME), processor)
 
+    def test_get_processor_classes(self):
+        """ Verify the function returns the processor classes by name, and only imports them once. """
+        expected = [(DummyProcessor.NAME, DummyProcessor), (AnotherDummyProcessor.NAME, AnotherDummyProcessor)]
+        self.assertEqual(list(helpers.get_processor_classes().items()), expected)
+
+        with mock.patch.object(helpers, 'import_module') as mock_import_module:
+            self.assertEqual(list(helpers.get_processor_classes().items()), expected)
+            self.assertIs(helpers.get_processor_class_by_name(DummyProcessor.NAME), DummyProcessor)
+            self.assertFalse(mock_import_module.called)
+
+        with override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            self.assertEqual(list(helpers.get_processor_classes().items()), expected[:1])
+
     def test_get_processor_class_by_name_not_found(self):
         """
         If get_processor_class_by_name is called with the name of a non-existent processor,
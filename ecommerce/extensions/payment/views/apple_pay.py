@@ -3,13 +3,14 @@ import logging
 from django.http import HttpResponse
 from django.views import View
 
+from ecommerce.core.site_context import get_site_context
+
 logger = logging.getLogger(__name__)
 
 
 class ApplePayMerchantDomainAssociationView(View):
     def get(self, request, *args, **kwargs):  # pylint: disable=unused-argument
-        site_configuration = self.request.site.siteconfiguration
-        payment_processor_class = site_configuration.get_client_side_payment_processor_class()
+        payment_processor_class = get_site_context().client_side_payment_processor_class
         payment_processor = payment_processor_class(self.request.site)
         content = payment_processor.apple_pay_merchant_id_domain_association
         status_code = 200
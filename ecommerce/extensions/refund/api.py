@@ -1,8 +1,19 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
 from oscar.core.loading import get_model
 
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.refund.processing import get_processor_names
+from ecommerce.extensions.refund.status import REFUND_LINE
+from ecommerce.extensions.refund.tasks import approve_refunds
+
+logger = logging.getLogger(__name__)
 
 Option = get_model('catalogue', 'Option')
+OrderLine = get_model('order', 'Line')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
 
@@ -87,3 +98,116 @@ def create_refunds(orders, course_id):
             refunds.append(refund)
 
     return refunds
+
+
+def find_unrefunded_course_lines(course_id, usernames=None):
+    """
+    Returns a queryset of the lines of complete orders associated with the given course, and not yet refunded.
+
+    Lines whose refunds have all been denied are considered unrefunded, as in Refund.create_with_lines.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order lines
+        usernames (list): If given, only the lines of orders placed by these users are returned
+
+    Raises:
+        ValueError if course_id is invalid.
+
+    Returns:
+        QuerySet: unrefunded order lines
+    """
+    if not course_id or not course_id.strip():
+        raise ValueError('"{}" is not a valid course ID.'.format(course_id))
+
+    refunded_line_ids = RefundLine.objects.exclude(status=REFUND_LINE.DENIED).values('order_line_id')
+    lines = OrderLine.objects.filter(
+        order__status=ORDER.COMPLETE,
+        product__attribute_values__attribute__code='course_key',
+        product__attribute_values__value_text=course_id
+    ).exclude(id__in=refunded_line_ids)
+
+    if usernames is not None:
+        lines = lines.filter(order__user__username__in=usernames)
+
+    return lines
+
+
+def queue_refund_approvals(refunds, approve=False):
+    """
+    Queues the approval of the given refunds, once the current transaction is committed.
+
+    Refunds are grouped by the payment processor which issues their credit, so that each task only talks to a
+    single processor. Refunds corresponding to a total credit of $0 are always approved, without notifying the
+    purchaser, as they are in Refund.create_with_lines.
+
+    Arguments:
+        refunds (list): refunds to approve
+        approve (bool): whether to approve the refunds with a non-zero credit
+    """
+    processor_names = get_processor_names(refunds)
+
+    refund_ids = defaultdict(list)
+    for refund in refunds:
+        if refund.total_credit_excl_tax == 0:
+            refund_ids[(None, False)].append(refund.id)
+        elif approve:
+            refund_ids[(processor_names[refund.id], True)].append(refund.id)
+
+    batch_size = settings.REFUND_APPROVAL_BATCH_SIZE
+    for (processor_name, notify_purchaser), ids in refund_ids.items():
+        logger.info('Queueing the approval of [%d] refunds issued by [%s].', len(ids), processor_name)
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            transaction.on_commit(
+                lambda batch=batch, notify_purchaser=notify_purchaser: approve_refunds.delay(
+                    batch, notify_purchaser=notify_purchaser
+                )
+            )
+
+
+def create_refunds_for_course(course_id, usernames=None, approve=False, batch_size=None):
+    """
+    Creates refunds for all unrefunded lines associated with the given course, e.g. when the course is cancelled.
+
+    Orders are processed in batches, ordered by ID, each with a fixed number of queries. The refunds of each batch
+    are created in a single transaction, and their approval is queued once it is committed.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order lines
+        usernames (list): If given, only refund the orders placed by these users
+        approve (bool): whether to approve the refunds, and issue their credit, in the background
+        batch_size (int): Number of orders per batch. Defaults to ``settings.REFUND_BATCH_SIZE``.
+
+    Raises:
+        ValueError if course_id is invalid.
+
+    Returns:
+        list: refunds created
+    """
+    batch_size = batch_size or settings.REFUND_BATCH_SIZE
+    lines = find_unrefunded_course_lines(course_id, usernames)
+    refunds = []
+    last_order_id = 0
+
+    while True:
+        order_ids = list(
+            lines.filter(order_id__gt=last_order_id).order_by('order_id').values_list(
+                'order_id', flat=True
+            ).distinct()[:batch_size]
+        )
+        if not order_ids:
+            break
+
+        with transaction.atomic():
+            batch_refunds = Refund.bulk_create_with_lines(
+                lines.filter(order_id__in=order_ids).select_related('order').order_by('order_id', 'id')
+            )
+            queue_refund_approvals(batch_refunds, approve=approve)
+
+        refunds.extend(batch_refunds)
+        last_order_id = order_ids[-1]
+
+        if len(order_ids) < batch_size:
+            break
+
+    return refunds
@@ -0,0 +1,87 @@
+""" Approves refunds concurrently, within the limits of each payment processor, and reports their progress. """
+
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management import BaseCommand, CommandError
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.refund.processing import RefundApprover
+from ecommerce.extensions.refund.status import REFUND
+
+Refund = get_model('refund', 'Refund')
+
+
+class Command(BaseCommand):
+    help = 'Approve refunds, issuing their credit and revoking their fulfillment.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course-id',
+                            action='store',
+                            dest='course_id',
+                            default=None,
+                            help='Approve the pending refunds of the orders associated with this course.')
+        parser.add_argument('-r', '--refund-id',
+                            action='append',
+                            dest='refund_ids',
+                            default=None,
+                            type=int,
+                            help='Approve this refund. May be repeated.')
+        parser.add_argument('--progress-seconds',
+                            action='store',
+                            dest='progress_seconds',
+                            default=10,
+                            type=int,
+                            help='Seconds between each progress report.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually approve the refunds.')
+
+    def handle(self, *args, **options):
+        course_id = options['course_id']
+        refund_ids = options['refund_ids']
+        if not course_id and not refund_ids:
+            raise CommandError('Either a course ID or refund IDs must be specified.')
+
+        refunds = Refund.objects.filter(
+            status__in=(REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR, REFUND.PAYMENT_REFUNDED, REFUND.REVOCATION_ERROR)
+        )
+        if course_id:
+            refunds = refunds.filter(
+                lines__order_line__product__attribute_values__attribute__code='course_key',
+                lines__order_line__product__attribute_values__value_text=course_id
+            ).distinct()
+        if refund_ids:
+            refunds = refunds.filter(id__in=refund_ids)
+
+        refunds = list(refunds.select_related('order', 'user').order_by('id'))
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have approved [{}] refunds.'.format(len(refunds))
+            self.stderr.write(msg)
+            return
+
+        start = time.time()
+        approver = RefundApprover()
+        approver.start(refunds)
+        while not approver.join(options['progress_seconds']):
+            self.write_progress(approver.progress)
+        elapsed = time.time() - start
+
+        self.write_progress(approver.progress)
+        self.stderr.write(
+            'Processed [{refunds}] refunds in [{elapsed:.2f}] seconds '
+            '([{rate:.2f}] seconds per 1,000 refunds).'.format(
+                refunds=len(refunds), elapsed=elapsed, rate=elapsed * 1000 / max(len(refunds), 1)
+            )
+        )
+
+    def write_progress(self, progress):
+        self.stderr.write(
+            'Approved [{approved}], failed [{failed}] and pending [{pending}] refunds, after [{retried}] '
+            'retries.'.format(**progress)
+        )
@@ -0,0 +1,73 @@
+""" Creates refunds for all learners of a course, e.g. when the course is cancelled. """
+
+from __future__ import unicode_literals
+
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.extensions.refund.api import create_refunds_for_course, find_unrefunded_course_lines
+
+
+class Command(BaseCommand):
+    help = 'Create refunds for all unrefunded orders associated with a course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course-id',
+                            action='store',
+                            dest='course_id',
+                            required=True,
+                            help='Course for which to refund the orders.')
+        parser.add_argument('-u', '--username',
+                            action='append',
+                            dest='usernames',
+                            default=None,
+                            help='Only refund the orders of this learner. May be repeated.')
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=settings.REFUND_BATCH_SIZE,
+                            type=int,
+                            help='Number of orders refunded per transaction.')
+        parser.add_argument('--approve',
+                            action='store_true',
+                            dest='approve',
+                            default=False,
+                            help='Approve the refunds, and issue their credit, in the background.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually create the refunds.')
+
+    def handle(self, *args, **options):
+        try:
+            lines = find_unrefunded_course_lines(options['course_id'], options['usernames'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if not options['commit']:
+            count = lines.values('order_id').distinct().count()
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have refunded [{}] orders.'.format(count)
+            self.stderr.write(msg)
+            return
+
+        start = time.time()
+        refunds = create_refunds_for_course(
+            options['course_id'],
+            usernames=options['usernames'],
+            approve=options['approve'],
+            batch_size=options['batch_size']
+        )
+        elapsed = time.time() - start
+
+        learners = len(set(refund.user_id for refund in refunds))
+        self.stderr.write(
+            'Created [{refunds}] refunds for [{learners}] learners in [{elapsed:.2f}] seconds '
+            '([{rate:.2f}] seconds per 1,000 learners).'.format(
+                refunds=len(refunds), learners=learners, elapsed=elapsed,
+                rate=elapsed * 1000 / max(learners, 1)
+            )
+        )
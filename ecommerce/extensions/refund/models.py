@@ -1,9 +1,10 @@
 from __future__ import unicode_literals
 
 import logging
+from collections import OrderedDict
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from ecommerce_worker.sailthru.v1.tasks import send_course_refund_email
@@ -22,11 +23,37 @@ from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 
 logger = logging.getLogger(__name__)
 
+Order = get_model('order', 'Order')
 PaymentEvent = get_model('order', 'PaymentEvent')
 PaymentEventType = get_model('order', 'PaymentEventType')
 post_refund = get_class('refund.signals', 'post_refund')
 
 
+def lock_orders(order_ids):
+    """
+    Lock the rows of the given orders until the end of the current transaction.
+
+    Refunds are only created while holding the lock of their order, so that no other refund of the order can be
+    created concurrently.
+    """
+    list(Order.objects.select_for_update().filter(id__in=order_ids).values_list('id', flat=True))
+
+
+def get_refunded_line_ids(line_ids):
+    """
+    Return the IDs of the given order lines which have a refund line that was not denied.
+
+    This is a locking read, so that it sees the refund lines committed by other transactions while their order was
+    locked, even on databases reading from a snapshot taken earlier in the transaction, e.g. MySQL's REPEATABLE READ.
+    It should be called while holding the lock of the lines' orders.
+    """
+    return set(
+        RefundLine.objects.select_for_update().filter(order_line_id__in=line_ids).exclude(
+            status=REFUND_LINE.DENIED
+        ).values_list('order_line_id', flat=True)
+    )
+
+
 class StatusMixin(object):
     pipeline_setting = None
 
@@ -103,9 +130,15 @@ class Refund(StatusMixin, TimeStampedModel):
             None: If no unrefunded order lines have been provided.
             Refund: With RefundLines corresponding to each given unrefunded order line.
         """
-        unrefunded_lines = [line for line in lines if not line.refund_lines.exclude(status=REFUND_LINE.DENIED).exists()]
+        lines = list(lines)
+
+        with transaction.atomic():
+            lock_orders([order.id])
+            refunded_line_ids = get_refunded_line_ids([line.id for line in lines])
+            unrefunded_lines = [line for line in lines if line.id not in refunded_line_ids]
+            if not unrefunded_lines:
+                return None
 
-        if unrefunded_lines:
             status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
             total_credit_excl_tax = sum([line.line_price_excl_tax for line in unrefunded_lines])
             refund = cls.objects.create(
@@ -125,19 +158,93 @@ class Refund(StatusMixin, TimeStampedModel):
             )
 
             status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
-            for line in unrefunded_lines:
-                RefundLine.objects.create(
+            RefundLine.objects.bulk_create([
+                RefundLine(
                     refund=refund,
                     order_line=line,
                     line_credit_excl_tax=line.line_price_excl_tax,
                     quantity=line.quantity,
                     status=status
-                )
+                ) for line in unrefunded_lines
+            ])
+
+        if total_credit_excl_tax == 0:
+            refund.approve(notify_purchaser=False)
+
+        return refund
+
+    @classmethod
+    def bulk_create_with_lines(cls, lines):
+        """Given unrefunded order lines, creates a Refund, with corresponding RefundLines, for each of their orders.
+
+        Unlike create_with_lines, the refunds are not approved, so that refunds can be created for many orders with a
+        fixed number of queries. Lines refunded since they were selected, while their order was not locked, are
+        skipped. The lines should be selected along with their order.
+
+        Arguments:
+            lines (list of order.Line): Unrefunded order lines to be refunded.
+
+        Returns:
+            list of Refund: With RefundLines corresponding to the given order lines, ordered by ID.
+        """
+        lines = list(lines)
+        if not lines:
+            return []
+
+        status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
+        line_status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
+
+        order_ids = sorted(set(line.order_id for line in lines))
+        with transaction.atomic():
+            # No other refund of the orders can be created until this transaction ends, as the orders are locked.
+            lock_orders(order_ids)
+            refunded_line_ids = get_refunded_line_ids([line.id for line in lines])
+
+            lines_by_order = OrderedDict()
+            for line in lines:
+                if line.id not in refunded_line_ids:
+                    lines_by_order.setdefault(line.order, []).append(line)
+
+            if not lines_by_order:
+                return []
+
+            # bulk_create does not set the IDs of the created rows on MySQL, so the refunds are read back, as the
+            # refunds of the orders which did not exist before.
+            existing_ids = list(
+                cls.objects.select_for_update().filter(order_id__in=order_ids).values_list('id', flat=True)
+            )
+            cls.objects.bulk_create([
+                cls(
+                    order=order,
+                    user_id=order.user_id,
+                    status=status,
+                    total_credit_excl_tax=sum([line.line_price_excl_tax for line in order_lines])
+                ) for order, order_lines in lines_by_order.items()
+            ])
+            refunds = cls.objects.filter(order_id__in=order_ids).exclude(id__in=existing_ids)
+            refunds = list(refunds.select_related('order').order_by('id'))
+
+            RefundLine.objects.bulk_create([
+                RefundLine(
+                    refund=refund,
+                    order_line=line,
+                    line_credit_excl_tax=line.line_price_excl_tax,
+                    quantity=line.quantity,
+                    status=line_status
+                ) for refund in refunds for line in lines_by_order[refund.order]
+            ])
 
-            if total_credit_excl_tax == 0:
-                refund.approve(notify_purchaser=False)
+        for refund in refunds:
+            audit_log(
+                'refund_created',
+                amount=refund.total_credit_excl_tax,
+                currency=refund.currency,
+                order_number=refund.order.number,
+                refund_id=refund.id,
+                user_id=refund.user_id
+            )
 
-            return refund
+        return refunds
 
     @property
     def num_items(self):
@@ -0,0 +1,264 @@
+"""
+Concurrent approval of refunds.
+
+Approving a refund waits on the payment processor, to issue the credit, and on the LMS, to revoke the fulfillment
+of each line. RefundApprover approves the refunds of each payment processor with several threads, so that these
+waits overlap, while keeping to the concurrency and rate limits set for the processor in
+``settings.REFUND_PROCESSOR_LIMITS``. The limits are kept in the cache, so that they apply to all the RefundApprovers
+sharing it together, e.g. to all the approve_refunds tasks running at once, rather than to each of them.
+
+Failed approvals which leave the refund in REVOCATION_ERROR are retried. These retries are idempotent, as the refund
+has been credited, and only its revocation is retried. Approvals leaving the refund in PAYMENT_REFUND_ERROR, or raising
+unexpected exceptions, are not retried, as the credit may have been issued nonetheless, e.g. if the processor timed out
+after processing it. They are left for manual follow-up.
+"""
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from oscar.core.loading import get_model
+from six.moves import queue
+
+from ecommerce.extensions.refund.status import REFUND
+
+logger = logging.getLogger(__name__)
+
+Source = get_model('payment', 'Source')
+
+RETRIABLE_STATUSES = (REFUND.REVOCATION_ERROR,)
+# Interval, in seconds, at which threads waiting for a processor slot check whether one was freed.
+SLOT_POLL_INTERVAL = 0.05
+
+
+def get_processor_names(refunds):
+    """
+    Returns the name of the payment processor issuing the credit of each refund.
+
+    Arguments:
+        refunds (list): refunds whose orders were paid with at most one source
+
+    Returns:
+        dict: processor name by refund ID. Refunds of orders without a source, e.g. free orders, map to None.
+    """
+    processor_names = dict(
+        Source.objects.filter(order_id__in=[refund.order_id for refund in refunds]).values_list(
+            'order_id', 'source_type__name'
+        )
+    )
+    return {refund.id: processor_names.get(refund.order_id) for refund in refunds}
+
+
+class RateLimiter(object):
+    """
+    Delays calls to acquire, from any thread or process sharing the cache, so that at most `rate` of them return
+    during each second.
+    """
+
+    def __init__(self, key, rate):
+        self.key = key
+        self.rate = rate
+
+    def acquire(self):
+        if not self.rate:
+            return
+
+        while True:
+            now = time.time()
+            second = int(now)
+            key = '{}.{}'.format(self.key, second)
+            cache.add(key, 0, 2)
+            try:
+                if cache.incr(key) <= self.rate:
+                    return
+            except ValueError:
+                # The count expired between add and incr.
+                continue
+
+            time.sleep(second + 1 - now)
+
+
+class Semaphore(object):
+    """
+    Semaphore shared by all threads and processes sharing the cache, with `value` slots.
+
+    Slots are released after `timeout` seconds, should the process holding one die.
+    """
+
+    def __init__(self, key, value, timeout):
+        self.key = key
+        self.value = value
+        self.timeout = timeout
+
+    def acquire(self):
+        """
+        Block until a slot is free, and take it.
+
+        Returns:
+            tuple: Key and token of the slot, to be passed to release.
+        """
+        token = uuid.uuid4().hex
+        while True:
+            for index in range(self.value):
+                key = '{}.{}'.format(self.key, index)
+                if cache.add(key, token, self.timeout):
+                    return key, token
+
+            time.sleep(SLOT_POLL_INTERVAL)
+
+    def release(self, slot):
+        key, token = slot
+        # The slot may have timed out, and been taken by someone else.
+        if cache.get(key) == token:
+            cache.delete(key)
+
+
+class ProcessorLimiter(object):
+    """ Keeps the approvals of the refunds issued by a payment processor within its limits. """
+
+    def __init__(self, processor_name, concurrency, rate):
+        key = 'refund_approval.{}'.format(processor_name)
+        self.semaphore = Semaphore(key + '.slots', concurrency, settings.REFUND_APPROVAL_SLOT_TIMEOUT)
+        self.rate_limiter = RateLimiter(key + '.rate', rate)
+
+    @contextmanager
+    def limit(self):
+        slot = self.semaphore.acquire()
+        try:
+            self.rate_limiter.acquire()
+            yield
+        finally:
+            self.semaphore.release(slot)
+
+
+class RefundApprover(object):
+    """ Approves refunds concurrently, within the limits of each payment processor. """
+
+    def __init__(self, revoke_fulfillment=True, notify_purchaser=True):
+        self.revoke_fulfillment = revoke_fulfillment
+        self.notify_purchaser = notify_purchaser
+        self._lock = threading.Lock()
+        self._threads = []
+        self.counters = defaultdict(lambda: {'pending': 0, 'approved': 0, 'failed': 0, 'retried': 0})
+
+    @property
+    def progress(self):
+        """ Totals of the counters of all processors. """
+        with self._lock:
+            totals = {'pending': 0, 'approved': 0, 'failed': 0, 'retried': 0}
+            for counters in self.counters.values():
+                for name, value in counters.items():
+                    totals[name] += value
+            return totals
+
+    def _count(self, processor_name, **increments):
+        with self._lock:
+            counters = self.counters[processor_name]
+            for name, increment in increments.items():
+                counters[name] += increment
+
+    def get_limits(self, processor_name):
+        limits = settings.REFUND_PROCESSOR_LIMITS
+        return limits.get(processor_name, limits['default'])
+
+    def _approve(self, refund, processor_name, limiter):
+        retries = 0
+        while True:
+            try:
+                with limiter.limit():
+                    approved = refund.approve(
+                        revoke_fulfillment=self.revoke_fulfillment, notify_purchaser=self.notify_purchaser
+                    )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to approve refund [%d].', refund.id)
+                return False
+
+            if approved or refund.status not in RETRIABLE_STATUSES or retries >= settings.REFUND_APPROVAL_MAX_RETRIES:
+                return approved
+
+            # Back off exponentially, as failures are most likely due to the LMS being overloaded.
+            time.sleep(settings.REFUND_APPROVAL_RETRY_DELAY * 2 ** retries)
+            retries += 1
+            self._count(processor_name, retried=1)
+            logger.info('Retrying the approval of refund [%d], with status [%s].', refund.id, refund.status)
+
+    def _run(self, processor_name, refunds, limiter):
+        while True:
+            try:
+                refund = refunds.get_nowait()
+            except queue.Empty:
+                break
+
+            approved = self._approve(refund, processor_name, limiter)
+            self._count(processor_name, pending=-1, **{'approved' if approved else 'failed': 1})
+
+    def _run_thread(self, processor_name, refunds, limiter):
+        try:
+            self._run(processor_name, refunds, limiter)
+        finally:
+            # Each thread opens its own database connections.
+            connections.close_all()
+
+    def start(self, refunds):
+        """
+        Start approving the given refunds.
+
+        Each processor gets as many threads as its concurrency limit allows, which wait for the approvals of other
+        RefundApprovers to free a slot if need be. If ``settings.REFUND_APPROVAL_THREADED``
+        is False, the refunds are approved in the current thread instead, before returning.
+        """
+        processor_names = get_processor_names(refunds)
+        refunds_by_processor = defaultdict(queue.Queue)
+        for refund in refunds:
+            refunds_by_processor[processor_names[refund.id]].put(refund)
+
+        for processor_name, processor_refunds in refunds_by_processor.items():
+            limits = self.get_limits(processor_name)
+            limiter = ProcessorLimiter(processor_name, limits['concurrency'], limits['rate'])
+            self._count(processor_name, pending=processor_refunds.qsize())
+            logger.info('Approving [%d] refunds issued by [%s], with [%d] threads.',
+                        processor_refunds.qsize(), processor_name, limits['concurrency'])
+
+            if not settings.REFUND_APPROVAL_THREADED:
+                self._run(processor_name, processor_refunds, limiter)
+                continue
+
+            for index in range(min(limits['concurrency'], processor_refunds.qsize())):
+                thread = threading.Thread(
+                    target=self._run_thread,
+                    args=(processor_name, processor_refunds, limiter),
+                    name='refund-approver-{}-{}'.format(processor_name, index)
+                )
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def join(self, timeout=None):
+        """
+        Block until all refunds have been processed, or until the timeout, in seconds, expires.
+
+        Returns:
+            bool: True if all refunds have been processed.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(deadline - time.time(), 0))
+            if thread.is_alive():
+                return False
+        return True
+
+    def approve(self, refunds):
+        """
+        Approve the given refunds, and block until all of them have been processed.
+
+        Returns:
+            int: Number of approved refunds.
+        """
+        self.start(refunds)
+        self.join()
+        return self.progress['approved']
@@ -0,0 +1,21 @@
+import logging
+
+from celery import shared_task
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.refund.processing import RefundApprover
+
+logger = logging.getLogger(__name__)
+
+Refund = get_model('refund', 'Refund')
+
+
+@shared_task
+def approve_refunds(refund_ids, revoke_fulfillment=True, notify_purchaser=True):
+    """ Approve the given refunds, issuing their credit and revoking their fulfillment, with a RefundApprover. """
+    refunds = list(Refund.objects.filter(id__in=refund_ids).select_related('order', 'user').order_by('id'))
+    approver = RefundApprover(revoke_fulfillment=revoke_fulfillment, notify_purchaser=notify_purchaser)
+    approved = approver.approve(refunds)
+
+    logger.info('Approved [%d] of [%d] refunds.', approved, len(refund_ids))
+    return approved
@@ -1,10 +1,19 @@
 import ddt
+import mock
 from django.test import override_settings
 from oscar.core.loading import get_model
 from oscar.test.newfactories import UserFactory
 
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
+from ecommerce.extensions.refund.api import (
+    create_refunds,
+    create_refunds_for_course,
+    find_orders_associated_with_course,
+    find_unrefunded_course_lines,
+    queue_refund_approvals
+)
+from ecommerce.extensions.refund.status import REFUND_LINE
 from ecommerce.extensions.refund.tests.factories import RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.testcases import TestCase
@@ -12,6 +21,8 @@ from ecommerce.tests.testcases import TestCase
 ProductAttribute = get_model("catalogue", "ProductAttribute")
 ProductClass = get_model("catalogue", "ProductClass")
 Refund = get_model('refund', 'Refund')
+Source = get_model('payment', 'Source')
+SourceType = get_model('payment', 'SourceType')
 
 OSCAR_INITIAL_REFUND_STATUS = 'REFUND_OPEN'
 OSCAR_INITIAL_REFUND_LINE_STATUS = 'REFUND_LINE_OPEN'
@@ -77,3 +88,77 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+
+@ddt.ddt
+class CourseRefundsTests(RefundTestMixin, TestCase):
+    def setUp(self):
+        super(CourseRefundsTests, self).setUp()
+        self.user = UserFactory()
+        self.orders = [self.create_order(user=UserFactory()) for __ in range(3)]
+
+    def test_find_unrefunded_course_lines(self):
+        """ The lines of complete course orders should be returned, unless they have a refund which was not denied. """
+        refunded_order, denied_order, order = self.orders
+        RefundLineFactory(order_line=refunded_order.lines.first())
+        RefundLineFactory(order_line=denied_order.lines.first(), status=REFUND_LINE.DENIED)
+        self.create_order(status=ORDER.OPEN)
+
+        lines = find_unrefunded_course_lines(self.course.id)
+        self.assertEqual(set(lines), {denied_order.lines.first(), order.lines.first()})
+
+        lines = find_unrefunded_course_lines(self.course.id, usernames=[order.user.username])
+        self.assertEqual(list(lines), [order.lines.first()])
+
+    @ddt.data('', ' ', None)
+    def test_find_unrefunded_course_lines_invalid_course_id(self, course_id):
+        """ ValueError should be raised if course_id is invalid. """
+        self.assertRaises(ValueError, find_unrefunded_course_lines, course_id)
+
+    @ddt.data(1, 2, 10)
+    def test_create_refunds_for_course(self, batch_size):
+        """ A refund should be created for each order, whatever the size of the batches. """
+        multiple_lines_order = self.create_order(user=UserFactory(), multiple_lines=True)
+        orders = self.orders + [multiple_lines_order]
+
+        refunds = create_refunds_for_course(self.course.id, batch_size=batch_size)
+
+        self.assertEqual(refunds, list(Refund.objects.order_by('id')))
+        self.assertEqual([refund.order for refund in refunds], orders)
+        for refund, order in zip(refunds, orders):
+            self.assert_refund_matches_order(refund, order)
+
+        # A second call should result in no additional refunds being created
+        self.assertEqual(create_refunds_for_course(self.course.id, batch_size=batch_size), [])
+
+    def test_create_refunds_for_course_usernames(self):
+        """ Only the orders of the given users should be refunded. """
+        order = self.orders[1]
+        refunds = create_refunds_for_course(self.course.id, usernames=[order.user.username])
+        self.assertEqual([refund.order for refund in refunds], [order])
+
+    def test_queue_refund_approvals(self):
+        """ Refunds should be approved by processor, and free refunds should always be approved. """
+        source_type, __ = SourceType.objects.get_or_create(name=DummyProcessor.NAME)
+        for order in self.orders:
+            Source.objects.create(source_type=source_type, order=order, currency=order.currency,
+                                  amount_allocated=order.total_incl_tax, amount_debited=order.total_incl_tax)
+        free_order = self.create_order(user=UserFactory(), free=True)
+        refunds = create_refunds_for_course(self.course.id)
+        paid_ids = [refund.id for refund in refunds if refund.order != free_order]
+        free_ids = [refund.id for refund in refunds if refund.order == free_order]
+
+        with mock.patch('ecommerce.extensions.refund.api.transaction.on_commit', side_effect=lambda func: func()):
+            with mock.patch('ecommerce.extensions.refund.api.approve_refunds.delay') as mock_delay:
+                queue_refund_approvals(refunds)
+                mock_delay.assert_called_once_with(free_ids, notify_purchaser=False)
+
+            with override_settings(REFUND_APPROVAL_BATCH_SIZE=2):
+                with mock.patch('ecommerce.extensions.refund.api.approve_refunds.delay') as mock_delay:
+                    queue_refund_approvals(refunds, approve=True)
+                    mock_delay.assert_has_calls([
+                        mock.call(free_ids, notify_purchaser=False),
+                        mock.call(paid_ids[:2], notify_purchaser=True),
+                        mock.call(paid_ids[2:], notify_purchaser=True),
+                    ], any_order=True)
+                    self.assertEqual(mock_delay.call_count, 3)
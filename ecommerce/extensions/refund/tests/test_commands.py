@@ -0,0 +1,93 @@
+from StringIO import StringIO
+
+import mock
+from django.core.management import CommandError, call_command
+from oscar.core.loading import get_model
+from oscar.test.newfactories import UserFactory
+
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+
+
+class CreateCourseRefundsTests(RefundTestMixin, TestCase):
+    command = 'create_course_refunds'
+
+    def setUp(self):
+        super(CreateCourseRefundsTests, self).setUp()
+        self.orders = [self.create_order(user=UserFactory()) for __ in range(3)]
+
+    def test_without_commit(self):
+        """ Verify the command does not create refunds if the commit flag is not set. """
+        out = StringIO()
+        call_command(self.command, course_id=self.course.id, stderr=out)
+
+        self.assertFalse(Refund.objects.exists())
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have refunded [{}] orders.'.format(len(self.orders))
+        self.assertEqual(out.getvalue().strip(), expected)
+
+    def test_with_commit(self):
+        """ Verify the command creates a refund for each order, and reports its throughput. """
+        out = StringIO()
+        call_command(self.command, course_id=self.course.id, batch_size=2, commit=True, stderr=out)
+
+        self.assertEqual([refund.order for refund in Refund.objects.order_by('id')], self.orders)
+        self.assertTrue(out.getvalue().startswith('Created [3] refunds for [3] learners'))
+        self.assertIn('seconds per 1,000 learners', out.getvalue())
+
+    def test_usernames(self):
+        """ Verify the command only refunds the orders of the given learners. """
+        order = self.orders[0]
+        call_command(self.command, course_id=self.course.id, usernames=[order.user.username], commit=True,
+                     stderr=StringIO())
+
+        self.assertEqual([refund.order for refund in Refund.objects.all()], [order])
+
+    def test_invalid_course_id(self):
+        """ Verify an error is raised if the course ID is invalid. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, course_id=' ', commit=True)
+
+
+class ApproveRefundsTests(RefundTestMixin, TestCase):
+    command = 'approve_refunds'
+
+    def setUp(self):
+        super(ApproveRefundsTests, self).setUp()
+        self.refunds = [self.create_refund() for __ in range(2)]
+
+    def test_without_commit(self):
+        """ Verify the command does not approve refunds if the commit flag is not set. """
+        out = StringIO()
+        call_command(self.command, refund_ids=[refund.id for refund in self.refunds], stderr=out)
+
+        expected = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                   'would have approved [2] refunds.'
+        self.assertEqual(out.getvalue().strip(), expected)
+
+    def test_with_commit(self):
+        """ Verify the command approves the given refunds, and reports its progress and throughput. """
+        out = StringIO()
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=True) as mock_approve:
+            call_command(self.command, refund_ids=[self.refunds[0].id], commit=True, stderr=out)
+
+        mock_approve.assert_called_once_with(self.refunds[0], revoke_fulfillment=True, notify_purchaser=True)
+        self.assertIn('Approved [1], failed [0] and pending [0] refunds, after [0] retries.', out.getvalue())
+        self.assertIn('seconds per 1,000 refunds', out.getvalue())
+
+    def test_course_id(self):
+        """ Verify the command approves the pending refunds of the course. """
+        order = self.create_order(user=UserFactory())
+        refund = Refund.create_with_lines(order, order.lines.all())
+
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=True) as mock_approve:
+            call_command(self.command, course_id=self.course.id, commit=True, stderr=StringIO())
+
+        mock_approve.assert_called_once_with(refund, revoke_fulfillment=True, notify_purchaser=True)
+
+    def test_missing_refunds(self):
+        """ Verify an error is raised if neither a course ID nor refund IDs are given. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, commit=True)
@@ -106,6 +106,41 @@ class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
 
         self.assert_refund_matches_order(refund, order)
 
+    @ddt.data(False, True)
+    def test_bulk_create_with_lines(self, denied):
+        """
+        Refund.bulk_create_with_lines should create a Refund for each order, and only return the refunds it created.
+        Lines refunded while it waited for the lock of their order should be skipped, unless their refund was denied.
+        """
+        orders = [self.create_order(user=UserFactory()) for __ in range(2)]
+        lines = [line for order in orders for line in order.lines.select_related('order')]
+        concurrent_refunds = []
+
+        def lock_orders(order_ids):
+            self.assertEqual(order_ids, [order.id for order in orders])
+            refund = RefundFactory(order=orders[0], user=orders[0].user)
+            if denied:
+                refund.lines.update(status=REFUND_LINE.DENIED)
+            concurrent_refunds.append(refund)
+
+        with mock.patch.object(models, 'lock_orders', side_effect=lock_orders):
+            refunds = Refund.bulk_create_with_lines(lines)
+
+        refunded_orders = orders if denied else orders[1:]
+        self.assertEqual([refund.order for refund in refunds], refunded_orders)
+        self.assertNotIn(concurrent_refunds[0], refunds)
+        for refund, order in zip(refunds, refunded_orders):
+            self.assert_refund_matches_order(refund, order)
+
+    def test_create_with_lines_refunded_while_locking(self):
+        """ Refund.create_with_lines should not refund lines refunded while it waited for the lock of their order. """
+        order = self.create_order(user=UserFactory())
+
+        with mock.patch.object(models, 'lock_orders', side_effect=lambda order_ids: RefundFactory(order=order)):
+            self.assertIsNone(Refund.create_with_lines(order, list(order.lines.all())))
+
+        self.assertEqual(Refund.objects.filter(order=order).count(), 1)
+
     def assert_refund_creation_logged(self, l, refund, order):
         """
         Asserts that refund creation is logged.
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import defaultdict
+
+import mock
+from django.test import override_settings
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.refund.processing import RateLimiter, RefundApprover, Semaphore, get_processor_names
+from ecommerce.extensions.refund.status import REFUND
+from ecommerce.extensions.refund.tests.factories import RefundFactory
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+
+PROCESSOR_LIMITS = {
+    'default': {'concurrency': 1, 'rate': None},
+    'cybersource': {'concurrency': 4, 'rate': None},
+    'paypal': {'concurrency': 2, 'rate': None},
+}
+
+
+class StubProcessors(object):
+    """ Stands in for Refund.approve, taking `latency` seconds as payment processors do, and tracking concurrency. """
+
+    def __init__(self, processor_names, latency=0.05):
+        self.processor_names = processor_names
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.running = defaultdict(int)
+        self.max_running = defaultdict(int)
+
+    def approve(self, refund, **kwargs):  # pylint: disable=unused-argument
+        processor_name = self.processor_names[refund.id]
+        with self.lock:
+            self.running[processor_name] += 1
+            self.max_running[processor_name] = max(self.max_running[processor_name], self.running[processor_name])
+
+        time.sleep(self.latency)
+        refund.status = REFUND.COMPLETE
+
+        with self.lock:
+            self.running[processor_name] -= 1
+        return True
+
+
+class FakeClock(object):
+    """ Stands in for the time module, with a clock only advanced by sleeping. """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterTests(TestCase):
+    def setUp(self):
+        super(RateLimiterTests, self).setUp()
+        self.clock = FakeClock()
+        time_patcher = mock.patch('ecommerce.extensions.refund.processing.time', self.clock)
+        time_patcher.start()
+        self.addCleanup(time_patcher.stop)
+
+    def test_acquire(self):
+        """ Verify calls from all rate limiters sharing the key are limited to the rate. """
+        rate_limiters = [RateLimiter('test', 2), RateLimiter('test', 2)]
+        seconds = []
+        for index in range(5):
+            rate_limiters[index % 2].acquire()
+            seconds.append(int(self.clock.time()))
+        self.assertEqual(seconds, [1000, 1000, 1001, 1001, 1002])
+
+    def test_unlimited(self):
+        """ Verify calls are not delayed without a rate. """
+        rate_limiter = RateLimiter('test', None)
+        for __ in range(100):
+            rate_limiter.acquire()
+        self.assertEqual(self.clock.time(), 1000.0)
+
+
+class SemaphoreTests(TestCase):
+    def test_acquire(self):
+        """ Verify slots are shared by all semaphores with the same key, until released or timed out. """
+        semaphore = Semaphore('test', 2, 60)
+        slots = [semaphore.acquire(), Semaphore('test', 2, 60).acquire()]
+        self.assertEqual(len(set(slots)), 2)
+
+        with mock.patch('ecommerce.extensions.refund.processing.time.sleep', side_effect=RuntimeError):
+            self.assertRaises(RuntimeError, semaphore.acquire)
+
+            semaphore.release(slots[0])
+            self.assertEqual(semaphore.acquire()[0], slots[0][0])
+
+        # Releasing a slot which timed out, and was taken by someone else, leaves it taken.
+        semaphore.release(slots[0])
+        with mock.patch('ecommerce.extensions.refund.processing.time.sleep', side_effect=RuntimeError):
+            self.assertRaises(RuntimeError, semaphore.acquire)
+
+
+@override_settings(REFUND_PROCESSOR_LIMITS=PROCESSOR_LIMITS, REFUND_APPROVAL_MAX_RETRIES=2)
+class RefundApproverTests(RefundTestMixin, TestCase):
+    def test_get_processor_names(self):
+        """ Verify the processor of each refund is returned, and None for refunds of orders without a source. """
+        refund = self.create_refund(processor_name='cybersource')
+        free_refund = RefundFactory()
+        self.assertEqual(get_processor_names([refund, free_refund]), {refund.id: 'cybersource', free_refund.id: None})
+
+    @override_settings(REFUND_APPROVAL_THREADED=True)
+    def test_concurrency(self):
+        """ Verify the refunds of each processor are approved concurrently, within the concurrency limit. """
+        refunds = [self.create_refund(processor_name='cybersource') for __ in range(8)]
+        refunds += [self.create_refund(processor_name='paypal') for __ in range(4)]
+        stub = StubProcessors(get_processor_names(refunds))
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=stub.approve):
+            start = time.time()
+            approver = RefundApprover()
+            self.assertEqual(approver.approve(refunds), len(refunds))
+            elapsed = time.time() - start
+
+        self.assertEqual(dict(stub.max_running), {'cybersource': 4, 'paypal': 2})
+        # Serially, the refunds would take 12 times the latency. The processors each take twice the latency.
+        self.assertLess(elapsed, stub.latency * 6)
+        self.assertEqual(approver.progress, {'pending': 0, 'approved': 12, 'failed': 0, 'retried': 0})
+        self.assertEqual(approver.counters['paypal']['approved'], 4)
+
+    @override_settings(REFUND_APPROVAL_THREADED=True)
+    def test_shared_limits(self):
+        """ Verify the concurrency limit applies to all approvers together, as for concurrent tasks. """
+        refunds = [self.create_refund(processor_name='paypal') for __ in range(8)]
+        stub = StubProcessors(get_processor_names(refunds))
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=stub.approve):
+            approvers = [RefundApprover(), RefundApprover()]
+            approvers[0].start(refunds[:4])
+            approvers[1].start(refunds[4:])
+            for approver in approvers:
+                self.assertTrue(approver.join())
+
+        self.assertEqual(dict(stub.max_running), {'paypal': 2})
+        self.assertEqual(sum(approver.progress['approved'] for approver in approvers), 8)
+
+    @override_settings(REFUND_APPROVAL_THREADED=True)
+    def test_join_timeout(self):
+        """ Verify join returns False while refunds are being approved, and progress can be followed. """
+        refunds = [self.create_refund(processor_name='paypal') for __ in range(4)]
+        stub = StubProcessors(get_processor_names(refunds), latency=0.2)
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=stub.approve):
+            approver = RefundApprover()
+            approver.start(refunds)
+            self.assertFalse(approver.join(0.01))
+            self.assertEqual(approver.progress['pending'], 4)
+            self.assertTrue(approver.join())
+
+        self.assertEqual(approver.progress['approved'], 4)
+
+    def test_retry(self):
+        """ Verify approvals leaving refunds in REVOCATION_ERROR are retried, up to the maximum number of retries. """
+        refund = self.create_refund()
+
+        results = iter([False, False, True])
+
+        def approve(approved_refund, **kwargs):  # pylint: disable=unused-argument
+            approved_refund.status = REFUND.REVOCATION_ERROR
+            return next(results)
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=approve) as mock_approve:
+            approver = RefundApprover()
+            self.assertEqual(approver.approve([refund]), 1)
+
+        self.assertEqual(mock_approve.call_count, 3)
+        self.assertEqual(approver.progress, {'pending': 0, 'approved': 1, 'failed': 0, 'retried': 2})
+
+        refund.status = REFUND.REVOCATION_ERROR
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=False) as mock_approve:
+            approver = RefundApprover()
+            self.assertEqual(approver.approve([refund]), 0)
+
+        self.assertEqual(mock_approve.call_count, 3)
+        self.assertEqual(approver.progress, {'pending': 0, 'approved': 0, 'failed': 1, 'retried': 2})
+
+    def test_no_retry(self):
+        """
+        Verify approvals are not retried if they raise an exception, or leave the refund in another status. In
+        particular, credits which failed are not reissued, as they may have been processed nonetheless.
+        """
+        refund = self.create_refund()
+
+        def fail_credit(approved_refund, **kwargs):  # pylint: disable=unused-argument
+            approved_refund.status = REFUND.PAYMENT_REFUND_ERROR
+            return False
+
+        for side_effect in ([Exception], [False], fail_credit):
+            with mock.patch.object(Refund, 'approve', autospec=True, side_effect=side_effect) as mock_approve:
+                approver = RefundApprover()
+                self.assertEqual(approver.approve([refund]), 0)
+
+            self.assertEqual(mock_approve.call_count, 1)
+            self.assertEqual(approver.progress, {'pending': 0, 'approved': 0, 'failed': 1, 'retried': 0})
+
+    def test_approve(self):
+        """ Verify refunds are approved, and their credit issued. """
+        refund = self.create_refund()
+
+        with override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            approver = RefundApprover(revoke_fulfillment=False, notify_purchaser=False)
+            self.assertEqual(approver.approve([refund]), 1)
+
+        refund.refresh_from_db()
+        self.assertEqual(refund.status, REFUND.COMPLETE)
@@ -0,0 +1,32 @@
+import mock
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.refund.status import REFUND
+from ecommerce.extensions.refund.tasks import approve_refunds
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+
+
+class ApproveRefundsTests(RefundTestMixin, TestCase):
+    def test_approve_refunds(self):
+        """ Verify each refund is approved, and failures do not prevent the approval of the other refunds. """
+        refunds = [self.create_refund() for __ in range(3)]
+        refund_ids = [refund.id for refund in refunds]
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=[True, Exception, False]) as mock_approve:
+            self.assertEqual(approve_refunds(refund_ids, revoke_fulfillment=False, notify_purchaser=False), 1)
+
+        self.assertEqual([call[0][0].id for call in mock_approve.call_args_list], refund_ids)
+        mock_approve.assert_called_with(mock.ANY, revoke_fulfillment=False, notify_purchaser=False)
+
+    def test_approve_refunds_completes_refunds(self):
+        """ Verify the refunds are approved, and their credit issued. """
+        refund = self.create_refund()
+
+        with self.settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            self.assertEqual(approve_refunds([refund.id], revoke_fulfillment=False, notify_purchaser=False), 1)
+
+        refund.refresh_from_db()
+        self.assertEqual(refund.status, REFUND.COMPLETE)
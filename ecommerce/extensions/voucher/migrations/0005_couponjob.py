@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import django.db.models.deletion
+import django_extensions.db.fields
+import jsonfield.fields
+from django.conf import settings
+from django.db import migrations, models
+
+import ecommerce.core.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('sites', '0002_alter_domain_unique'),
+        ('catalogue', '0029_auto_20180119_0903'),
+        ('voucher', '0004_auto_20160517_0930'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('job_type', models.CharField(choices=[('create', 'Create coupon'), ('update', 'Update coupon'), ('report', 'Coupon report')], max_length=32)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Complete', 'Complete'), ('Failed', 'Failed')], default='Pending', max_length=32)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Percentage of the job completed.')),
+                ('data', jsonfield.fields.JSONField(default={})),
+                ('report', models.FileField(blank=True, null=True, storage=ecommerce.core.storage.PrivateFileSystemStorage(), upload_to='coupon_reports')),
+                ('error', models.TextField(blank=True)),
+                ('coupon', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='coupon_jobs', to='catalogue.Product')),
+                ('site', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='sites.Site')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-modified', '-created'),
+                'abstract': False,
+                'get_latest_by': 'modified',
+            },
+        ),
+    ]
@@ -1,9 +1,15 @@
 import datetime
 import logging
 
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+from jsonfield import JSONField
 from oscar.apps.voucher.abstract_models import AbstractVoucher  # pylint: disable=ungrouped-imports
 
+from ecommerce.core.storage import private_storage
 from ecommerce.core.utils import log_message_and_raise_validation_error
 
 logger = logging.getLogger(__name__)
@@ -24,6 +30,78 @@ class OrderLineVouchers(models.Model):
     vouchers = models.ManyToManyField('voucher.Voucher', related_name='order_line_vouchers')
 
 
+class CouponJob(TimeStampedModel):
+    """
+    Background job creating the vouchers of a coupon, updating them or generating the coupon report.
+
+    Jobs are run by the process_coupon_job Celery task. Clients poll the job to follow its progress.
+    The coupon of a failed CREATE job is deleted, and the job kept to report the error.
+    """
+    CREATE = 'create'
+    UPDATE = 'update'
+    REPORT = 'report'
+    JOB_TYPE_CHOICES = (
+        (CREATE, _('Create coupon')),
+        (UPDATE, _('Update coupon')),
+        (REPORT, _('Coupon report')),
+    )
+
+    PENDING = 'Pending'
+    RUNNING = 'Running'
+    COMPLETE = 'Complete'
+    FAILED = 'Failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (COMPLETE, _('Complete')),
+        (FAILED, _('Failed')),
+    )
+
+    job_type = models.CharField(max_length=32, choices=JOB_TYPE_CHOICES)
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING)
+    progress = models.PositiveSmallIntegerField(default=0, help_text=_('Percentage of the job completed.'))
+    coupon = models.ForeignKey(
+        'catalogue.Product', related_name='coupon_jobs', null=True, blank=True, on_delete=models.SET_NULL
+    )
+    site = models.ForeignKey('sites.Site', null=True, blank=True, on_delete=models.SET_NULL)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    # Arguments of the job, e.g. the data used to create or update the vouchers.
+    data = JSONField(default={})
+    # Reports list every voucher code, so they are kept in private storage and served by a staff-only view.
+    report = models.FileField(upload_to='coupon_reports', storage=private_storage, null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    def start(self):
+        self.status = self.RUNNING
+        self.save(update_fields=['status', 'modified'])
+
+    @property
+    def progress_cache_key(self):
+        return 'coupon_job_progress_{}'.format(self.id)
+
+    def get_progress(self):
+        """ Returns the progress of the job, including progress not committed to the database yet. """
+        if self.status == self.RUNNING:
+            return cache.get(self.progress_cache_key, self.progress)
+        return self.progress
+
+    def set_progress(self, progress):
+        self.progress = min(int(progress), 100)
+        self.save(update_fields=['progress', 'modified'])
+        # Jobs may set their progress within a transaction, which hides it from clients until the job completes.
+        cache.set(self.progress_cache_key, self.progress, settings.COUPON_JOB_PROGRESS_CACHE_TIMEOUT)
+
+    def complete(self):
+        self.status = self.COMPLETE
+        self.progress = 100
+        self.save(update_fields=['status', 'progress', 'modified'])
+
+    def fail(self, error):
+        self.status = self.FAILED
+        self.error = error
+        self.save(update_fields=['status', 'error', 'modified'])
+
+
 class Voucher(AbstractVoucher):
     def save(self, *args, **kwargs):
         self.clean()
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+import logging
+import tempfile
+
+import six
+from celery import shared_task
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils.text import slugify
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.catalogue.utils import create_coupon_vouchers
+from ecommerce.extensions.voucher.utils import generate_coupon_report, iter_coupon_report_csv, update_coupon_vouchers
+from ecommerce.invoice.models import Invoice
+
+logger = logging.getLogger(__name__)
+
+Catalog = get_model('catalogue', 'Catalog')
+CouponJob = get_model('voucher', 'CouponJob')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
+Order = get_model('order', 'Order')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+
+
+def _create_coupon(job):
+    """ Create the vouchers of the coupon. """
+    data = dict(job.data)
+    catalog_id = data.pop('catalog', None)
+    quantity = int(data['quantity'])
+
+    def progress_callback(created):
+        # Creating the vouchers takes most of the time of the job, which completes once they are added to the coupon.
+        job.set_progress(min(99, created * 100 // quantity))
+
+    with transaction.atomic():
+        create_coupon_vouchers(
+            job.coupon,
+            catalog=Catalog.objects.get(id=catalog_id) if catalog_id else None,
+            site=job.site,
+            progress_callback=progress_callback,
+            **data
+        )
+
+
+def _update_coupon(job):
+    """ Update the vouchers of the coupon and their offers. """
+    with transaction.atomic():
+        update_coupon_vouchers(job.coupon, progress_callback=job.set_progress, **job.data)
+
+
+def _generate_coupon_report(job):
+    """ Generate the coupon report and store it as the report of the job. """
+    coupon = job.coupon
+    voucher_count = Voucher.objects.filter(coupon_vouchers__coupon=coupon).count()
+    field_names, rows = generate_coupon_report(
+        CouponVouchers.objects.filter(coupon=coupon), stream=True, site=job.site
+    )
+
+    with tempfile.TemporaryFile() as report_file:
+        for index, line in enumerate(iter_coupon_report_csv(field_names, rows)):
+            report_file.write(line)
+            if index and index % settings.COUPON_REPORT_CHUNK_SIZE == 0:
+                # Vouchers redeemed several times have several rows, so this is an estimate.
+                job.set_progress(min(99, index * 100 // voucher_count))
+
+        filename = '{}.csv'.format(slugify('Coupon Report for {}'.format(coupon.title)))
+        job.report.save(filename, File(report_file))
+
+
+def _delete_coupon(coupon):
+    """ Delete a coupon whose vouchers could not be created, along with its order and invoice. """
+    with transaction.atomic():
+        orders = list(Order.objects.filter(lines__product=coupon).distinct())
+        Invoice.objects.filter(order__in=orders).delete()
+        for order in orders:
+            order.delete()
+        Voucher.objects.filter(coupon_vouchers__coupon=coupon).delete()
+        StockRecord.objects.filter(product=coupon).delete()
+        coupon.delete()
+
+
+JOB_HANDLERS = {
+    CouponJob.CREATE: _create_coupon,
+    CouponJob.UPDATE: _update_coupon,
+    CouponJob.REPORT: _generate_coupon_report,
+}
+
+
+@shared_task
+def process_coupon_job(job_id):
+    """ Run a coupon job, and record its progress and outcome on the job. """
+    job = CouponJob.objects.select_related('coupon', 'site').get(id=job_id)
+    coupon_id = job.coupon_id
+    logger.info('Running [%s] job [%d] for coupon [%d].', job.job_type, job.id, coupon_id)
+    job.start()
+
+    try:
+        JOB_HANDLERS[job.job_type](job)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception('Coupon job [%d] failed.', job.id)
+        job.fail(six.text_type(exc))
+
+        if job.job_type == CouponJob.CREATE:
+            # The coupon is useless without its vouchers, and would otherwise be left with an order to invoice.
+            _delete_coupon(job.coupon)
+            logger.info('Deleted coupon [%d], whose vouchers could not be created by job [%d].', coupon_id, job.id)
+        return
+
+    job.complete()
+    logger.info('Completed [%s] job [%d] for coupon [%d].', job.job_type, job.id, coupon_id)
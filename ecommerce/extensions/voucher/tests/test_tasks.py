@@ -0,0 +1,176 @@
+import datetime
+import shutil
+import tempfile
+
+import httpretty
+import mock
+from django.test import override_settings
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.coupons.tests.mixins import CouponMixin
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.catalogue.utils import create_coupon_product
+from ecommerce.extensions.voucher.tasks import process_coupon_job
+from ecommerce.invoice.models import Invoice
+from ecommerce.tests.mixins import LmsApiMockMixin
+from ecommerce.tests.testcases import TestCase
+
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+CouponJob = get_model('voucher', 'CouponJob')
+Order = get_model('order', 'Order')
+Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class ProcessCouponJobTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, TestCase):
+    def setUp(self):
+        super(ProcessCouponJobTests, self).setUp()
+        self.course = CourseFactory()
+        seat = self.course.create_or_update_seat('verified', False, 100, self.partner)
+        self.catalog = Catalog.objects.create(partner=self.partner)
+        self.catalog.stock_records.add(StockRecord.objects.get(product=seat))
+
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def create_job(self, job_type, coupon, data=None):
+        return CouponJob.objects.create(job_type=job_type, coupon=coupon, site=self.site, data=data or {})
+
+    def create_deferred_coupon(self, quantity=3):
+        """ Create a coupon whose vouchers are left to a CREATE job, and the job. """
+        coupon = create_coupon_product(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=100,
+            catalog=self.catalog,
+            catalog_query=None,
+            category=self.category,
+            code='',
+            course_catalog=None,
+            course_seat_types=None,
+            email_domains=None,
+            end_datetime=now() + datetime.timedelta(days=10),
+            enterprise_customer=None,
+            max_uses=None,
+            note=None,
+            partner=self.partner,
+            price=100,
+            quantity=quantity,
+            start_datetime=now() - datetime.timedelta(days=1),
+            title='Deferred coupon',
+            voucher_type=Voucher.SINGLE_USE,
+            program_uuid=None,
+            site=self.site,
+            defer_vouchers=True
+        )
+        self.assertEqual(coupon.attr.coupon_vouchers.vouchers.count(), 0)
+
+        job = self.create_job(CouponJob.CREATE, coupon, data={
+            'benefit_type': Benefit.PERCENTAGE,
+            'benefit_value': 100,
+            'catalog': self.catalog.id,
+            'end_datetime': str(now() + datetime.timedelta(days=10)),
+            'enterprise_customer': None,
+            'name': coupon.title,
+            'quantity': quantity,
+            'start_datetime': str(now() - datetime.timedelta(days=1)),
+            'voucher_type': Voucher.SINGLE_USE,
+        })
+        return coupon, job
+
+    def test_create(self):
+        """ Verify the vouchers of a coupon created without vouchers are created by the job. """
+        coupon, job = self.create_deferred_coupon()
+        process_coupon_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CouponJob.COMPLETE)
+        self.assertEqual(job.progress, 100)
+        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+        self.assertEqual(vouchers.count(), 3)
+        self.assertEqual(vouchers.first().offers.first().benefit.range.catalog, self.catalog)
+
+    @override_settings(VOUCHER_BULK_CREATE_BATCH_SIZE=2)
+    def test_create_progress(self):
+        """ Verify the progress of the job is set as batches of vouchers are created, and visible to clients. """
+        __, job = self.create_deferred_coupon(quantity=5)
+        set_progress = CouponJob.set_progress
+        progress = []
+
+        def record_progress(job_instance, job_progress):
+            set_progress(job_instance, job_progress)
+            # The progress is set within the transaction creating the vouchers, so clients read it from the cache.
+            progress.append(CouponJob.objects.get(id=job_instance.id).get_progress())
+
+        with mock.patch.object(CouponJob, 'set_progress', autospec=True, side_effect=record_progress):
+            process_coupon_job(job.id)
+
+        self.assertEqual(progress, [40, 80, 99])
+
+    def test_update(self):
+        """ Verify the job updates the vouchers of the coupon and replaces their offers. """
+        coupon = self.create_coupon(catalog=self.catalog, quantity=3)
+        job = self.create_job(CouponJob.UPDATE, coupon, data={
+            'voucher_data': {'name': 'Updated'},
+            'benefit_value': 40,
+        })
+        process_coupon_job(job.id)
+
+        self.assertEqual(CouponJob.objects.get(id=job.id).status, CouponJob.COMPLETE)
+        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+        self.assertEqual(set(voucher.name for voucher in vouchers), {'Updated'})
+        self.assertEqual(set(voucher.offers.get().benefit.value for voucher in vouchers), {40})
+
+    @httpretty.activate
+    def test_report(self):
+        """ Verify the job stores the coupon report, without relying on the current request. """
+        self.mock_course_api_response(course=self.course)
+        coupon = self.create_coupon(catalog=self.catalog, quantity=3)
+        job = self.create_job(CouponJob.REPORT, coupon)
+
+        with override_settings(PRIVATE_MEDIA_ROOT=self.media_root):
+            with mock.patch('ecommerce.core.url_utils.get_current_request', return_value=None):
+                process_coupon_job(job.id)
+
+            job.refresh_from_db()
+            self.assertEqual(job.status, CouponJob.COMPLETE)
+            self.assertTrue(job.report.name.endswith('.csv'))
+            # One header line, one coupon line and one line per voucher
+            self.assertEqual(len(job.report.read().splitlines()), 5)
+
+    def test_failure(self):
+        """ Verify failures are recorded on the job. """
+        coupon = self.create_coupon(catalog=self.catalog)
+        job = self.create_job(CouponJob.UPDATE, coupon, data={'voucher_data': {'name': 'Updated'}})
+
+        with mock.patch(
+            'ecommerce.extensions.voucher.tasks.update_coupon_vouchers', side_effect=ValueError('Invalid data')
+        ):
+            process_coupon_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CouponJob.FAILED)
+        self.assertEqual(job.error, 'Invalid data')
+        self.assertEqual(job.coupon, coupon)
+
+    def test_create_failure(self):
+        """ Verify the coupon, its order and invoice are deleted if its vouchers cannot be created. """
+        coupon = self.create_coupon(catalog=self.catalog)
+        order = Order.objects.get(lines__product=coupon)
+        job = self.create_job(CouponJob.CREATE, coupon, data={'quantity': 1})
+
+        with mock.patch(
+            'ecommerce.extensions.voucher.tasks.create_coupon_vouchers', side_effect=ValueError('Invalid data')
+        ):
+            process_coupon_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CouponJob.FAILED)
+        self.assertEqual(job.error, 'Invalid data')
+        self.assertIsNone(job.coupon)
+        self.assertFalse(Product.objects.filter(id=coupon.id).exists())
+        self.assertFalse(Order.objects.filter(id=order.id).exists())
+        self.assertFalse(Invoice.objects.filter(order_id=order.id).exists())
@@ -5,9 +5,11 @@ import uuid
 
 import ddt
 import httpretty
+import mock
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import ugettext_lazy as _
 from factory.fuzzy import FuzzyText
 from oscar.templatetags.currency_filters import currency
@@ -35,6 +37,7 @@ from ecommerce.tests.testcases import TestCase
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -171,6 +174,35 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         voucher.record_usage(order, user)
         voucher.offers.first().record_usage(discount={'freq': 1, 'discount': 1})
 
+    def add_vouchers_to_coupon(self, coupon, quantity):
+        """
+        Bulk create vouchers sharing the offer of the coupon's first voucher.
+
+        Args:
+            coupon (Product): Coupon the vouchers are added to.
+            quantity (int): Number of vouchers to create.
+        """
+        coupon_voucher = coupon.attr.coupon_vouchers
+        voucher = coupon_voucher.vouchers.first()
+        offer = voucher.offers.first()
+        Voucher.objects.bulk_create([
+            Voucher(
+                name=voucher.name,
+                code='BULK{}'.format(index),
+                usage=voucher.usage,
+                start_datetime=voucher.start_datetime,
+                end_datetime=voucher.end_datetime
+            ) for index in range(quantity)
+        ])
+        voucher_ids = Voucher.objects.filter(code__startswith='BULK').values_list('id', flat=True)
+        Voucher.offers.through.objects.bulk_create([
+            Voucher.offers.through(voucher_id=voucher_id, conditionaloffer_id=offer.id) for voucher_id in voucher_ids
+        ])
+        CouponVouchers.vouchers.through.objects.bulk_create([
+            CouponVouchers.vouchers.through(couponvouchers_id=coupon_voucher.id, voucher_id=voucher_id)
+            for voucher_id in voucher_ids
+        ])
+
     def validate_report_of_redeemed_vouchers(self, row, username, order_num):
         """ Helper method for validating coupon report data for when a coupon was redeemed. """
         self.assertEqual(row['Status'], _('Redeemed'))
@@ -261,6 +293,58 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         with self.assertRaises(ValueError):
             create_vouchers(**self.data)
 
+    def test_create_vouchers_code_collisions(self):
+        """ Verify generated codes already in use are replaced by new ones. """
+        existing_code = Voucher.objects.first().code
+        self.data['quantity'] = 2
+        with mock.patch(
+            'ecommerce.extensions.voucher.utils._generate_code_string',
+            side_effect=[existing_code, existing_code, 'NEWCODE1', 'NEWCODE2']
+        ):
+            vouchers = create_vouchers(**self.data)
+
+        self.assertEqual(sorted(voucher.code for voucher in vouchers), ['NEWCODE1', 'NEWCODE2'])
+
+    def test_create_vouchers_in_bulk(self):
+        """
+        Verify 10,000 vouchers are created with a number of queries that depends on the number of batches only,
+        rather than several queries per voucher.
+        """
+        self.data['quantity'] = 10000
+        with CaptureQueriesContext(connection) as context:
+            vouchers = create_vouchers(**self.data)
+
+        self.assertEqual(len(vouchers), 10000)
+        self.assertEqual(len(set(voucher.code for voucher in vouchers)), 10000)
+        self.assertEqual(
+            Voucher.offers.through.objects.filter(voucher_id__in=[voucher.id for voucher in vouchers[:500]]).count(),
+            500
+        )
+        self.assertLess(len(context.captured_queries), 250)
+
+    def test_create_multi_use_vouchers_in_bulk(self):
+        """
+        Verify each multi-use voucher gets its own offer, and that the offers are created with a number of queries
+        that depends on the number of batches only.
+        """
+        self.data.update({'quantity': 1000, 'voucher_type': Voucher.MULTI_USE, 'max_uses': 2})
+        with CaptureQueriesContext(connection) as context:
+            vouchers = create_vouchers(**self.data)
+
+        offers = ConditionalOffer.objects.filter(vouchers__in=vouchers).distinct()
+        self.assertEqual(offers.count(), 1000)
+        self.assertEqual(len(set(offers.values_list('slug', flat=True))), 1000)
+        self.assertEqual(set(offers.values_list('max_global_applications', flat=True)), {2})
+        self.assertEqual(offers.values('benefit_id', 'condition_id').distinct().count(), 1)
+        self.assertLess(len(context.captured_queries), 50)
+
+        # Vouchers of another coupon with the same benefit get offers of their own.
+        self.data.update({'coupon': self.create_coupon(), 'quantity': 2})
+        other_vouchers = create_vouchers(**self.data)
+        self.assertFalse(
+            ConditionalOffer.objects.filter(vouchers__in=other_vouchers).filter(vouchers__in=vouchers).exists()
+        )
+
     def test_create_discount_coupon(self):
         """
         Test discount voucher creation with specified code
@@ -684,3 +768,37 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
 
         self.assertIn('Program UUID', field_names)
         self.assertEqual(rows[0]['Program UUID'], program_uuid)
+
+    @ddt.data(1000, 10000)
+    def test_generate_coupon_report_query_count(self, quantity):
+        """ Verify the number of queries needed to generate the report does not depend on the number of vouchers. """
+        coupon = self.create_coupon(title='Bulk coupon', catalog=self.catalog, quantity=2)
+        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+        self.use_voucher('TESTORDER1', vouchers[0], self.user)
+        self.use_voucher('TESTORDER2', vouchers[1], UserFactory())
+
+        with CaptureQueriesContext(connection) as baseline:
+            __, rows = generate_coupon_report([coupon.attr.coupon_vouchers])
+        self.assertEqual(len(rows), 5)
+
+        self.add_vouchers_to_coupon(coupon, quantity)
+        with CaptureQueriesContext(connection) as context:
+            __, rows = generate_coupon_report([coupon.attr.coupon_vouchers])
+
+        self.assertEqual(len(rows), quantity + 5)
+        self.assertEqual(len(context.captured_queries), len(baseline.captured_queries))
+
+    @override_settings(COUPON_REPORT_CHUNK_SIZE=2)
+    def test_generate_coupon_report_stream(self):
+        """ Verify the streamed report, read in chunks of vouchers, contains the same rows as the regular report. """
+        coupon = self.create_coupon(title='Streamed coupon', catalog=self.catalog, quantity=5)
+        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+        self.use_voucher('TESTORDER1', vouchers[1], self.user)
+        self.use_voucher('TESTORDER2', vouchers[4], self.user)
+
+        field_names, rows = generate_coupon_report([coupon.attr.coupon_vouchers])
+        stream_field_names, stream_rows = generate_coupon_report([coupon.attr.coupon_vouchers], stream=True)
+
+        self.assertFalse(isinstance(stream_rows, list))
+        self.assertEqual(stream_field_names, field_names)
+        self.assertEqual(list(stream_rows), rows)
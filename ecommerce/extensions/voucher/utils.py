@@ -1,9 +1,11 @@
 """Voucher Utility Methods. """
 import base64
+import csv
 import datetime
 import hashlib
 import logging
 import uuid
+from collections import defaultdict
 from decimal import Decimal, DecimalException
 
 import dateutil.parser
@@ -11,9 +13,11 @@ import pytz
 from django.conf import settings
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import transaction
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
+from oscar.core.utils import slugify
 from oscar.templatetags.currency_filters import currency
 
 from ecommerce.core.url_utils import get_ecommerce_url
@@ -33,6 +37,7 @@ Benefit = get_model('offer', 'Benefit')
 Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
@@ -166,11 +171,11 @@ def _get_info_for_coupon_report(coupon, voucher):
     return coupon_data
 
 
-def _get_voucher_info_for_coupon_report(voucher):
-    offer = voucher.offers.first()
+def _get_voucher_info_for_coupon_report(voucher, offer=None, offer_url=None):
+    offer = offer or voucher.offers.first()
     status = _get_voucher_status(voucher, offer)
-    path = '{path}?code={code}'.format(path=reverse('coupons:offer'), code=voucher.code)
-    url = get_ecommerce_url(path)
+    offer_url = offer_url or get_ecommerce_url(reverse('coupons:offer'))
+    url = '{offer_url}?code={code}'.format(offer_url=offer_url, code=voucher.code)
 
     # Set the max_uses_count for single-use vouchers to 1,
     # for other usage limitations (once per customer and multi-use)
@@ -197,16 +202,180 @@ def _get_voucher_info_for_coupon_report(voucher):
     return coupon_data
 
 
-def generate_coupon_report(coupon_vouchers):
+def _get_offers_by_voucher(vouchers):
+    """
+    Retrieve the first offer of every voucher in a single query.
+
+    Arguments:
+        vouchers (QuerySet): Vouchers the offers should be retrieved for.
+
+    Returns:
+        dict: Voucher ID to ConditionalOffer mapping.
+    """
+    offers = {}
+    voucher_offers = Voucher.offers.through.objects.filter(
+        voucher__in=vouchers
+    ).select_related('conditionaloffer').order_by('conditionaloffer_id')
+
+    # Mirror voucher.offers.first(), which returns the offer with the lowest ID.
+    for voucher_offer in voucher_offers:
+        offers.setdefault(voucher_offer.voucher_id, voucher_offer.conditionaloffer)
+
+    return offers
+
+
+def _get_applications_by_voucher(vouchers):
+    """
+    Retrieve the applications, with their users and orders, of every voucher in a single query.
+
+    Arguments:
+        vouchers (QuerySet): Vouchers the applications should be retrieved for.
+
+    Returns:
+        dict: Voucher ID to list of VoucherApplication mapping.
+    """
+    applications = defaultdict(list)
+    voucher_applications = VoucherApplication.objects.filter(
+        voucher__in=vouchers
+    ).select_related('user', 'order').order_by('id')
+
+    for application in voucher_applications:
+        applications[application.voucher_id].append(application)
+
+    return applications
+
+
+def _get_course_ids_by_order(vouchers):
+    """
+    Retrieve the course IDs of the lines of every order the vouchers were redeemed on in a single query.
+
+    Arguments:
+        vouchers (QuerySet): Vouchers whose redemption orders should be inspected.
+
+    Returns:
+        dict: Order ID to list of course IDs mapping.
+    """
+    course_ids = defaultdict(list)
+    orders = VoucherApplication.objects.filter(voucher__in=vouchers).values('order')
+    lines = Line.objects.filter(order__in=orders).order_by('id').values_list('order_id', 'product__course')
+
+    for order_id, course_id in lines:
+        course_ids[order_id].append(course_id)
+
+    return course_ids
+
+
+def _get_voucher_rows_for_coupon_report(vouchers, header_row, offer_url):
+    """
+    Generate the report rows for the given vouchers.
+
+    The vouchers, their offers, applications and the lines of the redemption orders are
+    loaded with a fixed number of queries and joined in memory, so the number of queries
+    does not depend on the number of vouchers.
+
+    Arguments:
+        vouchers (QuerySet): Vouchers the rows should be generated for.
+        header_row (dict): The coupon level row of the report.
+        offer_url (str): URL of the coupon offer landing page.
+
+    Yields:
+        dict
+    """
+    offers = _get_offers_by_voucher(vouchers)
+    applications = _get_applications_by_voucher(vouchers)
+    course_ids = _get_course_ids_by_order(vouchers)
+
+    for voucher in vouchers.order_by('id').iterator():
+        row = _get_voucher_info_for_coupon_report(voucher, offers[voucher.id], offer_url)
+
+        for item in ('Order Number', 'Redeemed By Username',):
+            row[item] = ''
+
+        yield row
+
+        if voucher.num_orders > 0:
+            for application in applications[voucher.id]:
+                new_row = row.copy()
+                _add_redemption_course_ids(new_row, header_row, course_ids[application.order_id])
+                new_row.update({
+                    'Status': _('Redeemed'),
+                    'Order Number': application.order.number,
+                    'Redeemed By Username': application.user.username,
+                    'Maximum Coupon Usage': 1,
+                    'Redemption Count': 1,
+                })
+                yield new_row
+
+
+def _iter_voucher_chunks(vouchers, chunk_size):
+    """
+    Split the vouchers into querysets of at most chunk_size vouchers using keyset pagination on the voucher ID.
+
+    Arguments:
+        vouchers (QuerySet): Vouchers to split.
+        chunk_size (int): Maximum number of vouchers per chunk.
+
+    Yields:
+        QuerySet
+    """
+    last_id = 0
+    while True:
+        chunk = vouchers.filter(id__gt=last_id)
+        upper_ids = list(chunk.order_by('id').values_list('id', flat=True)[chunk_size - 1:chunk_size])
+        if not upper_ids:
+            # The remaining vouchers, if any, fit in the last chunk.
+            yield chunk
+            return
+
+        yield chunk.filter(id__lte=upper_ids[0])
+        last_id = upper_ids[0]
+
+
+def _get_coupon_header_row(coupon_voucher):
+    coupon = coupon_voucher.coupon
+    header_row = _get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first())
+    header_row['Client'] = Invoice.objects.get(order__lines__product=coupon).business_client.name
+    return header_row
+
+
+def _iter_coupon_report_rows(coupon_vouchers, first_header_row, offer_url, chunk_size):
+    """
+    Generate the report rows of all coupon vouchers.
+
+    Arguments:
+        coupon_vouchers (List[CouponVouchers]): Coupon vouchers the rows should be generated for.
+        first_header_row (dict): Already generated header row of the first coupon voucher.
+        offer_url (str): URL of the coupon offer landing page.
+        chunk_size (int): Number of vouchers loaded at a time. All vouchers are loaded at once if None.
+
+    Yields:
+        dict
+    """
+    for index, coupon_voucher in enumerate(coupon_vouchers):
+        yield first_header_row if index == 0 else _get_coupon_header_row(coupon_voucher)
+
+        vouchers = coupon_voucher.vouchers.all()
+        chunks = _iter_voucher_chunks(vouchers, chunk_size) if chunk_size else [vouchers]
+        for chunk in chunks:
+            for row in _get_voucher_rows_for_coupon_report(chunk, first_header_row, offer_url):
+                yield row
+
+
+def generate_coupon_report(coupon_vouchers, stream=False, site=None):
     """
     Generate coupon report data
 
     Args:
         coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
 
+    Kwargs:
+        stream (bool): If True, the rows are returned as a generator that reads the vouchers in
+                       chunks of COUPON_REPORT_CHUNK_SIZE instead of as a list.
+        site (Site): Site the report is generated for. Defaults to the site of the current request.
+
     Returns:
         List[str]
-        List[dict]
+        List[dict] or generator of dict if stream is True
     """
 
     field_names = [
@@ -238,51 +407,16 @@ def generate_coupon_report(coupon_vouchers):
         _('Coupon Expiry Date'),
         _('Email Domains'),
     ]
-    rows = []
-
-    for coupon_voucher in coupon_vouchers:
-        coupon = coupon_voucher.coupon
-        client = Invoice.objects.get(order__lines__product=coupon).business_client.name
-        rows.append(_get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first()))
-        rows[0]['Client'] = client
+    coupon_vouchers = list(coupon_vouchers)
+    header_row = _get_coupon_header_row(coupon_vouchers[0])
 
-        for voucher in coupon_voucher.vouchers.all().prefetch_related('offers'):
-            row = _get_voucher_info_for_coupon_report(voucher)
-
-            for item in ('Order Number', 'Redeemed By Username',):
-                row[item] = ''
-
-            rows.append(row)
-
-            if voucher.num_orders > 0:
-                voucher_applications = VoucherApplication.objects.filter(
-                    voucher=voucher).prefetch_related('user', 'order__lines')
-
-                for application in voucher_applications:
-                    redemption_course_ids = []
-                    redemption_user_username = application.user.username
-
-                    for line in application.order.lines.all():
-                        redemption_course_ids.append(line.product.course_id)
-
-                    new_row = row.copy()
-                    _add_redemption_course_ids(new_row, rows[0], redemption_course_ids)
-                    new_row.update({
-                        'Status': _('Redeemed'),
-                        'Order Number': application.order.number,
-                        'Redeemed By Username': redemption_user_username,
-                        'Maximum Coupon Usage': 1,
-                        'Redemption Count': 1,
-                    })
-                    rows.append(new_row)
-
-    if 'Program UUID' in rows[0]:
+    if 'Program UUID' in header_row:
         field_names.remove('Course ID')
         field_names.remove('Organization')
         field_names.remove('Catalog Query')
         field_names.remove('Course Seat Types')
         field_names.remove('Redeemed For Course ID')
-    elif 'Catalog Query' in rows[0]:
+    elif 'Catalog Query' in header_row:
         field_names.remove('Course ID')
         field_names.remove('Organization')
         field_names.remove('Program UUID')
@@ -293,18 +427,50 @@ def generate_coupon_report(coupon_vouchers):
         field_names.remove('Redeemed For Course IDs')
         field_names.remove('Program UUID')
 
+    # Resolved up front since streamed rows are generated after the request has been processed.
+    if site:
+        offer_url = site.siteconfiguration.build_ecommerce_url(reverse('coupons:offer'))
+    else:
+        offer_url = get_ecommerce_url(reverse('coupons:offer'))
+    if stream:
+        rows = _iter_coupon_report_rows(coupon_vouchers, header_row, offer_url, settings.COUPON_REPORT_CHUNK_SIZE)
+    else:
+        rows = list(_iter_coupon_report_rows(coupon_vouchers, header_row, offer_url, None))
+
     return field_names, rows
 
 
-def _get_or_create_offer(
-        product_range, benefit_type, benefit_value, coupon_id=None,
-        max_uses=None, offer_number=None, email_domains=None, program_uuid=None, site=None
-):
+class Echo(object):
+    """ File-like object that returns the written value instead of buffering it. """
+
+    def write(self, value):
+        return value
+
+
+def iter_coupon_report_csv(field_names, rows):
     """
-    Return an offer for a catalog with condition and benefit.
+    Yield the CSV lines of a coupon report as the rows are generated.
 
-    If offer doesn't exist, new offer will be created and associated with
-    provided Offer condition and benefit.
+    Args:
+        field_names (List[str]): Field names of the report, as returned by generate_coupon_report.
+        rows (Iterable[dict]): Rows of the report, as returned by generate_coupon_report.
+
+    Yields:
+        str
+    """
+    writer = csv.DictWriter(Echo(), fieldnames=field_names)
+    yield writer.writerow(dict(zip(field_names, field_names)))
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(value, unicode):
+                row[key] = value.encode('utf-8')
+        yield writer.writerow(row)
+
+
+def _get_or_create_condition_and_benefit(product_range, benefit_type, benefit_value, coupon_id=None,
+                                         program_uuid=None):
+    """
+    Return the condition and benefit of the offers of a coupon, and the name of its offers.
 
     Args:
         product_range (Range): Range of products associated with condition
@@ -312,18 +478,11 @@ def _get_or_create_offer(
         benefit_value (Decimal): Value of benefit associated with the offer
     Kwargs:
         coupon_id (int): ID of the coupon
-        max_uses (int): number of maximum global application number an offer can have
-        offer_number (int): number of the consecutive offer - used in case of a multiple
-                            multi-use coupon
-        email_domains (str): a comma-separated string of email domains allowed to apply
-                            this offer
         program_uuid (str): the Program UUID
-        site (site): Site for which the Coupon is created. Defaults to None.
 
     Returns:
-        Offer
+        tuple: (Condition, Benefit, str)
     """
-
     if program_uuid:
         try:
             offer_condition = ProgramCourseRunSeatsCondition.objects.get(program_uuid=program_uuid)
@@ -361,6 +520,40 @@ def _get_or_create_offer(
             'Failed to create Benefit. Benefit value must be a positive number or 0.'
         )
 
+    return offer_condition, offer_benefit, offer_name
+
+
+def _get_or_create_offer(
+        product_range, benefit_type, benefit_value, coupon_id=None,
+        max_uses=None, offer_number=None, email_domains=None, program_uuid=None, site=None
+):
+    """
+    Return an offer for a catalog with condition and benefit.
+
+    If offer doesn't exist, new offer will be created and associated with
+    provided Offer condition and benefit.
+
+    Args:
+        product_range (Range): Range of products associated with condition
+        benefit_type (str): Type of benefit associated with the offer
+        benefit_value (Decimal): Value of benefit associated with the offer
+    Kwargs:
+        coupon_id (int): ID of the coupon
+        max_uses (int): number of maximum global application number an offer can have
+        offer_number (int): number of the consecutive offer - used in case of a multiple
+                            multi-use coupon
+        email_domains (str): a comma-separated string of email domains allowed to apply
+                            this offer
+        program_uuid (str): the Program UUID
+        site (site): Site for which the Coupon is created. Defaults to None.
+
+    Returns:
+        Offer
+    """
+    offer_condition, offer_benefit, offer_name = _get_or_create_condition_and_benefit(
+        product_range, benefit_type, benefit_value, coupon_id=coupon_id, program_uuid=program_uuid
+    )
+
     if offer_number:
         offer_name = "{} [{}]".format(offer_name, offer_number)
 
@@ -378,6 +571,90 @@ def _get_or_create_offer(
     return offer
 
 
+def _get_or_create_offers(
+        product_range, benefit_type, benefit_value, quantity, coupon_id=None,
+        max_uses=None, email_domains=None, program_uuid=None, site=None
+):
+    """
+    Return numbered offers sharing one condition and benefit, one for each voucher of a multi-use coupon.
+
+    Offers which do not exist yet are inserted in bulk, so that the number of queries depends on
+    the number of batches rather than the number of offers.
+
+    Args:
+        product_range (Range): Range of products associated with condition
+        benefit_type (str): Type of benefit associated with the offers
+        benefit_value (Decimal): Value of benefit associated with the offers
+        quantity (int): Number of offers
+    Kwargs:
+        coupon_id (int): ID of the coupon
+        max_uses (int): number of maximum global application number each offer can have
+        email_domains (str): a comma-separated string of email domains allowed to apply
+                            the offers
+        program_uuid (str): the Program UUID
+        site (site): Site for which the Coupon is created. Defaults to None.
+
+    Returns:
+        List[Offer]
+    """
+    offer_condition, offer_benefit, offer_name = _get_or_create_condition_and_benefit(
+        product_range, benefit_type, benefit_value, coupon_id=coupon_id, program_uuid=program_uuid
+    )
+    # The first offer is not numbered, like the offer of a coupon with a single voucher.
+    names = [offer_name] + ["{} [{}]".format(offer_name, number) for number in range(1, quantity)]
+    offer_fields = {
+        'offer_type': ConditionalOffer.VOUCHER,
+        'condition': offer_condition,
+        'benefit': offer_benefit,
+        'max_global_applications': max_uses,
+        'email_domains': email_domains,
+        'site': site,
+        'priority': OFFER_PRIORITY_VOUCHER,
+    }
+    batch_size = settings.VOUCHER_BULK_CREATE_BATCH_SIZE
+
+    def get_offers_by_name(offer_names):
+        offers_by_name = {}
+        for index in range(0, len(offer_names), batch_size):
+            offers = ConditionalOffer.objects.filter(name__in=offer_names[index:index + batch_size], **offer_fields)
+            offers_by_name.update((offer.name, offer) for offer in offers)
+        return offers_by_name
+
+    offers_by_name = get_offers_by_name(names)
+    missing_names = [(number, name) for number, name in enumerate(names) if name not in offers_by_name]
+
+    if missing_names:
+        # The slugs are set here, as the slug field would otherwise look up each slug to make it unique.
+        # The number of the offer is kept at the end of its slug, even if the name is truncated.
+        max_length = ConditionalOffer._meta.get_field('slug').max_length
+        base_slug = slugify(offer_name)[:max_length - len('-{}'.format(quantity))].strip('-')
+        slugs = {number: '{}-{}'.format(base_slug, number) if number else base_slug for number, __ in missing_names}
+        slug_list = list(slugs.values())
+        slugs_in_use = set()
+        for index in range(0, len(slug_list), batch_size):
+            slugs_in_use.update(
+                ConditionalOffer.objects.filter(slug__in=slug_list[index:index + batch_size]).values_list(
+                    'slug', flat=True
+                )
+            )
+
+        new_offers = []
+        for number, name in missing_names:
+            slug = slugs[number]
+            if slug in slugs_in_use:
+                slug = '{}-{}'.format(base_slug[:max_length - 33], uuid.uuid4().hex)
+            offer = ConditionalOffer(name=name, slug=slug, **offer_fields)
+            # bulk_create does not call ConditionalOffer.save, which is where offers are validated.
+            offer.clean()
+            new_offers.append(offer)
+
+        ConditionalOffer.objects.bulk_create(new_offers, batch_size=batch_size)
+        # Not all databases return the primary keys of rows inserted by bulk_create, so the offers are read back.
+        offers_by_name.update(get_offers_by_name([name for __, name in missing_names]))
+
+    return [offers_by_name[name] for name in names]
+
+
 def _generate_code_string(length):
     """
     Create a string of random characters of specified length
@@ -385,44 +662,70 @@ def _generate_code_string(length):
     Args:
         length (int): Defines the length of randomly generated string.
 
+    Returns:
+        str
+    """
+    h = hashlib.sha256()
+    h.update(uuid.uuid4().get_bytes())
+    return base64.b32encode(h.digest())[0:length]
+
+
+def _generate_code_strings(length, quantity):
+    """
+    Create unique voucher codes of specified length.
+
+    Candidate codes are generated in batches of VOUCHER_BULK_CREATE_BATCH_SIZE, and checked
+    against existing vouchers with a single query per batch. Candidates already in use are
+    replaced by new ones in the following batch.
+
+    Args:
+        length (int): Defines the length of randomly generated codes.
+        quantity (int): Number of codes to generate.
+
     Raises:
         ValueError raised if length is less than one.
 
     Returns:
-        str
+        list
     """
     if length < 1:
         raise ValueError("Voucher code length must be a positive number.")
 
-    h = hashlib.sha256()
-    h.update(uuid.uuid4().get_bytes())
-    voucher_code = base64.b32encode(h.digest())[0:length]
-    if Voucher.objects.filter(code__iexact=voucher_code).exists():
-        return _generate_code_string(length)
+    codes = set()
+    while len(codes) < quantity:
+        batch_size = min(quantity - len(codes), settings.VOUCHER_BULK_CREATE_BATCH_SIZE)
+        candidates = set(_generate_code_string(length) for __ in range(batch_size)) - codes
+        existing_codes = Voucher.objects.filter(code__in=candidates).values_list('code', flat=True)
+        codes.update(candidates.difference(existing_codes))
 
-    return voucher_code
+    return list(codes)
 
 
-def _create_new_voucher(code, end_datetime, name, offer, start_datetime, voucher_type):
+def _create_new_vouchers(code, end_datetime, name, offers, quantity, start_datetime, voucher_type,
+                         progress_callback=None):
     """
-    Creates a voucher.
+    Creates vouchers.
 
-    If randomly generated voucher code already exists, new code will be generated and reverified.
+    Vouchers and their relations to offers are inserted in bulk, so that the number of queries
+    depends on the number of batches rather than the number of vouchers.
 
     Args:
-        code (str): Code associated with vouchers. If not provided, one will be generated.
+        code (str): Code associated with vouchers. If not provided, unique codes will be generated.
         end_datetime (datetime): Voucher end date.
         name (str): Voucher name.
-        offer (Offer): Offer associated with voucher.
+        offers (list): Offers associated with vouchers. Either one offer shared by all vouchers,
+            or one offer for each voucher.
+        quantity (int): Number of vouchers to be created.
         start_datetime (datetime): Voucher start date.
         voucher_type (str): Voucher usage.
+        progress_callback (callable): Called with the number of vouchers created so far, after each batch.
 
     Returns:
-        Voucher
+        List[Voucher]
     """
-    if offer.benefit.type == Benefit.PERCENTAGE and offer.benefit.value == 100 and code:
+    benefit = offers[0].benefit
+    if benefit.type == Benefit.PERCENTAGE and benefit.value == 100 and code:
         log_message_and_raise_validation_error('Failed to create Voucher. Code may not be set for enrollment coupon.')
-    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
 
     if not end_datetime:
         log_message_and_raise_validation_error('Failed to create Voucher. Voucher end datetime field must be set.')
@@ -444,16 +747,45 @@ def _create_new_voucher(code, end_datetime, name, offer, start_datetime, voucher
                 'Failed to create Voucher. Voucher start datetime [{date}] is invalid.'.format(date=start_datetime)
             )
 
-    voucher = Voucher.objects.create(
-        name=name[:128],
-        code=voucher_code,
-        usage=voucher_type,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime
+    codes = [code] * quantity if code else _generate_code_strings(settings.VOUCHER_CODE_LENGTH, quantity)
+    vouchers = []
+    for voucher_code in codes:
+        voucher = Voucher(
+            name=name[:128],
+            code=voucher_code.upper(),
+            usage=voucher_type,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime
+        )
+        # bulk_create does not call Voucher.save, which is where vouchers are usually validated.
+        voucher.clean()
+        vouchers.append(voucher)
+
+    batch_size = settings.VOUCHER_BULK_CREATE_BATCH_SIZE
+    for index in range(0, len(vouchers), batch_size):
+        Voucher.objects.bulk_create(vouchers[index:index + batch_size])
+        if progress_callback:
+            progress_callback(min(index + batch_size, len(vouchers)))
+
+    # Not all databases return the primary keys of rows inserted by bulk_create, so the vouchers are read back.
+    codes = [voucher.code for voucher in vouchers]
+    vouchers_by_code = {}
+    for index in range(0, len(codes), batch_size):
+        vouchers_by_code.update(
+            (voucher.code, voucher) for voucher in Voucher.objects.filter(code__in=codes[index:index + batch_size])
+        )
+    vouchers = [vouchers_by_code[voucher_code] for voucher_code in codes]
+
+    VoucherOffers = Voucher.offers.through
+    VoucherOffers.objects.bulk_create(
+        [
+            VoucherOffers(voucher_id=voucher.id, conditionaloffer_id=offers[index % len(offers)].id)
+            for index, voucher in enumerate(vouchers)
+        ],
+        batch_size=batch_size
     )
-    voucher.offers.add(offer)
 
-    return voucher
+    return vouchers
 
 
 def create_vouchers(
@@ -476,6 +808,7 @@ def create_vouchers(
         course_catalog=None,
         program_uuid=None,
         site=None,
+        progress_callback=None,
 ):
     """
     Create vouchers.
@@ -501,13 +834,12 @@ def create_vouchers(
         _range (Range): Product range. Defaults to None.
         program_uuid (str): Program UUID. Defaults to None.
         site (site): Site for which the Coupon is created. Defaults to None.
+        progress_callback (callable): Called with the number of vouchers created so far. Defaults to None.
 
     Returns:
         List[Voucher]
     """
     logger.info("Creating [%d] vouchers product [%s]", quantity, coupon.id)
-    vouchers = []
-    offers = []
 
     # Maximum number of uses can be set for each voucher type and disturb
     # the predefined behaviours of the different voucher types. Therefor
@@ -556,31 +888,29 @@ def create_vouchers(
     multi_offer = True if (
         voucher_type == Voucher.MULTI_USE or voucher_type == Voucher.ONCE_PER_CUSTOMER
     ) else False
-    num_of_offers = quantity if multi_offer else 1
-    for num in range(num_of_offers):
-        offer = _get_or_create_offer(
+    with transaction.atomic():
+        offers = _get_or_create_offers(
             product_range=product_range,
             benefit_type=benefit_type,
             benefit_value=benefit_value,
+            quantity=quantity if multi_offer else 1,
             max_uses=max_uses,
             coupon_id=coupon.id,
-            offer_number=num,
             email_domains=email_domains,
             program_uuid=program_uuid,
             site=site
         )
-        offers.append(offer)
 
-    for i in range(quantity):
-        voucher = _create_new_voucher(
+        vouchers = _create_new_vouchers(
+            code=code,
             end_datetime=end_datetime,
-            offer=offers[i] if multi_offer else offers[0],
+            name=name,
+            offers=offers,
+            quantity=quantity,
             start_datetime=start_datetime,
             voucher_type=voucher_type,
-            code=code,
-            name=name
+            progress_callback=progress_callback
         )
-        vouchers.append(voucher)
 
     return vouchers
 
@@ -658,6 +988,82 @@ def update_voucher_offer(offer, benefit_value, benefit_type, coupon, max_uses=No
     )
 
 
+def update_coupon_offer(coupon, vouchers, benefit_value=None, program_uuid=None):
+    """
+    Remove all offers from the vouchers and add a new offer.
+
+    The offers of all vouchers are replaced with a fixed number of queries.
+
+    Args:
+        coupon (Product): Coupon product associated with vouchers.
+        vouchers (ManyRelatedManager): Vouchers associated with the coupon to be updated.
+        benefit_value (Decimal): Benefit value associated with a new offer.
+        program_uuid (str): Program UUID.
+
+    Returns:
+        Offer
+    """
+    voucher_offer = vouchers.first().offers.first()
+
+    if program_uuid:
+        Condition.objects.filter(
+            program_uuid=voucher_offer.condition.program_uuid
+        ).update(program_uuid=program_uuid)
+
+    # The program uuid (if program coupon) is required for the benefit and condition update logic
+    program_uuid = program_uuid or voucher_offer.condition.program_uuid
+
+    new_offer = update_voucher_offer(
+        offer=voucher_offer,
+        benefit_value=benefit_value or voucher_offer.benefit.value,
+        benefit_type=voucher_offer.benefit.type or getattr(
+            voucher_offer.benefit.proxy(), 'benefit_class_type', None
+        ),
+        coupon=coupon,
+        max_uses=voucher_offer.max_global_applications,
+        program_uuid=program_uuid
+    )
+
+    VoucherOffers = Voucher.offers.through
+    voucher_ids = list(vouchers.all().values_list('id', flat=True))
+    VoucherOffers.objects.filter(voucher__in=vouchers.all()).delete()
+    VoucherOffers.objects.bulk_create(
+        [VoucherOffers(voucher_id=voucher_id, conditionaloffer_id=new_offer.id) for voucher_id in voucher_ids],
+        batch_size=settings.VOUCHER_BULK_CREATE_BATCH_SIZE
+    )
+
+    return new_offer
+
+
+def update_coupon_vouchers(coupon, voucher_data=None, benefit_value=None, program_uuid=None, offer_data=None,
+                           progress_callback=None):
+    """
+    Update the vouchers of a coupon and their offers.
+
+    Args:
+        coupon (Product): Coupon product whose vouchers are updated.
+        voucher_data (dict): Values of the CouponVouchers.UPDATEABLE_VOUCHER_FIELDS to set on the vouchers.
+        benefit_value (Decimal): Benefit value of the new offer of the vouchers.
+        program_uuid (str): Program UUID of the new offer of the vouchers.
+        offer_data (dict): Validated values of the ConditionalOffer.UPDATABLE_OFFER_FIELDS to set on the offers.
+        progress_callback (callable): Called with the percentage of the update completed, after each step.
+    """
+    vouchers = coupon.attr.coupon_vouchers.vouchers
+    steps = [
+        (voucher_data, lambda: vouchers.all().update(**voucher_data)),
+        (benefit_value or program_uuid, lambda: update_coupon_offer(
+            coupon, vouchers, benefit_value=benefit_value, program_uuid=program_uuid
+        )),
+        (offer_data, lambda: ConditionalOffer.objects.filter(vouchers__in=vouchers.all()).update(**offer_data)),
+    ]
+    steps = [step for condition, step in steps if condition]
+
+    for index, step in enumerate(steps):
+        step()
+        if progress_callback:
+            progress_callback((index + 1) * 100 // len(steps))
+
+
 def get_cached_voucher(code):
     """
     Returns a voucher from cache if one is stored to cache, if not the voucher
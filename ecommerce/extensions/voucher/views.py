@@ -1,14 +1,13 @@
-import csv
 import logging
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
 from oscar.core.loading import get_model
 
 from ecommerce.core.views import StaffOnlyMixin
-from ecommerce.extensions.voucher.utils import generate_coupon_report
+from ecommerce.extensions.voucher.utils import generate_coupon_report, iter_coupon_report_csv
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +18,7 @@ StockRecord = get_model('partner', 'StockRecord')
 
 
 class CouponReportCSVView(StaffOnlyMixin, View):
-    """Generates coupon report and returns it in CSV format."""
+    """Generates coupon report and streams it in CSV format."""
 
     def get(self, request, coupon_id):  # pylint: disable=unused-argument
         """
@@ -32,21 +31,13 @@ class CouponReportCSVView(StaffOnlyMixin, View):
         filename = "{}.csv".format(slugify(filename))
 
         try:
-            field_names, rows = generate_coupon_report(coupons_vouchers)
+            field_names, rows = generate_coupon_report(coupons_vouchers, stream=True)
         except StockRecord.DoesNotExist:
             logger.exception(u'Failed to find StockRecord for Coupon [%d].', coupon.id)
             return HttpResponse(_('Failed to find a matching stock record for coupon, report download canceled.'),
                                 status=404)
 
-        response = HttpResponse(content_type='text/csv')
+        response = StreamingHttpResponse(iter_coupon_report_csv(field_names, rows), content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename={}'.format(filename)
 
-        writer = csv.DictWriter(response, fieldnames=field_names)
-        writer.writeheader()
-        for row in rows:
-            for key, value in row.items():
-                if isinstance(row[key], unicode):
-                    row[key] = value.encode('utf-8')
-            writer.writerow(row)
-
         return response
@@ -1,7 +1,8 @@
 import logging
 
 from django.conf import settings
-from django.core.cache import cache
+
+from ecommerce.core.cache_utils import get_or_fetch
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +32,10 @@ class ProgramsApiClient(object):
         program_uuid = str(uuid)
         cache_key = '{site_domain}-program-{uuid}'.format(site_domain=self.site_domain, uuid=program_uuid)
 
-        program = cache.get(cache_key)
-
-        if program:  # pragma: no cover
-            logger.debug('Program [%s] was found in the cache.', program_uuid)
-        else:
+        def fetch():
             logging.info('Retrieving details of of program [%s]...', program_uuid)
             program = self.client.programs(program_uuid).get()
-            cache.set(cache_key, program, self.cache_ttl)
             logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
+            return program
 
-        return program
+        return get_or_fetch(cache_key, fetch, self.cache_ttl)
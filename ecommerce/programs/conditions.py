@@ -7,18 +7,37 @@ from django.conf import settings
 from django.core.cache import cache
 from oscar.apps.offer import utils as oscar_utils
 from oscar.core.loading import get_model
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
+from ecommerce.core.cache_utils import get_or_fetch
+from ecommerce.core.site_context import get_site_context
 from ecommerce.core.utils import get_cache_key, traverse_pagination
 from ecommerce.extensions.offer.decorators import check_condition_applicability
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.utils import ProgramIndex, get_program
 
 Condition = get_model('offer', 'Condition')
 logger = logging.getLogger(__name__)
 
 
+def get_course_keys(course_run_id):
+    """
+    Returns the keys the course of a course run can be identified by: the course run ID itself, matched by
+    programs listing course runs, and the org+course key used by the Discovery Service.
+    """
+    course_keys = {course_run_id}
+    try:
+        course_key = CourseKey.from_string(course_run_id)
+    except InvalidKeyError:
+        return course_keys
+
+    course_keys.add('{org}+{course}'.format(org=course_key.org, course=course_key.course))
+    return course_keys
+
+
 class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condition):
     class Meta(object):
         app_label = 'programs'
@@ -28,22 +47,28 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
     def name(self):
         return 'Basket contains a seat for every course in program {}'.format(self.program_uuid)
 
+    def get_program_index(self, site_configuration):
+        """
+        Returns the ProgramIndex of the program, compiled from the program details and cached for
+        ``settings.PROGRAM_CACHE_TIMEOUT`` seconds, or None if the program could not be retrieved.
+        """
+        cache_key = get_cache_key(
+            site_domain=site_configuration.site.domain,
+            resource='program_index',
+            program_uuid=self.program_uuid,
+            version=ProgramIndex.VERSION,
+        )
+
+        def fetch():
+            program = get_program(self.program_uuid, site_configuration)
+            return ProgramIndex(program) if program else None
+
+        return get_or_fetch(cache_key, fetch, settings.PROGRAM_CACHE_TIMEOUT)
+
     def get_applicable_skus(self, site_configuration):
         """ SKUs to which this condition applies. """
-        program_skus = set()
-        program = get_program(self.program_uuid, site_configuration)
-        if program:
-            applicable_seat_types = program['applicable_seat_types']
-
-            for course in program['courses']:
-                for course_run in course['course_runs']:
-                    program_skus.update(
-                        set([seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types])
-                    )
-                for entitlement in course['entitlements']:
-                    if entitlement['mode'].lower() in applicable_seat_types:
-                        program_skus.add(entitlement['sku'])
-        return program_skus
+        program_index = self.get_program_index(site_configuration)
+        return program_index.skus if program_index else set()
 
     def get_lms_resource(self, basket, resource_name, endpoint):
         cache_key = get_cache_key(
@@ -67,7 +92,7 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
         """
         enrollments = []
         entitlements = []
-        site_configuration = basket.site.siteconfiguration
+        site_configuration = get_site_context(site_id=basket.site_id).siteconfiguration
         if site_configuration.enable_partial_program:
             enrollments = self.get_lms_resource(
                 basket, 'enrollments', site_configuration.enrollment_api_client.enrollment)
@@ -81,14 +106,24 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
                     entitlements = response
         return enrollments, entitlements
 
-    def has_entitlements(self, program):
+    def get_owned_courses(self, basket, program_index):
         """
-        Determines whether an entitlement product exists for any course in the program.
+        Returns the keys of the courses the user is enrolled in, and the UUIDs of the courses the user has an
+        entitlement for, with a seat type applicable to the program.
         """
-        for course in program['courses']:
-            if course['entitlements']:
-                return True
-        return False
+        enrollments, entitlements = self.get_user_ownership_data(basket, program_index.has_entitlements)
+        applicable_seat_types = program_index.applicable_seat_types
+
+        enrolled_course_keys = set()
+        for enrollment in enrollments:
+            if enrollment['mode'] in applicable_seat_types:
+                enrolled_course_keys.update(get_course_keys(enrollment['course_details']['course_id']))
+
+        entitled_course_uuids = set(
+            entitlement['course_uuid'] for entitlement in entitlements
+            if entitlement['mode'] in applicable_seat_types
+        )
+        return enrolled_course_keys, entitled_course_uuids
 
     @check_condition_applicability()
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
@@ -104,53 +139,25 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
         """
         basket_skus = set([line.stockrecord.partner_sku for line in basket.all_lines()])
         try:
-            program = get_program(self.program_uuid, basket.site.siteconfiguration)
+            program_index = self.get_program_index(get_site_context(site_id=basket.site_id).siteconfiguration)
         except (HttpNotFoundError, SlumberBaseException, Timeout):
             return False
 
-        if program:
-            applicable_seat_types = program['applicable_seat_types']
-        else:
+        if not program_index:
             return False
 
-        retrieve_entitlements = self.has_entitlements(program)
-        enrollments, entitlements = self.get_user_ownership_data(basket, retrieve_entitlements)
+        enrolled_course_keys, entitled_course_uuids = self.get_owned_courses(basket, program_index)
+        basket_course_indexes = program_index.get_course_indexes(basket_skus)
 
-        for course in program['courses']:
+        for index, (course_key, course_uuid) in enumerate(program_index.courses):
             # If the user is already enrolled in a course, we do not need to check their basket for it
-            if any(course['key'] in enrollment['course_details']['course_id'] and
-                   enrollment['mode'] in applicable_seat_types for enrollment in enrollments):
-                continue
-            if any(course['uuid'] in entitlement['course_uuid'] and
-                   entitlement['mode'] in applicable_seat_types for entitlement in entitlements):
+            if course_key in enrolled_course_keys or course_uuid in entitled_course_uuids:
                 continue
 
-            # If the  basket has no SKUs left, but we still have courses over which
-            # to iterate, the user cannot meet the condition that all courses be represented.
-            if not basket_skus:
+            # Because the user is not enrolled in the course, the basket must contain one of its seats
+            if index not in basket_course_indexes:
                 return False
 
-            # Get all of the SKUs that can satisfy this course
-            skus = set()
-            for course_run in course['course_runs']:
-                skus.update(set([seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types]))
-            for entitlement in course['entitlements']:
-                if entitlement['mode'].lower() in applicable_seat_types:
-                    skus.add(entitlement['sku'])
-
-            # The lack of a difference in the set of SKUs in the basket and the course indicates that
-            # that there is no intersection. Therefore, the basket contains no SKUs for the current course.
-            # Because the user is also not enrolled in the course, it follows that the program condition is not met.
-            diff = basket_skus.difference(skus)
-            if diff == basket_skus:
-                return False
-
-            # If there is a difference between the basket SKUs and course SKUs, it represents the basket SKUs
-            # minus the SKUs for the current course. Since we have already verified the course is represented,
-            # its SKUs can be safely removed from the set of SKUs in the basket being checked. Note that this
-            # does NOT affect the actual basket, just our copy of its SKUs.
-            basket_skus = diff
-
         return True
 
     def can_apply_condition(self, line):
@@ -159,8 +166,12 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             return False
 
         product = line.product
-        return line.stockrecord.partner_sku in self.get_applicable_skus(
-            line.basket.site.siteconfiguration) and product.get_is_discountable()
+        site_configuration = get_site_context(site_id=line.basket.site_id).siteconfiguration
+        program_index = self.get_program_index(site_configuration)
+        if not program_index:
+            return False
+
+        return line.stockrecord.partner_sku in program_index.course_indexes_by_sku and product.get_is_discountable()
 
     def get_applicable_lines(self, offer, basket, most_expensive_first=True):
         """ Return line data for the lines that can be consumed by this condition. """
@@ -266,3 +266,47 @@ class ProgramCourseRunSeatsConditionTests(ProgramTestMixin, TestCase):
         with mock.patch('ecommerce.programs.conditions.traverse_pagination') as mock_processing_entitlements:
             self.assertFalse(self.condition.is_satisfied(offer, basket))
             mock_processing_entitlements.assert_not_called()
+
+    def test_is_satisfied_large_program(self):
+        """
+        The program details should be compiled once for a program of 30 courses, however many basket lines and
+        enrollments are evaluated, and enrollments should be matched by course key.
+        """
+        offer = factories.ProgramOfferFactory(site=self.site, condition=self.condition)
+        basket = factories.BasketFactory(site=self.site, owner=factories.UserFactory())
+        products = [ProductFactory(stockrecords__price_excl_tax=10) for __ in range(30)]
+        program = {
+            'uuid': str(self.condition.program_uuid),
+            'applicable_seat_types': ['verified'],
+            'courses': [{
+                'key': 'test-org+course{}'.format(index),
+                'uuid': 'course-uuid-{}'.format(index),
+                'course_runs': [{
+                    'key': 'course-v1:test-org+course{}+run'.format(index),
+                    'seats': [{'type': 'verified', 'sku': product.stockrecords.first().partner_sku}],
+                }],
+                'entitlements': [],
+            } for index, product in enumerate(products)],
+        }
+        # The user is enrolled in the first 10 courses of the program, and 190 other courses
+        enrollments = [
+            {'mode': 'verified', 'course_details': {'course_id': 'course-v1:test-org+course{}+run'.format(index)}}
+            for index in range(10)
+        ] + [
+            {'mode': 'verified', 'course_details': {'course_id': 'course-v1:other-org+course{}+run'.format(index)}}
+            for index in range(190)
+        ]
+        for product in products[10:]:
+            basket.add_product(product)
+
+        with mock.patch('ecommerce.programs.conditions.get_program', return_value=program) as mock_get_program:
+            with mock.patch.object(self.condition, 'get_user_ownership_data', return_value=(enrollments, [])):
+                self.assertTrue(self.condition.is_satisfied(offer, basket))
+                self.assertEqual(len(self.condition.get_applicable_lines(offer, basket)), 20)
+
+                basket.flush()
+                for product in products[11:]:
+                    basket.add_product(product)
+                self.assertFalse(self.condition.is_satisfied(offer, basket))
+
+        self.assertEqual(mock_get_program.call_count, 1)
@@ -9,7 +9,7 @@ from testfixtures import LogCapture
 
 from ecommerce.programs.api import ProgramsApiClient
 from ecommerce.programs.tests.mixins import ProgramTestMixin
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.utils import ProgramIndex, get_program
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.programs.utils'
@@ -61,3 +61,35 @@ class UtilTests(ProgramTestMixin, TestCase):
                 self.assertIsNone(response)
                 msg = 'No program data found for {}'.format(self.program_uuid)
                 l.check((LOGGER_NAME, 'DEBUG', msg))
+
+
+class ProgramIndexTests(TestCase):
+    def test_index(self):
+        """ The index should map the SKUs of applicable seats and entitlements to the course they belong to. """
+        program = {
+            'applicable_seat_types': ['verified'],
+            'courses': [
+                {
+                    'key': 'org+course1',
+                    'uuid': 'uuid1',
+                    'course_runs': [
+                        {'seats': [{'type': 'verified', 'sku': 'A'}, {'type': 'audit', 'sku': 'B'}]},
+                        {'seats': [{'type': 'verified', 'sku': 'C'}]},
+                    ],
+                    'entitlements': [{'mode': 'Verified', 'sku': 'D'}],
+                },
+                {
+                    'key': 'org+course2',
+                    'uuid': 'uuid2',
+                    'course_runs': [{'seats': [{'type': 'verified', 'sku': 'E'}]}],
+                    'entitlements': [],
+                },
+            ],
+        }
+        index = ProgramIndex(program)
+
+        self.assertEqual(index.courses, [('org+course1', 'uuid1'), ('org+course2', 'uuid2')])
+        self.assertEqual(index.skus, {'A', 'C', 'D', 'E'})
+        self.assertEqual(index.get_course_indexes(['A', 'B', 'D']), {0})
+        self.assertEqual(index.get_course_indexes(['C', 'E', 'F']), {0, 1})
+        self.assertTrue(index.has_entitlements)
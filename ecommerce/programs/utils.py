@@ -36,3 +36,42 @@ def get_program(program_uuid, siteconfiguration):
         log.debug(msg)
 
     return response
+
+
+class ProgramIndex(object):
+    """
+    Lookup tables compiled from the details of a program returned by the Discovery Service.
+
+    Program conditions evaluate baskets against these tables, instead of walking the courses, course runs and
+    seats of the program for every basket line. Instances are cached, so ``VERSION`` must be incremented whenever
+    the structure of the index changes.
+    """
+    VERSION = 1
+
+    def __init__(self, program):
+        self.applicable_seat_types = frozenset(program['applicable_seat_types'])
+        # (key, uuid) of each course of the program, in the order of the program
+        self.courses = []
+        # Position in self.courses of the course each applicable seat and entitlement SKU belongs to
+        self.course_indexes_by_sku = {}
+        self.has_entitlements = False
+
+        for index, course in enumerate(program['courses']):
+            self.courses.append((course['key'], course['uuid']))
+            for course_run in course['course_runs']:
+                for seat in course_run['seats']:
+                    if seat['type'] in self.applicable_seat_types:
+                        self.course_indexes_by_sku.setdefault(seat['sku'], index)
+            for entitlement in course['entitlements']:
+                self.has_entitlements = True
+                if entitlement['mode'].lower() in self.applicable_seat_types:
+                    self.course_indexes_by_sku.setdefault(entitlement['sku'], index)
+
+    @property
+    def skus(self):
+        """ SKUs of the seats and entitlements that count towards the program. """
+        return set(self.course_indexes_by_sku)
+
+    def get_course_indexes(self, skus):
+        """ Returns the positions in self.courses of the courses for which one of the given SKUs is a seat. """
+        return set(self.course_indexes_by_sku[sku] for sku in skus if sku in self.course_indexes_by_sku)
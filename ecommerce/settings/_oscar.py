@@ -141,6 +141,12 @@ PAYMENT_PROCESSOR_CONFIG = {
 }
 
 PAYMENT_PROCESSOR_SWITCH_PREFIX = 'payment_processor_active_'
+
+# Age, in days, after which payment processor responses are moved from the database to archive files by the
+# daily archival task. Responses are never archived by the task if None.
+PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_AGE = None
+# Number of payment processor responses stored in each archive file.
+PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_CHUNK_SIZE = 10000
 # END PAYMENT PROCESSING
 
 
@@ -157,6 +163,31 @@ INSTALL_DEFAULT_ANALYTICS_RECEIVERS = False
 OSCAR_INITIAL_REFUND_STATUS = REFUND.OPEN
 OSCAR_INITIAL_REFUND_LINE_STATUS = REFUND_LINE.OPEN
 
+# Number of orders refunded per transaction when refunding all orders of a course.
+REFUND_BATCH_SIZE = 1000
+
+# Number of refunds approved by each background task.
+REFUND_APPROVAL_BATCH_SIZE = 100
+
+# Refunds are approved concurrently by threads, at most `concurrency` of them, and at most `rate` refunds per second,
+# for each payment processor. Processors not listed here, and free orders, use the default limits. These limits are
+# kept in the cache, and apply to all the processes approving refunds together if they share it.
+REFUND_APPROVAL_THREADED = True
+REFUND_PROCESSOR_LIMITS = {
+    'default': {'concurrency': 4, 'rate': None},
+    'cybersource': {'concurrency': 8, 'rate': 10},
+    'paypal': {'concurrency': 4, 'rate': 5},
+    'stripe': {'concurrency': 8, 'rate': 20},
+}
+# Time after which the concurrency slot of an approval is freed, should the process approving the refund die. Value is
+# in seconds.
+REFUND_APPROVAL_SLOT_TIMEOUT = 5 * 60
+
+# Approvals leaving a refund with a revocation error are retried, after REFUND_APPROVAL_RETRY_DELAY seconds, doubled
+# for each retry. Credits which failed are never retried automatically, as they may have been issued nonetheless.
+REFUND_APPROVAL_MAX_RETRIES = 3
+REFUND_APPROVAL_RETRY_DELAY = 1.0
+
 OSCAR_REFUND_STATUS_PIPELINE = {
     REFUND.OPEN: (REFUND.DENIED, REFUND.PAYMENT_REFUND_ERROR, REFUND.PAYMENT_REFUNDED),
     REFUND.PAYMENT_REFUND_ERROR: (REFUND.PAYMENT_REFUNDED, REFUND.PAYMENT_REFUND_ERROR),
@@ -268,9 +299,15 @@ OSCAR_DASHBOARD_NAVIGATION = [
 # Default timeout for Enrollment API calls
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
 
+# Maximum number of concurrent Enrollment API calls made to fulfill an order
+ENROLLMENT_FULFILLMENT_MAX_WORKERS = 5
+
 # Coupon code length
 VOUCHER_CODE_LENGTH = 16
 
+# Number of vouchers generated, checked for uniqueness and inserted per query when creating vouchers in bulk
+VOUCHER_BULK_CREATE_BATCH_SIZE = 500
+
 THUMBNAIL_DEBUG = False
 
 OSCAR_FROM_EMAIL = 'testing@example.com'
@@ -104,6 +104,14 @@ MEDIA_ROOT = normpath(join(SITE_ROOT, 'media'))
 
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = '/media/'
+
+# Files which must not be publicly accessible, such as coupon reports, are stored here. This directory must be
+# outside of MEDIA_ROOT, and must not be served by the web server. See ecommerce.core.storage.
+PRIVATE_MEDIA_ROOT = normpath(join(SITE_ROOT, 'private_media'))
+
+# Payment processor responses moved out of the database are stored here. Like PRIVATE_MEDIA_ROOT, this directory
+# must not be served by the web server. See ecommerce.extensions.payment.archive.
+PAYMENT_PROCESSOR_RESPONSE_ARCHIVE_ROOT = join(PRIVATE_MEDIA_ROOT, 'payment_processor_response_archives')
 # END MEDIA CONFIGURATION
 
 
@@ -220,6 +228,8 @@ MIDDLEWARE_CLASSES = (
     'django.contrib.auth.middleware.SessionAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware',
+    # NOTE: SiteContextMiddleware relies on request.site and MUST appear AFTER CurrentSiteMiddleware.
+    'ecommerce.core.middleware.SiteContextMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'waffle.middleware.WaffleMiddleware',
     # NOTE: The overridden BasketMiddleware relies on request.site. This middleware
@@ -242,10 +252,28 @@ ROOT_URLCONF = '{}.urls'.format(SITE_NAME)
 # Commerce API settings used for publishing information to LMS.
 COMMERCE_API_TIMEOUT = 7
 
+# Connection pools shared by the clients of the LMS, Discovery and other services, see ecommerce.core.api_clients.
+API_CLIENT_POOL_CONNECTIONS = 10  # Number of hosts for which connections are kept.
+API_CLIENT_POOL_MAXSIZE = 10  # Number of connections kept per host.
+API_CLIENT_MAX_RETRIES = 2  # Connection errors are retried, requests that reached the service are not.
+API_CLIENT_RETRY_BACKOFF_FACTOR = 0.1
+
 # Cache course info from course API.
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
+
+# Local index of the course runs in Discovery Service catalog queries and course catalogs.
+CATALOG_INDEX_CACHE_TIMEOUT = 300  # Value is in seconds.
+CATALOG_INDEX_MAX_AGE = 86400  # Value is in seconds. Older indexes are ignored.
 PROGRAM_CACHE_TIMEOUT = 3600  # Value is in seconds.
 
+# Shared caching of upstream API responses, see ecommerce.core.cache_utils.
+API_CACHE_STALE_TIMEOUT = 3600  # Value is in seconds. Expired values are served for this long on upstream errors.
+API_CACHE_NEGATIVE_TIMEOUT = 60  # Value is in seconds. Maximum timeout for empty responses.
+API_CACHE_LOCK_TIMEOUT = 10  # Value is in seconds.
+API_CACHE_LOCK_WAIT = 2  # Value is in seconds.
+# Higher values refresh cached responses earlier, see ecommerce.core.cache_utils._is_fresh.
+API_CACHE_EARLY_REFRESH_BETA = 1.0
+
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
@@ -256,6 +284,12 @@ ENROLLMENT_API_CACHE_TIMEOUT = 30  # Value is in seconds.
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+# Number of vouchers loaded at a time when streaming a coupon report.
+COUPON_REPORT_CHUNK_SIZE = 1000
+
+# Progress of running coupon jobs is cached, as it may not be committed to the database until the job completes.
+COUPON_JOB_PROGRESS_CACHE_TIMEOUT = 60 * 60 * 24  # Value is in seconds.
+
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
 # APP CONFIGURATION
@@ -495,12 +529,38 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.extensions.offer.tasks',
+    'ecommerce.extensions.payment.tasks',
+    'ecommerce.extensions.refund.tasks',
+    'ecommerce.extensions.voucher.tasks',
 )
 
+# Queue of the tasks defined in this repository, which must be consumed by a worker started from it.
+ECOMMERCE_TASKS_QUEUE = 'ecommerce'
+
+# Periodic tasks. See http://celery.readthedocs.io/en/latest/userguide/periodic-tasks.html.
+CELERYBEAT_SCHEDULE = {
+    'refresh-catalog-indexes': {
+        'task': 'ecommerce.extensions.offer.tasks.refresh_catalog_indexes',
+        'schedule': datetime.timedelta(hours=1),
+    },
+    'archive-payment-processor-responses': {
+        'task': 'ecommerce.extensions.payment.tasks.archive_old_processor_responses',
+        'schedule': datetime.timedelta(days=1),
+    },
+}
+
 CELERY_ROUTES = {
     'ecommerce_worker.fulfillment.v1.tasks.fulfill_order': {'queue': 'fulfillment'},
     'ecommerce_worker.sailthru.v1.tasks.update_course_enrollment': {'queue': 'email_marketing'},
     'ecommerce_worker.sailthru.v1.tasks.send_course_refund_email': {'queue': 'email_marketing'},
+    # Tasks defined in this repository are not registered with the ecommerce worker, which shares the broker.
+    # They are sent to a dedicated queue, consumed by a worker started from this repository. See
+    # docs/additional_features/maintain_ecommerce.rst.
+    'ecommerce.extensions.offer.tasks.refresh_catalog_indexes': {'queue': ECOMMERCE_TASKS_QUEUE},
+    'ecommerce.extensions.payment.tasks.archive_old_processor_responses': {'queue': ECOMMERCE_TASKS_QUEUE},
+    'ecommerce.extensions.refund.tasks.approve_refunds': {'queue': ECOMMERCE_TASKS_QUEUE},
+    'ecommerce.extensions.voucher.tasks.process_coupon_job': {'queue': ECOMMERCE_TASKS_QUEUE},
 }
 
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
@@ -545,6 +605,14 @@ DEFAULT_SITE_THEME = None
 
 THEME_CACHE_TIMEOUT = 30 * 60
 
+# Maximum number of compiled templates kept by ecommerce.theming.template_loaders.ThemeCachedLoader, for all
+# themes together
+THEME_TEMPLATE_CACHE_SIZE = 2000
+
+# Interval at which each process checks whether the index of themes and theme assets was invalidated by another
+# process, e.g. by update_assets. See ecommerce.theming.helpers.ThemeRegistry. Value is in seconds.
+THEME_REGISTRY_VERSION_CHECK_INTERVAL = 60
+
 # End Theme settings
 
 
@@ -592,3 +660,14 @@ if os.environ.get('ENABLE_DJANGO_TOOLBAR', False):
 
 # Determines if events are actually sent to Segment. This should only be set to False for testing purposes.
 SEND_SEGMENT_EVENTS = True
+
+# Analytics events are built and sent by a background thread of each process, instead of the request threads.
+# At most ANALYTICS_EVENT_QUEUE_MAXSIZE events are queued, further events are dropped, and the thread processes
+# up to ANALYTICS_EVENT_QUEUE_BATCH_SIZE events between database connection checks.
+ANALYTICS_EVENT_QUEUE_ASYNC = True
+ANALYTICS_EVENT_QUEUE_MAXSIZE = 10000
+ANALYTICS_EVENT_QUEUE_BATCH_SIZE = 100
+
+# Minimum number of seconds between two saves of the Google Analytics client ID of a user, by the
+# TrackingMiddleware. Set to 0 to save every change immediately.
+GA_CLIENT_ID_UPDATE_INTERVAL = 300
@@ -27,6 +27,11 @@ COMPRESS_CSS_FILTERS += [
 
 LOGGING['handlers']['local']['level'] = 'INFO'
 
+# Cache compiled templates, separately for each theme
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('ecommerce.theming.template_loaders.ThemeCachedLoader', TEMPLATES[0]['OPTIONS']['loaders']),
+]
+
 
 def get_env_setting(setting):
     """ Get the environment setting or return exception """
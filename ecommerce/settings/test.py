@@ -161,3 +161,10 @@ ENTERPRISE_API_URL = urljoin(ENTERPRISE_SERVICE_URL, 'api/v1/')
 
 # Don't bother sending fake events to Segment. Doing so creates unnecessary threads.
 SEND_SEGMENT_EVENTS = False
+
+# Process analytics events immediately, so that tests can inspect them.
+ANALYTICS_EVENT_QUEUE_ASYNC = False
+
+# Approve refunds in the test thread, which can see the data created by the test.
+REFUND_APPROVAL_THREADED = False
+REFUND_APPROVAL_RETRY_DELAY = 0
@@ -4,12 +4,15 @@ from django.test import LiveServerTestCase as DjangoLiveServerTestCase
 from django.test import TestCase as DjangoTestCase
 from django.test import TransactionTestCase as DjangoTransactionTestCase
 
+from ecommerce.core import api_clients
 from ecommerce.tests.mixins import SiteMixin, TestServerUrlMixin, UserMixin
 
 
 class CacheMixin(object):
     def setUp(self):
         cache.clear()
+        # Connections pooled by API clients may belong to a previous test's mocked responses.
+        api_clients.registry.clear()
         super(CacheMixin, self).setUp()
 
     def tearDown(self):
@@ -3,9 +3,14 @@
 """
 import logging
 import os
+import time
+import uuid
 
 import waffle
 from django.conf import ImproperlyConfigured, settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from path import Path
 from threadlocals.threadlocals import get_current_request
 
@@ -65,9 +70,9 @@ def get_theme_base_dir(theme_dir_name, suppress_error=False):
     Returns:
         (str): Base directory that contains the given theme
     """
-    for themes_dir in get_theme_base_dirs():
-        if theme_dir_name in (_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)):
-            return themes_dir
+    themes_dir = theme_registry.get_theme_base_dirs_by_name().get(theme_dir_name)
+    if themes_dir:
+        return themes_dir
 
     if suppress_error:
         return None
@@ -254,3 +259,87 @@ class Theme(object):
             self.path / 'templates',
             self.path / 'templates' / 'oscar',
         ]
+
+
+class ThemeRegistry(object):
+    """
+    Index of the themes in COMPREHENSIVE_THEME_DIRS, and of the collected static assets they provide, kept by each
+    process so that resolving the theme and the static URLs of a request does not touch the filesystem.
+
+    The index is built on first use. clear() only clears the index of the current process, e.g. when the theming
+    settings change. invalidate() also changes the version of the index stored in the cache, and other processes
+    sharing the cache clear their index once they notice, within THEME_REGISTRY_VERSION_CHECK_INTERVAL seconds.
+    The update_assets command invalidates the index, which should also be done whenever themes change on disk.
+    """
+    VERSION_CACHE_KEY = 'theming.theme_registry.version'
+
+    def __init__(self):
+        self._theme_base_dirs = None
+        self._assets = {}
+        self._version = None
+        self._version_checked = 0
+
+    def clear(self):
+        self._theme_base_dirs = None
+        self._assets = {}
+
+    def invalidate(self):
+        """ Clear the index of all processes sharing the cache. """
+        self._version = uuid.uuid4().hex
+        self._version_checked = time.time()
+        cache.set(self.VERSION_CACHE_KEY, self._version, None)
+        self.clear()
+
+    def _check_version(self):
+        now = time.time()
+        if now - self._version_checked < settings.THEME_REGISTRY_VERSION_CHECK_INTERVAL:
+            return
+
+        self._version_checked = now
+        version = cache.get(self.VERSION_CACHE_KEY)
+        if version != self._version:
+            self._version = version
+            self.clear()
+
+    def get_theme_base_dirs_by_name(self):
+        """
+        Returns:
+            dict: Directory that contains each theme, keyed by theme directory name. Themes present in several
+                directories are only listed with the first of them.
+        """
+        self._check_version()
+        theme_base_dirs = self._theme_base_dirs
+        if theme_base_dirs is None:
+            theme_base_dirs = {}
+            for themes_dir in get_theme_base_dirs():
+                for theme_dir_name in get_theme_dirs(themes_dir):
+                    theme_base_dirs.setdefault(theme_dir_name, themes_dir)
+            self._theme_base_dirs = theme_base_dirs
+
+        return theme_base_dirs
+
+    def get_assets(self, static_dir):
+        """
+        Returns:
+            frozenset: Paths of all files in the given directory, relative to it, e.g. 'images/logo.png'.
+        """
+        self._check_version()
+        assets = self._assets.get(static_dir)
+        if assets is None:
+            assets = frozenset(
+                os.path.relpath(os.path.join(dir_path, file_name), static_dir).replace(os.sep, '/')
+                for dir_path, __, file_names in os.walk(static_dir)
+                for file_name in file_names
+            )
+            self._assets[static_dir] = assets
+
+        return assets
+
+
+theme_registry = ThemeRegistry()
+
+
+@receiver(setting_changed)
+def clear_theme_registry(setting, **kwargs):  # pylint: disable=unused-argument
+    if setting in ('COMPREHENSIVE_THEME_DIRS', 'STATIC_ROOT'):
+        theme_registry.clear()
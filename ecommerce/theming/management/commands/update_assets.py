@@ -12,7 +12,12 @@ from django.conf import settings
 from django.core.management import BaseCommand, CommandError, call_command
 from path import Path
 
-from ecommerce.theming.helpers import get_theme_base_dirs, get_themes, is_comprehensive_theming_enabled
+from ecommerce.theming.helpers import (
+    get_theme_base_dirs,
+    get_themes,
+    is_comprehensive_theming_enabled,
+    theme_registry
+)
 
 logger = logging.getLogger(__name__)
 
@@ -168,6 +173,9 @@ class Command(BaseCommand):
             # Collect static assets
             collect_assets()
 
+        # Have every process sharing the cache list the compiled and collected assets again.
+        theme_registry.invalidate()
+
 
 def get_sass_directories(themes, system=True):
     """
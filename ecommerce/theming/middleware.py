@@ -15,6 +15,8 @@ class CurrentSiteThemeMiddleware(object):
     """
 
     def process_request(self, request):
+        # The theme is cached, so it is resolved for every request. API requests render templates too, e.g. for
+        # the browsable API and for the emails sent by some endpoints.
         request.site_theme = SiteTheme.get_theme(request.site)
 
 
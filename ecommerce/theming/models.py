@@ -1,6 +1,11 @@
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.core.utils import get_cache_key
 
 
 class SiteTheme(models.Model):
@@ -14,6 +19,10 @@ class SiteTheme(models.Model):
     site = models.ForeignKey(Site, related_name='themes', on_delete=models.CASCADE)
     theme_dir_name = models.CharField(max_length=255)
 
+    @staticmethod
+    def get_cache_key(site_id):
+        return get_cache_key(resource='site_theme', site_id=site_id)
+
     @staticmethod
     def get_theme(site):
         """
@@ -25,13 +34,30 @@ class SiteTheme(models.Model):
 
         Returns:
             SiteTheme object for given site or a default site set by `DEFAULT_SITE_THEME`
+
+        The theme of each site is cached for `THEME_CACHE_TIMEOUT` seconds, or until it is changed.
         """
         if not site:
             return None
 
-        theme = site.themes.first()
+        cache_key = SiteTheme.get_cache_key(site.id)
+        cached = cache.get(cache_key)
+        if cached is None:
+            theme = site.themes.first()
+            cached = (theme.id, theme.theme_dir_name) if theme else (None, None)
+            cache.set(cache_key, cached, settings.THEME_CACHE_TIMEOUT)
+
+        theme_id, theme_dir_name = cached
+        theme = SiteTheme(id=theme_id, site=site, theme_dir_name=theme_dir_name) if theme_id else None
 
         if (not theme) and settings.DEFAULT_SITE_THEME:
             theme = SiteTheme(site=site, theme_dir_name=settings.DEFAULT_SITE_THEME)
 
         return theme
+
+
+@receiver(post_save, sender=SiteTheme)
+@receiver(post_delete, sender=SiteTheme)
+def clear_site_theme_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Clears the cached theme of the site of a SiteTheme when it is changed. """
+    cache.delete(SiteTheme.get_cache_key(instance.site_id))
@@ -8,7 +8,12 @@ from django.conf import settings
 from django.contrib.staticfiles.storage import StaticFilesStorage
 from django.utils._os import safe_join
 
-from ecommerce.theming.helpers import get_current_theme, get_theme_base_dir, is_comprehensive_theming_enabled
+from ecommerce.theming.helpers import (
+    get_current_theme,
+    get_theme_base_dir,
+    is_comprehensive_theming_enabled,
+    theme_registry
+)
 
 
 class ThemeStorage(StaticFilesStorage):
@@ -89,6 +94,7 @@ class ThemeStorage(StaticFilesStorage):
             name = name[1:] if name.startswith("/") else name
             path = safe_join(themed_path, name)
             return os.path.exists(path)
-        # in live mode check static asset in the static files dir defined by "STATIC_ROOT" setting
+        # in live mode check static asset in the static files dir defined by "STATIC_ROOT" setting, using the list
+        # of collected assets of the theme, which is only read once per process.
         else:
-            return self.exists(os.path.join(theme, name))
+            return name in theme_registry.get_assets(os.path.join(self.location, theme))
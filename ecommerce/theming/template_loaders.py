@@ -1,6 +1,11 @@
 """
 Theming aware template loaders.
 """
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.template.loaders.cached import Loader as CachedLoader
 from django.template.loaders.filesystem import Loader
 from threadlocals.threadlocals import get_current_request
 
@@ -28,3 +33,68 @@ class ThemeTemplateLoader(Loader):
             theme_dirs = get_all_theme_template_dirs()
 
         return theme_dirs + dirs
+
+
+class LRUCache(object):
+    """
+    Thread-safe mapping holding at most `maxsize` items, evicting the least recently used ones.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                return default
+
+            self._items[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class ThemeCachedLoader(CachedLoader):
+    """
+    Cached template loader keeping the compiled templates of each theme separately.
+
+    Django's cached loader caches templates by name, so the first theme to load a template would provide it to
+    all sites. This loader also keys templates by the theme they are loaded for, and keeps at most
+    `settings.THEME_TEMPLATE_CACHE_SIZE` of them, evicting the least recently used ones.
+    """
+
+    def __init__(self, engine, loaders):
+        super(ThemeCachedLoader, self).__init__(engine, loaders)
+        self.get_template_cache = LRUCache(settings.THEME_TEMPLATE_CACHE_SIZE)
+
+    def cache_key(self, template_name, template_dirs, skip=None):
+        key = super(ThemeCachedLoader, self).cache_key(template_name, template_dirs, skip)
+
+        # Mirror the directories used by ThemeTemplateLoader: templates loaded outside of a request are looked up
+        # in the directories of all themes.
+        if get_current_request():
+            theme = get_current_theme()
+            theme_key = theme.theme_dir_name if theme else ''
+        else:
+            theme_key = '*'
+
+        return '{}:{}'.format(theme_key, key)
@@ -8,12 +8,14 @@ from mock import patch
 from ecommerce.tests.testcases import TestCase
 from ecommerce.theming.helpers import (
     Theme,
+    ThemeRegistry,
     get_all_theme_template_dirs,
     get_current_site_theme,
     get_current_theme,
     get_theme_base_dir,
     get_theme_base_dirs,
-    get_themes
+    get_themes,
+    theme_registry
 )
 from ecommerce.theming.test_utils import with_comprehensive_theme
 
@@ -193,3 +195,36 @@ class TestHelpers(TestCase):
         Tests get_theme_base_dir returns None if theme is not found istead of raising an error.
         """
         self.assertIsNone(get_theme_base_dir("non-existent-theme", suppress_error=True))
+
+    def test_get_theme_base_dir_cached(self):
+        """
+        Tests get_theme_base_dir only lists the themes dirs once, until the theme registry is cleared.
+        """
+        theme_dirs = settings.COMPREHENSIVE_THEME_DIRS
+        theme_registry.clear()
+        self.assertEqual(get_theme_base_dir("test-theme-3"), theme_dirs[1])
+
+        with patch('os.listdir') as mock_listdir:
+            self.assertEqual(get_theme_base_dir("test-theme-3"), theme_dirs[1])
+            self.assertIsNone(get_theme_base_dir("non-existent-theme", suppress_error=True))
+            self.assertFalse(mock_listdir.called)
+
+        with override_settings(COMPREHENSIVE_THEME_DIRS=theme_dirs[1:]):
+            self.assertIsNone(get_theme_base_dir("test-theme", suppress_error=True))
+            self.assertEqual(get_theme_base_dir("test-theme-3"), theme_dirs[1])
+
+    def test_theme_registry_invalidate(self):
+        """
+        Tests the theme registry of each process is cleared once it notices another process invalidated it.
+        """
+        registry = ThemeRegistry()
+        other_registry = ThemeRegistry()
+        self.assertIn("test-theme-3", registry.get_theme_base_dirs_by_name())
+
+        other_registry.invalidate()
+        with patch('ecommerce.theming.helpers.get_theme_dirs', return_value=[]):
+            # The version of the registry is only checked once per interval.
+            self.assertIn("test-theme-3", registry.get_theme_base_dirs_by_name())
+
+            with override_settings(THEME_REGISTRY_VERSION_CHECK_INTERVAL=0):
+                self.assertEqual(registry.get_theme_base_dirs_by_name(), {})
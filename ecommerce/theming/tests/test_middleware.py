@@ -3,8 +3,36 @@ Tests for theming middleware.
 """
 
 from django.core.urlresolvers import reverse
+from django.test.client import RequestFactory
 
 from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.middleware import CurrentSiteThemeMiddleware
+
+
+class TestCurrentSiteTheme(TestCase):
+    """
+    Test the theme of the current site is set on requests.
+    """
+
+    def _process_request(self, path):
+        request = RequestFactory().get(path)
+        request.site = self.site
+        CurrentSiteThemeMiddleware().process_request(request)
+        return request
+
+    def test_site_theme(self):
+        """
+        Verify the site theme is set on requests.
+        """
+        self.assertEqual(self._process_request('/basket/').site_theme.theme_dir_name, 'test-theme')
+
+    def test_api(self):
+        """
+        Verify the site theme is set on API requests too, from the cache.
+        """
+        self._process_request('/basket/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._process_request('/api/v2/baskets/').site_theme.theme_dir_name, 'test-theme')
 
 
 class TestPreviewTheme(TestCase):
@@ -0,0 +1,48 @@
+"""
+Tests for theming models.
+"""
+from django.contrib.sites.models import Site
+from django.test import override_settings
+
+from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.models import SiteTheme
+
+
+class TestSiteTheme(TestCase):
+    """
+    Test SiteTheme lookups.
+    """
+
+    def setUp(self):
+        super(TestSiteTheme, self).setUp()
+        self.site = Site.objects.create(domain='themed.fake', name='themed.fake')
+
+    def test_get_theme_cached(self):
+        """
+        Verify the theme of a site is only queried once, until it is changed.
+        """
+        site_theme = SiteTheme.objects.create(site=self.site, theme_dir_name='test-theme')
+        self.assertEqual(SiteTheme.get_theme(self.site), site_theme)
+
+        with self.assertNumQueries(0):
+            theme = SiteTheme.get_theme(self.site)
+        self.assertEqual((theme.id, theme.theme_dir_name), (site_theme.id, 'test-theme'))
+
+        site_theme.theme_dir_name = 'test-theme-2'
+        site_theme.save()
+        self.assertEqual(SiteTheme.get_theme(self.site).theme_dir_name, 'test-theme-2')
+
+        site_theme.delete()
+        with override_settings(DEFAULT_SITE_THEME=None):
+            self.assertIsNone(SiteTheme.get_theme(self.site))
+
+    def test_get_theme_default(self):
+        """
+        Verify the default theme is returned, and cached, for sites without a theme.
+        """
+        with override_settings(DEFAULT_SITE_THEME='test-theme-3'):
+            self.assertEqual(SiteTheme.get_theme(self.site).theme_dir_name, 'test-theme-3')
+            with self.assertNumQueries(0):
+                self.assertEqual(SiteTheme.get_theme(self.site).theme_dir_name, 'test-theme-3')
+
+        self.assertIsNone(SiteTheme.get_theme(None))
@@ -1,12 +1,16 @@
 """
 Tests for comprehensive theme static files storage classes.
 """
+import os
+import shutil
+import tempfile
+
 from django.conf import settings
 from django.test import override_settings
 from mock import patch
 
 from ecommerce.tests.testcases import TestCase
-from ecommerce.theming.helpers import Theme, get_theme_base_dir
+from ecommerce.theming.helpers import Theme, get_theme_base_dir, theme_registry
 from ecommerce.theming.storage import ThemeStorage
 
 
@@ -81,3 +85,51 @@ class TestThemeStorage(TestCase):
             expected_path = self.themes_dir / self.enabled_theme / "static" / asset
 
             self.assertEqual(expected_path, returned_path)
+
+
+@override_settings(DEBUG=False)
+class TestCollectedThemeStorage(TestCase):
+    """
+    Test comprehensive theming static files storage, with collected static files.
+    """
+
+    def setUp(self):
+        super(TestCollectedThemeStorage, self).setUp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+        self.enabled_theme = "test-theme"
+        os.makedirs(os.path.join(self.static_root, self.enabled_theme, 'images'))
+        open(os.path.join(self.static_root, self.enabled_theme, 'images', 'default-logo.png'), 'w').close()
+
+        self.storage = ThemeStorage(location=self.static_root)
+        theme_registry.clear()
+        self.addCleanup(theme_registry.clear)
+
+    def test_themed(self):
+        """
+        Verify storage returns True only on assets collected for the theme
+        """
+        self.assertTrue(self.storage.themed("images/default-logo.png", self.enabled_theme))
+        self.assertFalse(self.storage.themed("images/cap.png", self.enabled_theme))
+        self.assertFalse(self.storage.themed("images/default-logo.png", "test-theme-2"))
+
+    def test_url_does_not_read_filesystem(self):
+        """
+        Verify the collected assets of a theme are listed once, rather than once per url.
+        """
+        theme = Theme(self.enabled_theme, self.enabled_theme, get_theme_base_dir(self.enabled_theme))
+        with patch("ecommerce.theming.storage.get_current_theme", return_value=theme):
+            self.storage.url("images/default-logo.png")
+
+            with patch("os.walk") as mock_walk, patch("os.listdir") as mock_listdir, \
+                    patch("os.path.exists") as mock_exists:
+                for __ in range(40):
+                    self.assertEqual(
+                        self.storage.url("images/default-logo.png"),
+                        self.storage.base_url + self.enabled_theme + "/images/default-logo.png"
+                    )
+                    self.assertEqual(self.storage.url("images/cap.png"), self.storage.base_url + "images/cap.png")
+
+                self.assertFalse(mock_walk.called)
+                self.assertFalse(mock_listdir.called)
+                self.assertFalse(mock_exists.called)
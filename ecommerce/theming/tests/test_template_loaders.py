@@ -0,0 +1,78 @@
+"""
+Tests for theming template loaders.
+"""
+from django.conf import settings
+from django.template.engine import Engine
+from django.test.client import RequestFactory
+from mock import patch
+
+from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.helpers import Theme, get_theme_base_dir
+from ecommerce.theming.template_loaders import LRUCache
+
+
+class TestThemeCachedLoader(TestCase):
+    """
+    Test templates are cached separately for each theme.
+    """
+
+    def setUp(self):
+        super(TestThemeCachedLoader, self).setUp()
+        self.engine = Engine(
+            dirs=settings.TEMPLATES[0]['DIRS'],
+            loaders=[
+                ('ecommerce.theming.template_loaders.ThemeCachedLoader', [
+                    'ecommerce.theming.template_loaders.ThemeTemplateLoader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        )
+        patcher = patch(
+            'ecommerce.theming.template_loaders.get_current_request', return_value=RequestFactory().get('/')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_template(self, theme_dir_name):
+        theme = Theme(theme_dir_name, theme_dir_name, get_theme_base_dir(theme_dir_name)) if theme_dir_name else None
+        with patch('ecommerce.theming.template_loaders.get_current_theme', return_value=theme):
+            return self.engine.get_template('dashboard/index.html')
+
+    def test_templates_cached_per_theme(self):
+        """
+        Verify each theme gets its own template, which is only loaded once.
+        """
+        templates = {theme: self.get_template(theme) for theme in ('test-theme', 'test-theme-2', None)}
+
+        self.assertIn('/test-theme/', templates['test-theme'].origin.name)
+        self.assertIn('/test-theme-2/', templates['test-theme-2'].origin.name)
+        self.assertNotIn('/themes/', templates[None].origin.name)
+
+        with patch('ecommerce.theming.template_loaders.ThemeTemplateLoader.get_contents') as mock_get_contents:
+            for theme, template in templates.items():
+                self.assertIs(self.get_template(theme), template)
+            self.assertFalse(mock_get_contents.called)
+
+
+class TestLRUCache(TestCase):
+    """
+    Test the cache of the ThemeCachedLoader.
+    """
+
+    def test_eviction(self):
+        """
+        Verify the least recently used items are evicted once the cache is full.
+        """
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(cache.get('a'), 1)
+
+        cache['c'] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)